@@ -0,0 +1,556 @@
+"""
+python -m benchmarks.overhead [--output results.json]
+
+Measure the per-call overhead of every public fault injection API against a bare function.
+
+Each API is measured in up to three states:
+
+- ``fired``: injection is enabled and the fault fires on every call.
+- ``not_triggered``: injection is enabled but the fault condition is never met.
+- ``disabled``: the API is created with ``disable=True``.
+
+and under three loads: a single thread, several threads calling concurrently, and concurrent
+asyncio tasks. ``time.sleep`` and ``asyncio.sleep`` are replaced by no-ops, so the numbers are
+library overhead rather than injected latency. Results can be written as JSON to track
+regressions between releases.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import fault_injection
+from fault_injection import schedule
+from fault_injection.distributions import Lognormal
+from fault_injection import (
+    delay,
+    delay_bytes,
+    delay_bytes_async,
+    delay_by_size,
+    delay_by_size_inline,
+    delay_by_size_inline_async,
+    delay_distribution,
+    delay_distribution_inline,
+    delay_distribution_inline_async,
+    delay_items,
+    delay_items_async,
+    delay_at_nth_call,
+    delay_at_nth_call_inline,
+    delay_at_nth_call_inline_async,
+    delay_inline,
+    delay_inline_async,
+    delay_on_schedule,
+    delay_on_schedule_inline,
+    delay_on_schedule_inline_async,
+    delay_rate_limited,
+    delay_rate_limited_inline,
+    delay_rate_limited_inline_async,
+    delay_random,
+    delay_random_inline,
+    delay_random_inline_async,
+    delay_random_norm,
+    delay_random_norm_inline,
+    delay_random_norm_inline_async,
+    raise_,
+    raise_after_bytes,
+    raise_after_bytes_async,
+    raise_at_nth_item,
+    raise_at_nth_item_async,
+    raise_at_nth_call,
+    raise_at_nth_call_inline,
+    raise_inline,
+    raise_on_schedule,
+    raise_on_schedule_inline,
+    raise_rate_limited,
+    raise_rate_limited_inline,
+    raise_random,
+    raise_random_inline,
+)
+
+STATES = ("fired", "not_triggered", "disabled")
+LOADS = ("single_thread", "multi_thread", "asyncio")
+
+# Public names that control the library rather than inject faults.
+NON_INJECTING_APIS = {"enable", "disable", "enabled", "is_enabled"}
+
+NEVER = 2 ** 62
+LOGNORMAL = Lognormal(median_s=0.001, sigma=0.5)
+ALWAYS = schedule.after(0)
+NOT_YET = schedule.at(NEVER)
+# A bucket that refills far faster than calls arrive fires on every call; one that refills once
+# a day is drained by the warm-up and then denies every call.
+UNLIMITED_RATE = 1e12
+DAILY_RATE = 1 / 86400
+
+Target = Callable[..., Any]
+Targets = Tuple[Optional[Target], Optional[Target]]
+
+
+def add(a, b):
+    return a + b
+
+
+async def add_async(a, b):
+    return a + b
+
+
+def _noop_sleep(_seconds):
+    return None
+
+
+async def _noop_async_sleep(_seconds, result=None):
+    return result
+
+
+def decorator_case(make: Callable[[str], Optional[Callable[..., Any]]]) -> Callable[[str], Targets]:
+    """Build sync and async targets from ``make(state)``, which returns a decorator or ``None``."""
+    def build(state: str) -> Targets:
+        decorator = make(state)
+        if decorator is None:
+            return None, None
+        return decorator(add), make(state)(add_async)
+    return build
+
+
+def inline_case(make: Callable[[str], Optional[Callable[[], Any]]]) -> Callable[[str], Targets]:
+    """Build targets that call ``make(state)()`` inline before doing their work."""
+    def build(state: str) -> Targets:
+        helper = make(state)
+        if helper is None:
+            return None, None
+
+        def target(a, b):
+            helper()
+            return a + b
+
+        async def async_target(a, b):
+            helper()
+            return a + b
+
+        return target, async_target
+    return build
+
+
+def async_inline_case(make: Callable[[str], Optional[Callable[[], Any]]]) -> Callable[[str], Targets]:
+    """Build an async-only target that awaits ``make(state)()`` before doing its work."""
+    def build(state: str) -> Targets:
+        helper = make(state)
+        if helper is None:
+            return None, None
+
+        async def async_target(a, b):
+            await helper()
+            return a + b
+
+        return None, async_target
+    return build
+
+
+def stream_case(make: Callable[[str], Optional[Callable[[Any], Any]]], item: Any = 1) -> Callable[[str], Targets]:
+    """Build a target that pulls one ``item`` through the stream wrapper ``make(state)``."""
+    def build(state: str) -> Targets:
+        wrap = make(state)
+        if wrap is None:
+            return None, None
+
+        def target(a, b):
+            for _ in wrap([item]):
+                pass
+            return a + b
+
+        return target, None
+    return build
+
+
+def async_stream_case(make: Callable[[str], Optional[Callable[[Any], Any]]], item: Any = 1) -> Callable[[str], Targets]:
+    """Build an async-only target that pulls one ``item`` through ``make(state)``."""
+    async def source():
+        yield item
+
+    def build(state: str) -> Targets:
+        wrap = make(state)
+        if wrap is None:
+            return None, None
+
+        async def async_target(a, b):
+            async for _ in wrap(source()):
+                pass
+            return a + b
+
+        return None, async_target
+    return build
+
+
+def _states(fired=None, not_triggered=None, disabled=None):
+    table = {"fired": fired, "not_triggered": not_triggered, "disabled": disabled}
+    return lambda state: table[state]() if table[state] is not None else None
+
+
+CASES: Dict[str, Callable[[str], Targets]] = {
+    "delay": decorator_case(_states(
+        fired=lambda: delay(0.001),
+        disabled=lambda: delay(0.001, disable=True),
+    )),
+    "delay_by_size": decorator_case(_states(
+        fired=lambda: delay_by_size(0.001, 1e-9),
+        disabled=lambda: delay_by_size(0.001, 1e-9, disable=True),
+    )),
+    "delay_by_size_inline": inline_case(_states(
+        fired=lambda: lambda: delay_by_size_inline(b"payload", 0.001, 1e-9),
+        disabled=lambda: lambda: delay_by_size_inline(b"payload", 0.001, 1e-9, disable=True),
+    )),
+    "delay_by_size_inline_async": async_inline_case(_states(
+        fired=lambda: lambda: delay_by_size_inline_async(b"payload", 0.001, 1e-9),
+        disabled=lambda: lambda: delay_by_size_inline_async(
+            b"payload", 0.001, 1e-9, disable=True),
+    )),
+    "delay_distribution": decorator_case(_states(
+        fired=lambda: delay_distribution(LOGNORMAL),
+        disabled=lambda: delay_distribution(LOGNORMAL, disable=True),
+    )),
+    "delay_distribution_inline": inline_case(_states(
+        fired=lambda: lambda: delay_distribution_inline(LOGNORMAL),
+        disabled=lambda: lambda: delay_distribution_inline(LOGNORMAL, disable=True),
+    )),
+    "delay_distribution_inline_async": async_inline_case(_states(
+        fired=lambda: lambda: delay_distribution_inline_async(LOGNORMAL),
+        disabled=lambda: lambda: delay_distribution_inline_async(LOGNORMAL, disable=True),
+    )),
+    "delay_inline": inline_case(_states(
+        fired=lambda: lambda: delay_inline(0.001),
+        disabled=lambda: lambda: delay_inline(0.001, disable=True),
+    )),
+    "delay_inline_async": async_inline_case(_states(
+        fired=lambda: lambda: delay_inline_async(0.001),
+        disabled=lambda: lambda: delay_inline_async(0.001, disable=True),
+    )),
+    "delay_at_nth_call": decorator_case(_states(
+        not_triggered=lambda: delay_at_nth_call(0.001, n=NEVER, func_id=None),
+        disabled=lambda: delay_at_nth_call(0.001, n=NEVER, func_id=None, disable=True),
+    )),
+    "delay_at_nth_call_inline": inline_case(_states(
+        not_triggered=lambda: lambda: delay_at_nth_call_inline(0.001, n=NEVER, func_id="bench"),
+        disabled=lambda: lambda: delay_at_nth_call_inline(
+            0.001, n=NEVER, func_id="bench", disable=True
+        ),
+    )),
+    "delay_at_nth_call_inline_async": async_inline_case(_states(
+        not_triggered=lambda: lambda: delay_at_nth_call_inline_async(
+            0.001, n=NEVER, func_id="bench"
+        ),
+        disabled=lambda: lambda: delay_at_nth_call_inline_async(
+            0.001, n=NEVER, func_id="bench", disable=True
+        ),
+    )),
+    "delay_on_schedule": decorator_case(_states(
+        fired=lambda: delay_on_schedule(ALWAYS, 0.001, func_id=None),
+        not_triggered=lambda: delay_on_schedule(NOT_YET, 0.001, func_id=None),
+        disabled=lambda: delay_on_schedule(ALWAYS, 0.001, func_id=None, disable=True),
+    )),
+    "delay_on_schedule_inline": inline_case(_states(
+        fired=lambda: lambda: delay_on_schedule_inline(ALWAYS, 0.001, func_id="bench"),
+        not_triggered=lambda: lambda: delay_on_schedule_inline(NOT_YET, 0.001, func_id="bench"),
+        disabled=lambda: lambda: delay_on_schedule_inline(
+            ALWAYS, 0.001, func_id="bench", disable=True
+        ),
+    )),
+    "delay_on_schedule_inline_async": async_inline_case(_states(
+        fired=lambda: lambda: delay_on_schedule_inline_async(ALWAYS, 0.001, func_id="bench"),
+        not_triggered=lambda: lambda: delay_on_schedule_inline_async(
+            NOT_YET, 0.001, func_id="bench"
+        ),
+        disabled=lambda: lambda: delay_on_schedule_inline_async(
+            ALWAYS, 0.001, func_id="bench", disable=True
+        ),
+    )),
+    "delay_rate_limited": decorator_case(_states(
+        fired=lambda: delay_rate_limited(0.001, rate_per_s=UNLIMITED_RATE),
+        not_triggered=lambda: delay_rate_limited(0.001, rate_per_s=DAILY_RATE),
+        disabled=lambda: delay_rate_limited(0.001, disable=True),
+    )),
+    "delay_rate_limited_inline": inline_case(_states(
+        fired=lambda: lambda: delay_rate_limited_inline(
+            0.001, rate_per_s=UNLIMITED_RATE, func_id="bench-fired"
+        ),
+        not_triggered=lambda: lambda: delay_rate_limited_inline(
+            0.001, rate_per_s=DAILY_RATE, func_id="bench-daily"
+        ),
+        disabled=lambda: lambda: delay_rate_limited_inline(0.001, disable=True),
+    )),
+    "delay_rate_limited_inline_async": async_inline_case(_states(
+        fired=lambda: lambda: delay_rate_limited_inline_async(
+            0.001, rate_per_s=UNLIMITED_RATE, func_id="bench-fired"
+        ),
+        not_triggered=lambda: lambda: delay_rate_limited_inline_async(
+            0.001, rate_per_s=DAILY_RATE, func_id="bench-daily"
+        ),
+        disabled=lambda: lambda: delay_rate_limited_inline_async(0.001, disable=True),
+    )),
+    "delay_items": stream_case(_states(
+        fired=lambda: lambda items: delay_items(items, 0.001),
+        not_triggered=lambda: lambda items: delay_items(items, 0.001, schedule=NOT_YET),
+        disabled=lambda: lambda items: delay_items(items, 0.001, disable=True),
+    )),
+    "delay_items_async": async_stream_case(_states(
+        fired=lambda: lambda items: delay_items_async(items, 0.001),
+        not_triggered=lambda: lambda items: delay_items_async(items, 0.001, schedule=NOT_YET),
+        disabled=lambda: lambda items: delay_items_async(items, 0.001, disable=True),
+    )),
+    "delay_bytes": stream_case(_states(
+        fired=lambda: lambda chunks: delay_bytes(chunks),
+        disabled=lambda: lambda chunks: delay_bytes(chunks, disable=True),
+    ), item=b"chunk"),
+    "delay_bytes_async": async_stream_case(_states(
+        fired=lambda: lambda chunks: delay_bytes_async(chunks),
+        disabled=lambda: lambda chunks: delay_bytes_async(chunks, disable=True),
+    ), item=b"chunk"),
+    "delay_random": decorator_case(_states(
+        fired=lambda: delay_random(0.001),
+        disabled=lambda: delay_random(0.001, disable=True),
+    )),
+    "delay_random_inline": inline_case(_states(
+        fired=lambda: lambda: delay_random_inline(0.001),
+        disabled=lambda: lambda: delay_random_inline(0.001, disable=True),
+    )),
+    "delay_random_inline_async": async_inline_case(_states(
+        fired=lambda: lambda: delay_random_inline_async(0.001),
+        disabled=lambda: lambda: delay_random_inline_async(0.001, disable=True),
+    )),
+    "delay_random_norm": decorator_case(_states(
+        fired=lambda: delay_random_norm(0.001, 0.0005),
+        disabled=lambda: delay_random_norm(0.001, 0.0005, disable=True),
+    )),
+    "delay_random_norm_inline": inline_case(_states(
+        fired=lambda: lambda: delay_random_norm_inline(0.001, 0.0005),
+        disabled=lambda: lambda: delay_random_norm_inline(0.001, 0.0005, disable=True),
+    )),
+    "delay_random_norm_inline_async": async_inline_case(_states(
+        fired=lambda: lambda: delay_random_norm_inline_async(0.001, 0.0005),
+        disabled=lambda: lambda: delay_random_norm_inline_async(
+            0.001, 0.0005, disable=True
+        ),
+    )),
+    "raise_": decorator_case(_states(
+        fired=lambda: raise_(),
+        disabled=lambda: raise_(disable=True),
+    )),
+    "raise_inline": inline_case(_states(
+        fired=lambda: lambda: raise_inline(),
+        disabled=lambda: lambda: raise_inline(disable=True),
+    )),
+    "raise_at_nth_call": decorator_case(_states(
+        not_triggered=lambda: raise_at_nth_call(n=NEVER, func_id=None),
+        disabled=lambda: raise_at_nth_call(n=NEVER, func_id=None, disable=True),
+    )),
+    "raise_at_nth_call_inline": inline_case(_states(
+        not_triggered=lambda: lambda: raise_at_nth_call_inline(n=NEVER, func_id="bench"),
+        disabled=lambda: lambda: raise_at_nth_call_inline(n=NEVER, func_id="bench", disable=True),
+    )),
+    "raise_on_schedule": decorator_case(_states(
+        fired=lambda: raise_on_schedule(ALWAYS, func_id=None),
+        not_triggered=lambda: raise_on_schedule(NOT_YET, func_id=None),
+        disabled=lambda: raise_on_schedule(ALWAYS, func_id=None, disable=True),
+    )),
+    "raise_on_schedule_inline": inline_case(_states(
+        fired=lambda: lambda: raise_on_schedule_inline(ALWAYS, func_id="bench"),
+        not_triggered=lambda: lambda: raise_on_schedule_inline(NOT_YET, func_id="bench"),
+        disabled=lambda: lambda: raise_on_schedule_inline(ALWAYS, func_id="bench", disable=True),
+    )),
+    "raise_rate_limited": decorator_case(_states(
+        fired=lambda: raise_rate_limited(rate_per_s=UNLIMITED_RATE),
+        not_triggered=lambda: raise_rate_limited(rate_per_s=DAILY_RATE),
+        disabled=lambda: raise_rate_limited(disable=True),
+    )),
+    "raise_rate_limited_inline": inline_case(_states(
+        fired=lambda: lambda: raise_rate_limited_inline(
+            rate_per_s=UNLIMITED_RATE, func_id="bench-fired"
+        ),
+        not_triggered=lambda: lambda: raise_rate_limited_inline(
+            rate_per_s=DAILY_RATE, func_id="bench-daily"
+        ),
+        disabled=lambda: lambda: raise_rate_limited_inline(disable=True),
+    )),
+    "raise_at_nth_item": stream_case(_states(
+        fired=lambda: lambda items: raise_at_nth_item(items, n=1),
+        not_triggered=lambda: lambda items: raise_at_nth_item(items, n=NEVER),
+        disabled=lambda: lambda items: raise_at_nth_item(items, n=1, disable=True),
+    )),
+    "raise_at_nth_item_async": async_stream_case(_states(
+        fired=lambda: lambda items: raise_at_nth_item_async(items, n=1),
+        not_triggered=lambda: lambda items: raise_at_nth_item_async(items, n=NEVER),
+        disabled=lambda: lambda items: raise_at_nth_item_async(items, n=1, disable=True),
+    )),
+    "raise_after_bytes": stream_case(_states(
+        fired=lambda: lambda chunks: raise_after_bytes(chunks, max_bytes=0),
+        not_triggered=lambda: lambda chunks: raise_after_bytes(chunks, max_bytes=NEVER),
+        disabled=lambda: lambda chunks: raise_after_bytes(chunks, max_bytes=0, disable=True),
+    ), item=b"chunk"),
+    "raise_after_bytes_async": async_stream_case(_states(
+        fired=lambda: lambda chunks: raise_after_bytes_async(chunks, max_bytes=0),
+        not_triggered=lambda: lambda chunks: raise_after_bytes_async(chunks, max_bytes=NEVER),
+        disabled=lambda: lambda chunks: raise_after_bytes_async(
+            chunks, max_bytes=0, disable=True
+        ),
+    ), item=b"chunk"),
+    "raise_random": decorator_case(_states(
+        fired=lambda: raise_random(prob_of_raise=1.0),
+        not_triggered=lambda: raise_random(prob_of_raise=0.0),
+        disabled=lambda: raise_random(prob_of_raise=1.0, disable=True),
+    )),
+    "raise_random_inline": inline_case(_states(
+        fired=lambda: lambda: raise_random_inline(prob_of_raise=1.0),
+        not_triggered=lambda: lambda: raise_random_inline(prob_of_raise=0.0),
+        disabled=lambda: lambda: raise_random_inline(prob_of_raise=1.0, disable=True),
+    )),
+}
+
+
+def public_injecting_apis() -> List[str]:
+    """Return the fault injection callables exported by ``fault_injection``."""
+    return sorted(
+        name
+        for name, value in vars(fault_injection).items()
+        if not name.startswith("_")
+        and callable(value)
+        and not isinstance(value, type)
+        and getattr(value, "__module__", "").startswith("fault_injection.")
+        and name not in NON_INJECTING_APIS
+    )
+
+
+def _time_sync(target: Target, calls: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        try:
+            target(1, 2)
+        except RuntimeError:
+            pass
+    return time.perf_counter_ns() - start
+
+
+def measure_single_thread(target: Target, calls: int) -> float:
+    _time_sync(target, min(calls, 1000))
+    return min(_time_sync(target, calls) for _ in range(3)) / calls
+
+
+def measure_multi_thread(target: Target, calls: int, threads: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        _time_sync(target, calls)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter_ns()
+    for thread in workers:
+        thread.join()
+    return (time.perf_counter_ns() - start) / (calls * threads)
+
+
+def measure_asyncio(target: Target, calls: int, tasks: int) -> float:
+    async def worker():
+        for _ in range(calls):
+            try:
+                await target(1, 2)
+            except RuntimeError:
+                pass
+
+    async def main():
+        start = time.perf_counter_ns()
+        await asyncio.gather(*(worker() for _ in range(tasks)))
+        return time.perf_counter_ns() - start
+
+    return asyncio.run(main()) / (calls * tasks)
+
+
+def run(
+    calls: int = 100_000,
+    threads: int = 4,
+    tasks: int = 16,
+    apis: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run the benchmark and return machine-readable results."""
+    measures = {
+        "single_thread": lambda target: measure_single_thread(target, calls),
+        "multi_thread": lambda target: measure_multi_thread(target, calls // threads, threads),
+        "asyncio": lambda target: measure_asyncio(target, calls // tasks, tasks),
+    }
+    results = []
+    with patch("fault_injection.delays.time.sleep", new=_noop_sleep), \
+            patch("fault_injection.delays.asyncio.sleep", new=_noop_async_sleep):
+        baselines = {
+            "single_thread": measures["single_thread"](add),
+            "multi_thread": measures["multi_thread"](add),
+            "asyncio": measures["asyncio"](add_async),
+        }
+        for api in apis or sorted(CASES):
+            for state in STATES:
+                sync_target, async_target = CASES[api](state)
+                for load in LOADS:
+                    target = async_target if load == "asyncio" else sync_target
+                    if target is None:
+                        continue
+                    ns_per_call = measures[load](target)
+                    results.append({
+                        "api": api,
+                        "state": state,
+                        "load": load,
+                        "ns_per_call": round(ns_per_call, 1),
+                        "baseline_ns_per_call": round(baselines[load], 1),
+                        "overhead_ns": round(ns_per_call - baselines[load], 1),
+                    })
+    return {
+        "library_version": _library_version(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "calls": calls,
+        "threads": threads,
+        "tasks": tasks,
+        "results": results,
+    }
+
+
+def _library_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("fault-injection")
+    except Exception:
+        return "unknown"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000, help="calls per measurement")
+    parser.add_argument("--threads", type=int, default=4, help="threads for the multi_thread load")
+    parser.add_argument("--tasks", type=int, default=16, help="tasks for the asyncio load")
+    parser.add_argument("--api", action="append", choices=sorted(CASES), help="APIs to measure")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    missing = sorted(set(public_injecting_apis()) - set(CASES))
+    if missing:
+        parser.error(f"no benchmark case for public APIs: {', '.join(missing)}")
+
+    report = run(calls=args.calls, threads=args.threads, tasks=args.tasks, apis=args.api)
+    for row in report["results"]:
+        print(
+            f"{row['api']:<32} {row['state']:<14} {row['load']:<14} "
+            f"{row['ns_per_call']:9.1f} ns/call  overhead {row['overhead_ns']:9.1f} ns"
+        )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+python -m examples.async_delay
+"""
+import asyncio
+import time
+from fault_injection import delay, delay_inline_async
+
+@delay(0.5)
+async def fetch_slowed(i):
+    return i
+
+async def fetch_inline_slowed(i):
+    await delay_inline_async(0.5)
+    return i
+
+async def main():
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fetch_slowed(i) for i in range(10)))
+    print(f"Decorator results: {results}, duration {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fetch_inline_slowed(i) for i in range(10)))
+    print(f"Inline results: {results}, duration {time.perf_counter() - start:.2f}s")
+
+asyncio.run(main())
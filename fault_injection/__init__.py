@@ -1,4 +1,15 @@
 from .delays import (delay_inline, delay, delay_random_inline, delay_random,
-    delay_random_norm_inline, delay_random_norm, delay_at_nth_call_inline, delay_at_nth_call)
+    delay_random_norm_inline, delay_random_norm, delay_at_nth_call_inline, delay_at_nth_call,
+    delay_inline_async, delay_random_inline_async, delay_random_norm_inline_async,
+    delay_at_nth_call_inline_async, delay_on_schedule, delay_on_schedule_inline,
+    delay_on_schedule_inline_async, delay_rate_limited, delay_rate_limited_inline,
+    delay_rate_limited_inline_async, delay_distribution, delay_distribution_inline,
+    delay_distribution_inline_async, delay_by_size, delay_by_size_inline,
+    delay_by_size_inline_async)
 from .raise_exception import (raise_inline, raise_, raise_at_nth_call,
-    raise_at_nth_call_inline, raise_random_inline, raise_random)
+    raise_at_nth_call_inline, raise_random_inline, raise_random, raise_on_schedule,
+    raise_on_schedule_inline, raise_rate_limited, raise_rate_limited_inline)
+from .streams import (delay_items, delay_items_async, raise_at_nth_item,
+    raise_at_nth_item_async, delay_bytes, delay_bytes_async, raise_after_bytes,
+    raise_after_bytes_async)
+from .switch import enable, disable, enabled, is_enabled
@@ -0,0 +1,172 @@
+"""Apply one fault policy to every matching method of a class.
+
+:func:`inject_methods` is a class decorator. A :class:`FaultPolicy` names a fault from
+:data:`fault_injection.plan.FAULTS` and its parameters, like a fault plan site. It is compiled
+once per decorated class into a single prepared inline helper call. Every matched method shares
+that call, and with it one counter, token bucket and random stream, so setup cost and memory do
+not grow with the number of methods beyond one thin wrapper each.
+"""
+
+import fnmatch
+import inspect
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Union
+
+from .counters import CounterStore
+from .plan import FAULTS, _compile_site, _CompiledSite
+from .switch import _state
+
+Patterns = Union[str, Sequence[str]]
+
+
+class FaultPolicy:
+    """A fault and its parameters, to be shared by the methods of a class.
+
+    Args:
+        fault: Name of a fault in :data:`fault_injection.plan.FAULTS`, e.g. ``"delay_random"``.
+        **params: Parameters of the fault's inline helper, e.g. ``max_time_s=0.2``. Unless
+            ``counters`` is given, each decorated class gets its own counter store, so classes
+            with the same qualified name do not share counts. ``func_id`` defaults to
+            ``"class:<module>.<qualname>"``; ``site`` defaults to ``None``.
+
+    Raises:
+        ValueError: If the fault is unknown or its parameters are invalid.
+    """
+
+    def __init__(self, fault: str, **params: Any) -> None:
+        self.fault = fault
+        self.params = params
+        # Validate now rather than when the first class is decorated.
+        self.compile("FaultPolicy")
+
+    def compile(self, name: str) -> _CompiledSite:
+        """Return the prepared inline calls of this policy for the class named ``name``."""
+        params: Dict[str, Any] = dict(self.params, fault=self.fault)
+        params.setdefault("site", None)
+        if self.fault in FAULTS:
+            accepted = inspect.signature(FAULTS[self.fault][0]).parameters
+            if "func_id" in accepted:
+                params.setdefault("func_id", f"class:{name}")
+            if "counters" in accepted:
+                # Owned by the compiled class, so it is released with it.
+                params.setdefault("counters", CounterStore())
+        compiled = _compile_site(name, params)
+        if compiled is None:
+            raise ValueError("FaultPolicy should not set enabled = False; use disable=True")
+        return compiled
+
+    def __repr__(self) -> str:
+        params = ", ".join(f"{key}={value!r}" for key, value in self.params.items())
+        return f"FaultPolicy({self.fault!r}{', ' if params else ''}{params})"
+
+
+def _patterns(patterns: Patterns) -> Sequence[str]:
+    return (patterns,) if isinstance(patterns, str) else tuple(patterns)
+
+
+def _matches(name: str, include: Sequence[str], exclude: Sequence[str]) -> bool:
+    return (any(fnmatch.fnmatchcase(name, pattern) for pattern in include)
+            and not any(fnmatch.fnmatchcase(name, pattern) for pattern in exclude))
+
+
+def _wrap(func: Callable[..., Any], compiled: _CompiledSite) -> Callable[..., Any]:
+    inject = compiled.inject
+    if inspect.iscoroutinefunction(func):
+        inject_async = compiled.inject_async
+        if inject_async is None:
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                inject()
+                return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                await inject_async()
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        inject()
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _wrap_attribute(raw: Any, compiled: _CompiledSite) -> Optional[Any]:
+    """Return the injected version of a raw class attribute, or ``None`` to leave it alone."""
+    if isinstance(raw, staticmethod):
+        return staticmethod(_wrap(raw.__func__, compiled))
+    if isinstance(raw, classmethod):
+        return classmethod(_wrap(raw.__func__, compiled))
+    if isinstance(raw, property):
+        return property(
+            None if raw.fget is None else _wrap(raw.fget, compiled),
+            None if raw.fset is None else _wrap(raw.fset, compiled),
+            None if raw.fdel is None else _wrap(raw.fdel, compiled),
+            raw.__doc__,
+        )
+    if inspect.isfunction(raw):
+        return _wrap(raw, compiled)
+    return None
+
+
+def _own_and_inherited(cls: type, inherited: bool) -> Iterable[tuple]:
+    if not inherited:
+        return list(vars(cls).items())
+    seen: Dict[str, Any] = {}
+    for klass in cls.__mro__[:-1]:
+        for name, raw in vars(klass).items():
+            seen.setdefault(name, raw)
+    return list(seen.items())
+
+
+def inject_methods(
+    policy: Union[FaultPolicy, str],
+    include: Patterns = "*",
+    exclude: Patterns = "_*",
+    inherited: bool = False,
+    disable: bool = False,
+    **params: Any,
+) -> Callable[[type], type]:
+    """Return a class decorator that injects ``policy`` into every matching method.
+
+    Functions, coroutine functions, staticmethods, classmethods and the getter, setter and
+    deleter of properties are wrapped; other attributes are left alone. All of them share the
+    policy compiled once for the class.
+
+    Args:
+        policy: A :class:`FaultPolicy`, or a fault name whose parameters are given in
+            ``**params``.
+        include: Glob pattern or patterns of method names to inject into.
+        exclude: Glob pattern or patterns of method names to skip. By default private and
+            special methods are skipped.
+        inherited: If ``True``, matching methods inherited from base classes are also wrapped,
+            as overrides on the decorated class.
+        disable: If ``True``, the class is returned unchanged.
+        **params: Parameters of the fault when ``policy`` is a fault name.
+
+    Raises:
+        ValueError: If the fault or its parameters are invalid, or ``params`` are given with a
+            :class:`FaultPolicy`.
+    """
+    if isinstance(policy, FaultPolicy):
+        if params:
+            raise ValueError("pass parameters to FaultPolicy, not with it")
+    else:
+        policy = FaultPolicy(policy, **params)
+    include_patterns = _patterns(include)
+    exclude_patterns = _patterns(exclude)
+
+    def decorator(cls: type) -> type:
+        if disable or not _state.enabled:
+            return cls
+        compiled = policy.compile(f"{cls.__module__}.{cls.__qualname__}")
+        for name, raw in _own_and_inherited(cls, inherited):
+            if not _matches(name, include_patterns, exclude_patterns):
+                continue
+            wrapped = _wrap_attribute(raw, compiled)
+            if wrapped is not None:
+                setattr(cls, name, wrapped)
+        return cls
+
+    return decorator
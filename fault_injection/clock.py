@@ -0,0 +1,227 @@
+"""Virtual time for delay-heavy test suites.
+
+Inside :func:`virtual_time` the delay helpers advance a simulated monotonic clock instead of
+sleeping, so injected latency costs no wall time. Code under test reads the clock with
+:func:`monotonic` and waits with :func:`sleep` or :func:`sleep_async`, which fall back to the
+real ``time`` and ``asyncio`` functions outside virtual time.
+
+Sync sleeps advance the clock immediately. Async sleeps wait in a deadline-ordered queue: when
+the event loop has nothing else to run, the clock jumps to the earliest deadline and that sleeper
+is woken, so concurrent tasks wake in the same order and at the same clock readings as they would
+in real time.
+
+The event loop's own clock is driven too: ``loop.time()`` follows the virtual clock, and when the
+loop is about to block waiting for its next timer, the clock jumps to that timer instead. So
+``asyncio.sleep``, ``asyncio.wait_for``, ``asyncio.timeout`` and ``loop.call_later`` share the
+virtual clock with injected sleeps. A loop is driven from the first async sleep in virtual time,
+or from entering :func:`virtual_time` inside it, until the ``with`` block exits. Only selector
+event loops, the ``asyncio`` default on every platform but Windows, can be driven: async sleeps
+raise ``RuntimeError`` on others, such as uvloop or the Windows proactor loop.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from asyncio.selector_events import BaseSelectorEventLoop
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class VirtualClock:
+    """A monotonic clock that only moves when something sleeps or :meth:`advance` is called.
+
+    Args:
+        start_s: Initial reading of the clock in seconds.
+    """
+
+    def __init__(self, start_s: float = 0.0) -> None:
+        self._now_ns = round(start_s * 1e9)
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._sleepers: Dict[asyncio.AbstractEventLoop, List[Tuple[int, int, asyncio.Future]]] = {}
+        # Attributes of driven loops replaced by :meth:`_drive`, to put back on release.
+        self._saved: Dict[asyncio.AbstractEventLoop, Dict[str, Any]] = {}
+
+    def monotonic_ns(self) -> int:
+        """Return the current reading in nanoseconds."""
+        return self._now_ns
+
+    def monotonic(self) -> float:
+        """Return the current reading in seconds."""
+        return self._now_ns / 1e9
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward by ``seconds``.
+
+        Raises:
+            ValueError: If ``seconds`` is negative.
+        """
+        if seconds < 0:
+            raise ValueError("advance should have positive seconds")
+        with self._lock:
+            self._now_ns += round(seconds * 1e9)
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the clock by ``seconds`` without blocking."""
+        self.advance(max(0.0, seconds))
+
+    async def sleep_async(self, seconds: float) -> None:
+        """Suspend the awaiting task until the clock reaches ``now + seconds``.
+
+        Raises:
+            RuntimeError: If the clock is not active in :func:`virtual_time`, or the running
+                loop is not a selector event loop.
+        """
+        if _state.clock is not self:
+            raise RuntimeError("VirtualClock.sleep_async needs the clock active in virtual_time()")
+        loop = asyncio.get_running_loop()
+        self._drive(loop, strict=True)
+        future = loop.create_future()
+        with self._lock:
+            deadline_ns = self._now_ns + round(max(0.0, seconds) * 1e9)
+            heapq.heappush(self._sleepers.setdefault(loop, []),
+                           (deadline_ns, next(self._sequence), future))
+        await future
+
+    def _drive(self, loop: asyncio.AbstractEventLoop, strict: bool) -> None:
+        """Make ``loop.time()`` follow this clock, and jump the clock when ``loop`` goes idle."""
+        if loop in self._saved:
+            return
+        if not isinstance(loop, BaseSelectorEventLoop):
+            if strict:
+                raise RuntimeError("virtual time needs a selector event loop, "
+                                   f"not {type(loop).__name__}")
+            return
+        saved = {name: vars(loop).get(name) for name in ("time", "_selector")}
+        offset = loop.time() - self.monotonic()
+        loop.time = lambda: offset + self._now_ns / 1e9  # type: ignore[method-assign]
+        loop._selector = _IdleSelector(loop._selector, self, loop)  # type: ignore[attr-defined]
+        self._saved[loop] = saved
+
+    def _release(self) -> None:
+        """Give driven loops their real clock back, keeping their timers' remaining delays."""
+        for loop, saved in list(self._saved.items()):
+            virtual_now = loop.time()
+            for name, previous in saved.items():
+                if previous is None:
+                    delattr(loop, name)
+                else:
+                    setattr(loop, name, previous)
+            shift = virtual_now - loop.time()
+            for handle in loop._scheduled:  # type: ignore[attr-defined]
+                handle._when -= shift  # Uniform shift, so the heap order still holds.
+        self._saved.clear()
+
+    def _idle(self, loop: asyncio.AbstractEventLoop, timeout: Optional[float]) -> bool:
+        """Jump to the next sleeper or loop timer instead of blocking for ``timeout`` seconds.
+
+        Return ``False`` if there is nothing to jump to and the loop should really wait for I/O.
+        """
+        if timeout is not None and timeout <= 0:
+            return False
+        with self._lock:
+            heap = self._sleepers.get(loop)
+            while heap and heap[0][2].done():
+                heapq.heappop(heap)
+            # The loop's timeout is the delay to its next timer; round up past float error.
+            timer_ns = None if timeout is None else self._now_ns + max(1, math.ceil(timeout * 1e9))
+            if heap and (timer_ns is None or heap[0][0] <= timer_ns):
+                deadline_ns, _, future = heapq.heappop(heap)
+                self._now_ns = max(self._now_ns, deadline_ns)
+                future.set_result(None)
+                return True
+            if timer_ns is None:
+                return False
+            self._now_ns = timer_ns
+            return True
+
+
+class _IdleSelector:
+    """Selector of a driven loop: polls instead of blocking, after moving the virtual clock."""
+
+    def __init__(self, selector: Any, clock: VirtualClock, loop: asyncio.AbstractEventLoop) -> None:
+        self._selector = selector
+        self._clock = clock
+        self._loop = loop
+
+    def select(self, timeout: Optional[float] = None) -> Any:
+        if self._clock._idle(self._loop, timeout):
+            timeout = 0
+        return self._selector.select(timeout)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._selector, name)
+
+
+class _State:
+    __slots__ = ("clock",)
+
+    def __init__(self) -> None:
+        self.clock: Optional[VirtualClock] = None
+
+
+_state = _State()
+
+
+def current() -> Optional[VirtualClock]:
+    """Return the active virtual clock, or ``None`` outside :func:`virtual_time`."""
+    return _state.clock
+
+
+@contextmanager
+def virtual_time(start_s: float = 0.0) -> Iterator[VirtualClock]:
+    """Run the ``with`` block in virtual time and yield its :class:`VirtualClock`.
+
+    Event loops driven by the clock get their real clock back on exit, and their pending timers
+    keep their remaining virtual delay. The previous clock, if any, is restored on exit.
+
+    Args:
+        start_s: Initial reading of the clock in seconds.
+    """
+    previous = _state.clock
+    clock = VirtualClock(start_s)
+    _state.clock = clock
+    try:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # No running loop; loops are driven from their first sleep.
+            pass
+        else:
+            clock._drive(loop, strict=False)
+        yield clock
+    finally:
+        _state.clock = previous
+        clock._release()
+
+
+def monotonic() -> float:
+    """Return the virtual clock reading in virtual time, ``time.monotonic()`` otherwise."""
+    clock = _state.clock
+    return time.monotonic() if clock is None else clock.monotonic()
+
+
+def monotonic_ns() -> int:
+    """Return the virtual clock reading in virtual time, ``time.monotonic_ns()`` otherwise."""
+    clock = _state.clock
+    return time.monotonic_ns() if clock is None else clock.monotonic_ns()
+
+
+def sleep(seconds: float) -> None:
+    """Advance the virtual clock in virtual time, call ``time.sleep`` otherwise."""
+    clock = _state.clock
+    if clock is None:
+        time.sleep(seconds)
+    else:
+        clock.sleep(seconds)
+
+
+async def sleep_async(seconds: float) -> None:
+    """Wait on the virtual clock in virtual time, await ``asyncio.sleep`` otherwise."""
+    clock = _state.clock
+    if clock is None:
+        await asyncio.sleep(seconds)
+    else:
+        await clock.sleep_async(seconds)
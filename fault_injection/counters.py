@@ -0,0 +1,383 @@
+"""Thread-safe call counters shared by the n-th call helpers."""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class AtomicCounter:
+    """Call counter with atomic increments.
+
+    Each counter owns its own lock, so threads only contend when they hit the same
+    ``func_id``; unrelated call sites never serialize on each other. The critical section is a
+    single integer increment, which keeps the result exact under the GIL and free threading
+    alike: every increment returns a distinct value, so exactly one caller observes ``n``.
+    """
+
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self, value: int = 0) -> None:
+        self._lock = threading.Lock()
+        self._value = value
+
+    def increment(self) -> int:
+        """Increment the counter and return the new value."""
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    @property
+    def value(self) -> int:
+        """Current number of recorded calls."""
+        return self._value
+
+    def reset(self) -> None:
+        """Set the counter back to zero."""
+        with self._lock:
+            self._value = 0
+
+
+class CounterStore:
+    """Mapping of ``func_id`` to :class:`AtomicCounter`.
+
+    Lookups of existing counters in an unbounded store are lock-free dictionary reads; the
+    store lock is only taken the first time a ``func_id`` is seen. A bounded store keeps at
+    most ``max_size`` counters and evicts the least recently used one, which caps memory when
+    ``func_id`` values are generated dynamically. Bounded stores take the store lock on every
+    lookup to maintain the LRU order. An evicted counter starts again from zero.
+
+    Counters created with :meth:`function_counter` are keyed by a weak reference to the
+    decorated function. They are not subject to eviction and disappear with the function.
+
+    Args:
+        max_size: Maximum number of ``func_id`` counters, or ``None`` for no limit. Can be
+            changed later through the ``max_size`` attribute.
+
+    Raises:
+        ValueError: If ``max_size`` is not a positive integer or ``None``.
+    """
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        if max_size is not None and (max_size < 1 or not isinstance(max_size, int)):
+            raise ValueError("max_size should be a positive integer or None.")
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._counters: "OrderedDict[Hashable, AtomicCounter]" = OrderedDict()
+        self._function_counters: "weakref.WeakKeyDictionary[Callable[..., Any], AtomicCounter]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self, func_id: Hashable) -> AtomicCounter:
+        """Return the counter for ``func_id``, creating it on first use."""
+        if self.max_size is None:
+            counter = self._counters.get(func_id)
+            if counter is not None:
+                return counter
+        with self._lock:
+            counter = self._counters.get(func_id)
+            if counter is None:
+                counter = AtomicCounter()
+                self._counters[func_id] = counter
+                if self.max_size is not None:
+                    while len(self._counters) > self.max_size:
+                        self._counters.popitem(last=False)
+            elif self.max_size is not None:
+                self._counters.move_to_end(func_id)
+        return counter
+
+    def increment(self, func_id: Hashable) -> int:
+        """Increment the counter for ``func_id`` and return the new value."""
+        return self.get(func_id).increment()
+
+    def value(self, func_id: Hashable) -> int:
+        """Return the current count for ``func_id`` without creating a counter."""
+        counter = self._counters.get(func_id)
+        return 0 if counter is None else counter.value
+
+    def function_counter(self, func: Callable[..., Any]) -> AtomicCounter:
+        """Return a counter owned by ``func`` and weakly keyed on it.
+
+        Used by the n-th call decorators when ``func_id`` is ``None``: the decorated function
+        keeps its counter alive, and the store entry goes away when the function is collected.
+        """
+        with self._lock:
+            counter = self._function_counters.get(func)
+            if counter is None:
+                counter = AtomicCounter()
+                self._function_counters[func] = counter
+        return counter
+
+    def snapshot(self) -> Dict[Any, int]:
+        """Return the current counts keyed by ``func_id`` or by decorated function."""
+        with self._lock:
+            counts: Dict[Any, int] = {
+                func_id: counter.value for func_id, counter in self._counters.items()
+            }
+            counts.update(
+                (func, counter.value) for func, counter in self._function_counters.items()
+            )
+        return counts
+
+    def reset(self, func_id: Optional[Hashable] = None) -> None:
+        """Reset counters.
+
+        Args:
+            func_id: Counter to reset. If ``None``, every ``func_id`` counter is dropped and
+                every function counter is set back to zero.
+        """
+        with self._lock:
+            if func_id is None:
+                self._counters = OrderedDict()
+                for counter in self._function_counters.values():
+                    counter.reset()
+            else:
+                self._counters.pop(func_id, None)
+
+    def __contains__(self, func_id: Any) -> bool:
+        return func_id in self._counters
+
+    def __len__(self) -> int:
+        return len(self._counters) + len(self._function_counters)
+
+
+class SharedCounter:
+    """Counter stored in a :class:`SharedCounterStore` slot."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "SharedCounterStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def increment(self) -> int:
+        """Increment the counter across all processes and return the new value."""
+        return self._store._increment_slot(self._index)
+
+    @property
+    def value(self) -> int:
+        """Current number of recorded calls across all processes."""
+        return self._store._view[self._index + 1]
+
+    def reset(self) -> None:
+        """Set the counter back to zero for all processes."""
+        self._store._reset_slot(self._index)
+
+
+class SharedCounterStore:
+    """Counter store shared by all processes on a host.
+
+    Counters live in a memory-mapped file, for example under ``/dev/shm``. Every process that
+    opens the same ``path`` shares one counter per ``func_id``, so an n-th call trigger fires
+    exactly once across a gunicorn or ``multiprocessing`` worker fleet. Increments are atomic:
+    each slot is guarded by a POSIX byte-range lock between processes and a thread lock inside
+    a process.
+
+    ``func_id`` values are identified by a 64-bit hash of their ``repr``, so they must have a
+    stable ``repr`` across processes (integers and strings do). Requires ``fcntl`` (POSIX).
+
+    Args:
+        path: File backing the shared counters. Created if it does not exist.
+        capacity: Maximum number of distinct ``func_id`` values. Only used when the file is
+            created; existing files keep their capacity.
+
+    Raises:
+        ValueError: If ``capacity`` is not a positive integer or ``path`` is not a counter file.
+        RuntimeError: If ``fcntl`` is not available on this platform.
+    """
+
+    _MAGIC = int.from_bytes(b"FICNTR01", "little", signed=True)
+    _HEADER_ITEMS = 2
+    _SLOT_ITEMS = 2
+    _ITEM_SIZE = 8
+
+    def __init__(self, path: str, capacity: int = 1024) -> None:
+        if fcntl is None:
+            raise RuntimeError("SharedCounterStore requires fcntl (POSIX only)")
+        if capacity < 1 or not isinstance(capacity, int):
+            raise ValueError("capacity should be a positive integer.")
+
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        header_size = self._HEADER_ITEMS * self._ITEM_SIZE
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, header_size, 0)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, self._file_size(capacity))
+                os.pwrite(self._fd, struct.pack("<qq", self._MAGIC, capacity), 0)
+            magic, capacity = struct.unpack("<qq", os.pread(self._fd, header_size, 0))
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, header_size, 0)
+        if magic != self._MAGIC or os.fstat(self._fd).st_size != self._file_size(capacity):
+            os.close(self._fd)
+            raise ValueError(f"{path} is not a shared counter file")
+
+        self.capacity = capacity
+        self._mmap = mmap.mmap(self._fd, self._file_size(capacity))
+        self._view = memoryview(self._mmap).cast("q")
+        self._indexes: Dict[Hashable, int] = {}
+        self._init_thread_locks()
+        _SHARED_STORES.add(self)
+
+    @classmethod
+    def _file_size(cls, capacity: int) -> int:
+        return (cls._HEADER_ITEMS + capacity * cls._SLOT_ITEMS) * cls._ITEM_SIZE
+
+    def _init_thread_locks(self) -> None:
+        self._lock = threading.Lock()
+        self._slot_locks: Dict[int, threading.Lock] = {}
+
+    @staticmethod
+    def _key_hash(func_id: Hashable) -> int:
+        digest = hashlib.blake2b(repr(func_id).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True) or 1
+
+    def _lock_range(self, index: int, length: int, operation: int) -> None:
+        fcntl.lockf(self._fd, operation, length * self._ITEM_SIZE, index * self._ITEM_SIZE)
+
+    def _find_slot(self, func_id: Hashable) -> int:
+        """Return the view index of the slot for ``func_id``, claiming a free slot if needed."""
+        key = self._key_hash(func_id)
+        view = self._view
+        start = key % self.capacity
+        with self._lock:
+            self._lock_range(0, self._HEADER_ITEMS, fcntl.LOCK_EX)
+            try:
+                for probe in range(self.capacity):
+                    index = self._HEADER_ITEMS + ((start + probe) % self.capacity) * self._SLOT_ITEMS
+                    if view[index] == key:
+                        break
+                    if view[index] == 0:
+                        view[index] = key
+                        break
+                else:
+                    raise RuntimeError(f"SharedCounterStore {self.path} is full")
+            finally:
+                self._lock_range(0, self._HEADER_ITEMS, fcntl.LOCK_UN)
+            self._slot_locks.setdefault(index, threading.Lock())
+            self._indexes[func_id] = index
+        return index
+
+    def _increment_slot(self, index: int) -> int:
+        with self._slot_locks[index]:
+            self._lock_range(index, self._SLOT_ITEMS, fcntl.LOCK_EX)
+            try:
+                value = self._view[index + 1] + 1
+                self._view[index + 1] = value
+            finally:
+                self._lock_range(index, self._SLOT_ITEMS, fcntl.LOCK_UN)
+        return value
+
+    def _reset_slot(self, index: int) -> None:
+        with self._slot_locks[index]:
+            self._lock_range(index, self._SLOT_ITEMS, fcntl.LOCK_EX)
+            try:
+                self._view[index + 1] = 0
+            finally:
+                self._lock_range(index, self._SLOT_ITEMS, fcntl.LOCK_UN)
+
+    def get(self, func_id: Hashable) -> SharedCounter:
+        """Return the shared counter for ``func_id``, claiming a slot on first use."""
+        index = self._indexes.get(func_id)
+        if index is None:
+            index = self._find_slot(func_id)
+        return SharedCounter(self, index)
+
+    def increment(self, func_id: Hashable) -> int:
+        """Increment the counter for ``func_id`` across all processes and return the new value."""
+        index = self._indexes.get(func_id)
+        if index is None:
+            index = self._find_slot(func_id)
+        return self._increment_slot(index)
+
+    def value(self, func_id: Hashable) -> int:
+        """Return the current count for ``func_id`` across all processes."""
+        return self.get(func_id).value
+
+    def function_counter(self, func: Callable[..., Any]) -> SharedCounter:
+        """Return the shared counter keyed by the qualified name of ``func``.
+
+        The qualified name is stable across processes, so every worker that decorates the same
+        function shares its counter.
+        """
+        return self.get(f"{func.__module__}.{func.__qualname__}")
+
+    def snapshot(self) -> Dict[Any, int]:
+        """Return the current counts of the ``func_id`` values used by this process."""
+        return {func_id: self._view[index + 1] for func_id, index in list(self._indexes.items())}
+
+    def reset(self, func_id: Optional[Hashable] = None) -> None:
+        """Set counters back to zero for all processes.
+
+        Slots stay assigned to their ``func_id`` so other processes can keep using them.
+
+        Args:
+            func_id: Counter to reset. If ``None``, every counter is reset.
+        """
+        if func_id is not None:
+            self.get(func_id).reset()
+            return
+        # Slot by slot, under the same locks as increments: POSIX record locks belong to the
+        # process, so unlocking the whole file would also drop slot locks held by other threads.
+        for index in range(self._HEADER_ITEMS, len(self._view), self._SLOT_ITEMS):
+            if self._view[index] == 0:
+                continue
+            with self._lock:
+                self._slot_locks.setdefault(index, threading.Lock())
+            self._reset_slot(index)
+
+    def close(self) -> None:
+        """Release the mapping and the file descriptor. The file itself is kept."""
+        _SHARED_STORES.discard(self)
+        self._view.release()
+        self._mmap.close()
+        os.close(self._fd)
+
+    def __contains__(self, func_id: Any) -> bool:
+        if func_id in self._indexes:
+            return True
+        key = self._key_hash(func_id)
+        return any(
+            self._view[index] == key
+            for index in range(self._HEADER_ITEMS, len(self._view), self._SLOT_ITEMS)
+        )
+
+    def __len__(self) -> int:
+        return sum(
+            1
+            for index in range(self._HEADER_ITEMS, len(self._view), self._SLOT_ITEMS)
+            if self._view[index] != 0
+        )
+
+    def __enter__(self) -> "SharedCounterStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_SHARED_STORES: "weakref.WeakSet[SharedCounterStore]" = weakref.WeakSet()
+
+
+def _reinit_shared_stores_after_fork() -> None:
+    # Thread locks may have been held by another thread at fork time.
+    for store in list(_SHARED_STORES):
+        store._init_thread_locks()
+        for index in store._indexes.values():
+            store._slot_locks[index] = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_shared_stores_after_fork)
+
+
+Counters = Union[CounterStore, SharedCounterStore]
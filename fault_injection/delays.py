@@ -1,48 +1,139 @@
 """Delay-based fault injection helpers."""
 
+import asyncio
+import inspect
+import math
 import random
 import time
-from functools import wraps
-from typing import Any, Callable
+from functools import partial, wraps
+from typing import Any, Callable, Optional, Union
+
+from .clock import _state as _clock
+from .counters import Counters, CounterStore
+from .distributions import Distribution
+from .metrics import SiteMetrics, _count_fault, _optional_site_metrics
+from .precision import _state as _precision, precise_sleep
+from .predicates import _argument_getter
+from .rate_limit import BucketStore, TokenBucket, _validate as _validate_rate
+from .rng import site_stream
+from .sampling import RandomSource
+from .schedule import Schedule
+from .switch import _state
+from .timer_wheel import _state as _wheel, sleep_async as _wheel_sleep
 
 Decorator = Callable[[Callable[..., Any]], Callable[..., Any]]
 
+_NTH_CALL_COUNTERS = CounterStore()
+_NTH_CALL_INLINE_COUNTERS = CounterStore()
+_SCHEDULE_COUNTERS = CounterStore()
+_SCHEDULE_INLINE_COUNTERS = CounterStore()
+_RATE_LIMIT_INLINE_BUCKETS = BucketStore()
+
+
+def _sleep(time_s: float, metrics: Optional[SiteMetrics]) -> None:
+    """Block for ``time_s`` seconds and record the injected delay.
+
+    Advances the virtual clock instead inside :func:`~fault_injection.clock.virtual_time`. Uses
+    :func:`~fault_injection.precision.precise_sleep` in precision mode, in which case the
+    measured duration is recorded next to the requested one.
+    """
+    clock = _clock.clock
+    if clock is not None:
+        clock.sleep(time_s)
+        actual_s = time_s
+    elif _precision.enabled:
+        actual_s = precise_sleep(time_s)
+    else:
+        time.sleep(time_s)
+        actual_s = time_s
+    _count_fault()
+    if metrics is not None:
+        metrics.record_sleep(actual_s, requested_s=time_s)
+
+
+async def _async_sleep(time_s: float, metrics: Optional[SiteMetrics]) -> None:
+    """Suspend the awaiting coroutine for ``time_s`` seconds and record the injected delay.
+
+    Waits on the virtual clock instead inside :func:`~fault_injection.clock.virtual_time`, and
+    on the loop's :mod:`~fault_injection.timer_wheel` in timer-wheel mode.
+    """
+    clock = _clock.clock
+    if clock is not None:
+        await clock.sleep_async(time_s)
+    elif _wheel.enabled:
+        await _wheel_sleep(time_s)
+    else:
+        await asyncio.sleep(time_s)
+    _count_fault()
+    if metrics is not None:
+        metrics.record_sleep(time_s)
+
 
-def delay_inline(time_s: float = 0.1, disable: bool = False) -> None:
+def delay_inline(
+    time_s: float = 0.1,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> None:
     """Inject a fixed delay immediately.
 
     Args:
         time_s: Sleep duration in seconds. Must be non-negative.
         disable: If ``True``, the delay is skipped.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``time_s`` is negative.
     """
     if time_s < 0:
         raise ValueError("delay should have positive time_s")
-    if not disable:
-        time.sleep(time_s)
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        _sleep(time_s, metrics)
 
 
-def delay(time_s: float = 0.1, disable: bool = False) -> Decorator:
+def delay(
+    time_s: float = 0.1,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> Decorator:
     """Return a decorator that injects a fixed delay before function execution.
 
     Args:
         time_s: Sleep duration in seconds. Must be non-negative.
-        disable: If ``True``, the delay is skipped.
+        disable: If ``True``, the function is returned undecorated.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``time_s`` is negative.
     """
     if time_s < 0:
         raise ValueError("delay should have positive time_s")
+    metrics = _optional_site_metrics(site)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         """Wrap ``func`` with a fixed pre-execution delay."""
+        if disable or not _state.enabled:
+            return func
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    await _async_sleep(time_s, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not disable:
-                time.sleep(time_s)
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                _sleep(time_s, metrics)
             return func(*args, **kwargs)
         return wrapper
 
@@ -53,7 +144,9 @@ def delay_at_nth_call_inline(
         time_s: float = 0.1,
         n: int = 5,
         func_id = 1,
-        disable: bool = False
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
     ) -> None:
     """Inject a fixed delay at the n-th call for a given ``func_id``.
 
@@ -63,6 +156,10 @@ def delay_at_nth_call_inline(
         func_id: Counter key used to isolate different call sites. Calls that use the same
             ``func_id`` share the same counter.
         disable: If ``True``, delay is skipped.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``time_s`` is negative.
@@ -73,21 +170,23 @@ def delay_at_nth_call_inline(
     if n < 1 or not isinstance(n, int):
         raise ValueError("n should be a positive integer.")
 
-    if not hasattr(delay_at_nth_call_inline, "n_called_dict"):
-        delay_at_nth_call_inline.n_called_dict = {}
-
-    if func_id not in delay_at_nth_call_inline.n_called_dict.keys():
-        delay_at_nth_call_inline.n_called_dict[func_id] = 0
-    delay_at_nth_call_inline.n_called_dict[func_id] += 1
-    if delay_at_nth_call_inline.n_called_dict[func_id] == n and not disable:
-        time.sleep(time_s)
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    store = _NTH_CALL_INLINE_COUNTERS if counters is None else counters
+    if store.increment(func_id) == n:
+        _sleep(time_s, metrics)
 
 
 def delay_at_nth_call(
         time_s: float = 0.1,
         n: int = 5,
         func_id = 1,
-        disable: bool = False
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
     ) -> Decorator:
     """Return a decorator that injects a fixed delay on the n-th call.
 
@@ -95,8 +194,13 @@ def delay_at_nth_call(
         time_s: Sleep duration in seconds. Must be non-negative.
         n: 1-based call number at which to inject the delay.
         func_id: Counter key used to isolate different decorated functions. Decorators that
-            use the same ``func_id`` share the same counter.
-        disable: If ``True``, delay is skipped.
+            use the same ``func_id`` share the same counter. If ``None``, the decorated
+            function gets its own counter, which is released together with the function.
+        disable: If ``True``, the function is returned undecorated.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``time_s`` is negative.
@@ -106,61 +210,222 @@ def delay_at_nth_call(
         raise ValueError("delay should have positive time_s")
     if n < 1 or not isinstance(n, int):
         raise ValueError("n should be a positive integer.")
+    store = _NTH_CALL_COUNTERS if counters is None else counters
+    metrics = _optional_site_metrics(site)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if disable or not _state.enabled:
+            return func
+        if func_id is None:
+            count = store.function_counter(func).increment
+        else:
+            count = partial(store.increment, func_id)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    if count() == n:
+                        await _async_sleep(time_s, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not hasattr(delay_at_nth_call, "n_called_dict"):
-                delay_at_nth_call.n_called_dict = {}
-            if func_id not in delay_at_nth_call.n_called_dict.keys():
-                delay_at_nth_call.n_called_dict[func_id] = 0
-            delay_at_nth_call.n_called_dict[func_id] += 1
-            if delay_at_nth_call.n_called_dict[func_id] == n and not disable:
-                time.sleep(time_s)
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                if count() == n:
+                    _sleep(time_s, metrics)
             return func(*args, **kwargs)
         return wrapper
     return decorator
 
 
-def delay_random_inline(max_time_s: float = 0.1, disable: bool = False) -> None:
+def delay_on_schedule_inline(
+        schedule: Schedule,
+        time_s: float = 0.1,
+        func_id = 1,
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
+    ) -> None:
+    """Inject a fixed delay on the calls in ``schedule`` for a given ``func_id``.
+
+    Args:
+        schedule: Call numbers that are delayed, e.g. ``schedule.every(500)``.
+        time_s: Sleep duration in seconds. Must be non-negative.
+        func_id: Counter key used to isolate different call sites. Calls that use the same
+            ``func_id`` share the same counter.
+        disable: If ``True``, delay is skipped.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    store = _SCHEDULE_INLINE_COUNTERS if counters is None else counters
+    if schedule.fires(store.increment(func_id)):
+        _sleep(time_s, metrics)
+
+
+def delay_on_schedule(
+        schedule: Schedule,
+        time_s: float = 0.1,
+        func_id = 1,
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
+    ) -> Decorator:
+    """Return a decorator that injects a fixed delay on the calls in ``schedule``.
+
+    Args:
+        schedule: Call numbers that are delayed, e.g. ``schedule.every(500)``.
+        time_s: Sleep duration in seconds. Must be non-negative.
+        func_id: Counter key used to isolate different decorated functions. Decorators that
+            use the same ``func_id`` share the same counter. If ``None``, the decorated
+            function gets its own counter, which is released together with the function.
+        disable: If ``True``, the function is returned undecorated.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+    store = _SCHEDULE_COUNTERS if counters is None else counters
+    metrics = _optional_site_metrics(site)
+    fires = schedule.fires
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if disable or not _state.enabled:
+            return func
+        if func_id is None:
+            count = store.function_counter(func).increment
+        else:
+            count = partial(store.increment, func_id)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    if fires(count()):
+                        await _async_sleep(time_s, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                if fires(count()):
+                    _sleep(time_s, metrics)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def delay_random_inline(
+    max_time_s: float = 0.1,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> None:
     """Inject a uniform random delay immediately.
 
     Args:
         max_time_s: Maximum sleep duration in seconds. Must be non-negative.
         disable: If ``True``, the random delay is skipped.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``max_time_s`` is negative.
     """
     if max_time_s < 0:
         raise ValueError("delay_random_inline should have positive max_time_s")
-    if not disable:
-        rnd = random.random()
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        if rng is None:
+            rng = random if site is None else site_stream(site)
+        rnd = rng.random()
         time_s = max_time_s * rnd
-        time.sleep(time_s)
+        _sleep(time_s, metrics)
 
 
-def delay_random(max_time_s: float = 0.1, disable: bool = False) -> Decorator:
+def delay_random(
+    max_time_s: float = 0.1,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> Decorator:
     """Return a decorator that injects a uniform random delay before execution.
 
     Args:
         max_time_s: Maximum sleep duration in seconds. Must be non-negative.
-        disable: If ``True``, the random delay is skipped.
+        disable: If ``True``, the function is returned undecorated.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``max_time_s`` is negative.
     """
     if max_time_s < 0:
         raise ValueError("delay_random should have positive max_time_s")
+    if rng is None:
+        rng = random if site is None else site_stream(site)
+    metrics = _optional_site_metrics(site)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         """Wrap ``func`` with a random delay in ``[0, max_time_s]``."""
+        if disable or not _state.enabled:
+            return func
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    rnd = rng.random()
+                    time_s = max_time_s * rnd
+                    await _async_sleep(time_s, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not disable:
-                rnd = random.random()
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                rnd = rng.random()
                 time_s = max_time_s * rnd
-                time.sleep(time_s)
+                _sleep(time_s, metrics)
             return func(*args, **kwargs)
         return wrapper
 
@@ -171,6 +436,8 @@ def delay_random_norm_inline(
     mean_time_s: float = 0.3,
     std_time_s: float = 0.1,
     disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
 ) -> None:
     """Inject a Gaussian random delay immediately.
 
@@ -180,6 +447,11 @@ def delay_random_norm_inline(
         mean_time_s: Mean of the Gaussian distribution in seconds.
         std_time_s: Standard deviation of the Gaussian distribution in seconds.
         disable: If ``True``, the random delay is skipped.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``mean_time_s`` or ``std_time_s`` is negative.
@@ -188,16 +460,23 @@ def delay_random_norm_inline(
         raise ValueError("delay_random_norm should have positive mean_time_s")
     if std_time_s < 0:
         raise ValueError("delay_random_norm should have positive std_time_s")
-    if not disable:
-        time_s = random.gauss(mean_time_s, std_time_s)
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        if rng is None:
+            rng = random if site is None else site_stream(site)
+        time_s = rng.gauss(mean_time_s, std_time_s)
         time_s = max(0, time_s)
-        time.sleep(time_s)
+        _sleep(time_s, metrics)
 
 
 def delay_random_norm(
     mean_time_s: float = 0.3,
     std_time_s: float = 0.1,
     disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
 ) -> Decorator:
     """Return a decorator that injects a Gaussian random delay before execution.
 
@@ -206,7 +485,12 @@ def delay_random_norm(
     Args:
         mean_time_s: Mean of the Gaussian distribution in seconds.
         std_time_s: Standard deviation of the Gaussian distribution in seconds.
-        disable: If ``True``, the random delay is skipped.
+        disable: If ``True``, the function is returned undecorated.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``mean_time_s`` or ``std_time_s`` is negative.
@@ -215,16 +499,697 @@ def delay_random_norm(
         raise ValueError("delay_random_norm should have positive mean_time_s")
     if std_time_s < 0:
         raise ValueError("delay_random_norm should have positive std_time_s")
+    if rng is None:
+        rng = random if site is None else site_stream(site)
+    metrics = _optional_site_metrics(site)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         """Wrap ``func`` with a non-negative Gaussian random delay."""
+        if disable or not _state.enabled:
+            return func
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    time_s = rng.gauss(mean_time_s, std_time_s)
+                    time_s = max(0, time_s)
+                    await _async_sleep(time_s, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not disable:
-                time_s = random.gauss(mean_time_s, std_time_s)
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                time_s = rng.gauss(mean_time_s, std_time_s)
                 time_s = max(0, time_s)
-                time.sleep(time_s)
+                _sleep(time_s, metrics)
+            return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _check_max_time_s(max_time_s: Optional[float]) -> None:
+    if max_time_s is not None and max_time_s < 0:
+        raise ValueError("delay_distribution should have positive max_time_s")
+
+
+def delay_distribution_inline(
+    distribution: Distribution,
+    max_time_s: Optional[float] = None,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> None:
+    """Inject a delay drawn from ``distribution`` immediately.
+
+    Args:
+        distribution: Latency distribution from :mod:`fault_injection.distributions`, e.g.
+            ``Lognormal(median_s=0.05, sigma=0.8)``.
+        max_time_s: Upper bound of the delay in seconds, or ``None`` for no bound.
+        disable: If ``True``, the random delay is skipped.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``max_time_s`` is negative.
+    """
+    _check_max_time_s(max_time_s)
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        if rng is None:
+            rng = random if site is None else site_stream(site)
+        time_s = distribution.sample(rng)
+        if max_time_s is not None:
+            time_s = min(time_s, max_time_s)
+        _sleep(time_s, metrics)
+
+
+def delay_distribution(
+    distribution: Distribution,
+    max_time_s: Optional[float] = None,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> Decorator:
+    """Return a decorator that injects a delay drawn from ``distribution`` before each call.
+
+    Args:
+        distribution: Latency distribution from :mod:`fault_injection.distributions`, e.g.
+            ``Lognormal(median_s=0.05, sigma=0.8)``.
+        max_time_s: Upper bound of the delay in seconds, or ``None`` for no bound.
+        disable: If ``True``, the function is returned undecorated.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``max_time_s`` is negative.
+    """
+    _check_max_time_s(max_time_s)
+    if rng is None:
+        rng = random if site is None else site_stream(site)
+    metrics = _optional_site_metrics(site)
+    sample = distribution.sample
+    cap = math.inf if max_time_s is None else max_time_s
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if disable or not _state.enabled:
+            return func
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    await _async_sleep(min(sample(rng), cap), metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                _sleep(min(sample(rng), cap), metrics)
             return func(*args, **kwargs)
         return wrapper
 
     return decorator
+
+
+def payload_size(payload: Any) -> int:
+    """Return the size of ``payload`` used by :func:`delay_by_size`.
+
+    ``nbytes`` if the payload has it (``memoryview``, NumPy arrays), else ``len()`` (bytes for
+    ``bytes``/``bytearray``, characters for ``str``, items for lists and other containers), else
+    ``__sizeof__()``. ``None`` has size ``0``.
+    """
+    if payload is None:
+        return 0
+    nbytes = getattr(payload, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        return len(payload)
+    except TypeError:
+        return payload.__sizeof__()
+
+
+def _check_size_cost(base_s: float, per_byte_s: float, max_time_s: Optional[float]) -> None:
+    if base_s < 0 or per_byte_s < 0:
+        raise ValueError("delay_by_size should have non-negative base_s and per_byte_s")
+    if max_time_s is not None and max_time_s < 0:
+        raise ValueError("delay_by_size should have positive max_time_s")
+
+
+def _size_delay(
+    base_s: float,
+    per_byte_s: float,
+    size: Callable[[Any], int],
+    max_time_s: Optional[float],
+) -> Callable[[Any], float]:
+    cap = math.inf if max_time_s is None else max_time_s
+
+    def delay_for(payload: Any) -> float:
+        return min(base_s + per_byte_s * size(payload), cap)
+    return delay_for
+
+
+def delay_by_size_inline(
+    payload: Any,
+    base_s: float = 0.0,
+    per_byte_s: float = 1e-8,
+    size: Callable[[Any], int] = payload_size,
+    max_time_s: Optional[float] = None,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> None:
+    """Inject a delay of ``base_s + per_byte_s * size(payload)`` immediately.
+
+    Args:
+        payload: Object whose size sets the delay, e.g. a batch about to be sent.
+        base_s: Fixed latency in seconds. Must be non-negative.
+        per_byte_s: Seconds per unit of size. Must be non-negative. The default is 100 MB/s.
+        size: Function returning the size of ``payload``. Defaults to :func:`payload_size`.
+        max_time_s: Upper bound of the delay in seconds, or ``None`` for no bound.
+        disable: If ``True``, the delay is skipped.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``base_s``, ``per_byte_s`` or ``max_time_s`` is negative.
+    """
+    _check_size_cost(base_s, per_byte_s, max_time_s)
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        time_s = base_s + per_byte_s * size(payload)
+        if max_time_s is not None:
+            time_s = min(time_s, max_time_s)
+        _sleep(time_s, metrics)
+
+
+def delay_by_size(
+    base_s: float = 0.0,
+    per_byte_s: float = 1e-8,
+    arg: Optional[Union[int, str]] = 0,
+    size: Callable[[Any], int] = payload_size,
+    max_time_s: Optional[float] = None,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> Decorator:
+    """Return a decorator that injects a delay proportional to the size of a payload.
+
+    The delay is ``base_s + per_byte_s * size(payload)``, so large batches are proportionally
+    slower, like serialization or transfer cost. The payload is an argument, in which case the
+    delay comes before the call, or the return value, in which case it comes after.
+
+    Args:
+        base_s: Fixed latency in seconds. Must be non-negative.
+        per_byte_s: Seconds per unit of size. Must be non-negative. The default is 100 MB/s.
+        arg: Position or name of the argument to size, resolved against the signature when the
+            function is decorated (positions count ``self`` for methods), or ``None`` to size
+            the return value. A missing argument has its default value.
+        size: Function returning the size of the payload. Defaults to :func:`payload_size`.
+        max_time_s: Upper bound of the delay in seconds, or ``None`` for no bound.
+        disable: If ``True``, the function is returned undecorated.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``base_s``, ``per_byte_s`` or ``max_time_s`` is negative, ``arg`` is a
+            negative position, or the decorated function has no such argument: an unknown
+            name, ``*args`` or ``**kwargs`` itself, or a position past its positional
+            parameters without ``*args``.
+    """
+    _check_size_cost(base_s, per_byte_s, max_time_s)
+    if isinstance(arg, int) and arg < 0:
+        raise ValueError("delay_by_size should have a non-negative arg position")
+    metrics = _optional_site_metrics(site)
+    delay_for = _size_delay(base_s, per_byte_s, size, max_time_s)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if disable or not _state.enabled:
+            return func
+        is_async = inspect.iscoroutinefunction(func)
+
+        if arg is None:
+            if is_async:
+                @wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    result = await func(*args, **kwargs)
+                    if _state.enabled:
+                        if metrics is not None:
+                            metrics.record_call()
+                        await _async_sleep(delay_for(result), metrics)
+                    return result
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                result = func(*args, **kwargs)
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    _sleep(delay_for(result), metrics)
+                return result
+            return wrapper
+
+        get = _argument_getter(func, arg)
+        if is_async:
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    await _async_sleep(delay_for(get(args, kwargs)), metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                _sleep(delay_for(get(args, kwargs)), metrics)
+            return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def delay_rate_limited_inline(
+        time_s: float = 0.1,
+        rate_per_s: float = 1.0,
+        burst: int = 1,
+        func_id = 1,
+        disable: bool = False,
+        bucket: Optional[TokenBucket] = None,
+        site: Optional[str] = None,
+    ) -> None:
+    """Inject a fixed delay at most ``rate_per_s`` times per second for a given ``func_id``.
+
+    Every call takes a token from the bucket of ``func_id`` and is delayed if it gets one, so
+    the number of delays per second stays fixed however fast the call site is called.
+
+    Args:
+        time_s: Sleep duration in seconds. Must be non-negative.
+        rate_per_s: Sustained number of delays per second. Must be positive.
+        burst: Number of delays allowed back to back when the bucket is full. Must be a
+            positive integer.
+        func_id: Bucket key used to isolate different call sites. The bucket is created with
+            the rate and burst of its first call.
+        disable: If ``True``, delay is skipped.
+        bucket: Token bucket to use instead of the ``func_id`` bucket, e.g. one shared by
+            several call sites.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+        ValueError: If ``rate_per_s`` is not positive or ``burst`` is not a positive integer.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+    _validate_rate(rate_per_s, burst)
+
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    if bucket is None:
+        bucket = _RATE_LIMIT_INLINE_BUCKETS.get(func_id, rate_per_s, burst)
+    if bucket.try_acquire():
+        _sleep(time_s, metrics)
+
+
+def delay_rate_limited(
+        time_s: float = 0.1,
+        rate_per_s: float = 1.0,
+        burst: int = 1,
+        disable: bool = False,
+        bucket: Optional[TokenBucket] = None,
+        site: Optional[str] = None,
+    ) -> Decorator:
+    """Return a decorator that injects a fixed delay at most ``rate_per_s`` times per second.
+
+    Args:
+        time_s: Sleep duration in seconds. Must be non-negative.
+        rate_per_s: Sustained number of delays per second. Must be positive.
+        burst: Number of delays allowed back to back when the bucket is full. Must be a
+            positive integer.
+        disable: If ``True``, the function is returned undecorated.
+        bucket: Token bucket to use instead of a new one per decorated function, e.g. one
+            shared by several functions.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+        ValueError: If ``rate_per_s`` is not positive or ``burst`` is not a positive integer.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+    _validate_rate(rate_per_s, burst)
+    metrics = _optional_site_metrics(site)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if disable or not _state.enabled:
+            return func
+        try_acquire = (TokenBucket(rate_per_s, burst) if bucket is None else bucket).try_acquire
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    if try_acquire():
+                        await _async_sleep(time_s, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                if try_acquire():
+                    _sleep(time_s, metrics)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def delay_inline_async(
+    time_s: float = 0.1,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> None:
+    """Awaitable counterpart of :func:`delay_inline`.
+
+    Suspends only the awaiting coroutine with ``asyncio.sleep`` so the event loop keeps
+    serving other tasks.
+
+    Args:
+        time_s: Sleep duration in seconds. Must be non-negative.
+        disable: If ``True``, the delay is skipped.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        await _async_sleep(time_s, metrics)
+
+
+async def delay_at_nth_call_inline_async(
+        time_s: float = 0.1,
+        n: int = 5,
+        func_id = 1,
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
+    ) -> None:
+    """Awaitable counterpart of :func:`delay_at_nth_call_inline`.
+
+    Shares ``func_id`` counters with :func:`delay_at_nth_call_inline`.
+
+    Args:
+        time_s: Sleep duration in seconds. Must be non-negative.
+        n: 1-based call number at which to inject the delay.
+        func_id: Counter key used to isolate different call sites.
+        disable: If ``True``, delay is skipped.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+        ValueError: If ``n`` is not a positive integer.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+    if n < 1 or not isinstance(n, int):
+        raise ValueError("n should be a positive integer.")
+
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    store = _NTH_CALL_INLINE_COUNTERS if counters is None else counters
+    if store.increment(func_id) == n:
+        await _async_sleep(time_s, metrics)
+
+
+async def delay_on_schedule_inline_async(
+        schedule: Schedule,
+        time_s: float = 0.1,
+        func_id = 1,
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
+    ) -> None:
+    """Awaitable counterpart of :func:`delay_on_schedule_inline`.
+
+    Shares ``func_id`` counters with :func:`delay_on_schedule_inline`.
+
+    Args:
+        schedule: Call numbers that are delayed, e.g. ``schedule.every(500)``.
+        time_s: Sleep duration in seconds. Must be non-negative.
+        func_id: Counter key used to isolate different call sites.
+        disable: If ``True``, delay is skipped.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    store = _SCHEDULE_INLINE_COUNTERS if counters is None else counters
+    if schedule.fires(store.increment(func_id)):
+        await _async_sleep(time_s, metrics)
+
+
+async def delay_random_inline_async(
+    max_time_s: float = 0.1,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> None:
+    """Awaitable counterpart of :func:`delay_random_inline`.
+
+    Args:
+        max_time_s: Maximum sleep duration in seconds. Must be non-negative.
+        disable: If ``True``, the random delay is skipped.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``max_time_s`` is negative.
+    """
+    if max_time_s < 0:
+        raise ValueError("delay_random_inline should have positive max_time_s")
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        if rng is None:
+            rng = random if site is None else site_stream(site)
+        rnd = rng.random()
+        time_s = max_time_s * rnd
+        await _async_sleep(time_s, metrics)
+
+
+async def delay_random_norm_inline_async(
+    mean_time_s: float = 0.3,
+    std_time_s: float = 0.1,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> None:
+    """Awaitable counterpart of :func:`delay_random_norm_inline`.
+
+    Args:
+        mean_time_s: Mean of the Gaussian distribution in seconds.
+        std_time_s: Standard deviation of the Gaussian distribution in seconds.
+        disable: If ``True``, the random delay is skipped.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``mean_time_s`` or ``std_time_s`` is negative.
+    """
+    if mean_time_s < 0:
+        raise ValueError("delay_random_norm should have positive mean_time_s")
+    if std_time_s < 0:
+        raise ValueError("delay_random_norm should have positive std_time_s")
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        if rng is None:
+            rng = random if site is None else site_stream(site)
+        time_s = rng.gauss(mean_time_s, std_time_s)
+        time_s = max(0, time_s)
+        await _async_sleep(time_s, metrics)
+
+
+async def delay_distribution_inline_async(
+    distribution: Distribution,
+    max_time_s: Optional[float] = None,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> None:
+    """Awaitable counterpart of :func:`delay_distribution_inline`.
+
+    Args:
+        distribution: Latency distribution from :mod:`fault_injection.distributions`.
+        max_time_s: Upper bound of the delay in seconds, or ``None`` for no bound.
+        disable: If ``True``, the random delay is skipped.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``max_time_s`` is negative.
+    """
+    _check_max_time_s(max_time_s)
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        if rng is None:
+            rng = random if site is None else site_stream(site)
+        time_s = distribution.sample(rng)
+        if max_time_s is not None:
+            time_s = min(time_s, max_time_s)
+        await _async_sleep(time_s, metrics)
+
+
+async def delay_by_size_inline_async(
+    payload: Any,
+    base_s: float = 0.0,
+    per_byte_s: float = 1e-8,
+    size: Callable[[Any], int] = payload_size,
+    max_time_s: Optional[float] = None,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> None:
+    """Awaitable counterpart of :func:`delay_by_size_inline`.
+
+    Args:
+        payload: Object whose size sets the delay, e.g. a batch about to be sent.
+        base_s: Fixed latency in seconds. Must be non-negative.
+        per_byte_s: Seconds per unit of size. Must be non-negative. The default is 100 MB/s.
+        size: Function returning the size of ``payload``. Defaults to :func:`payload_size`.
+        max_time_s: Upper bound of the delay in seconds, or ``None`` for no bound.
+        disable: If ``True``, the delay is skipped.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``base_s``, ``per_byte_s`` or ``max_time_s`` is negative.
+    """
+    _check_size_cost(base_s, per_byte_s, max_time_s)
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        time_s = base_s + per_byte_s * size(payload)
+        if max_time_s is not None:
+            time_s = min(time_s, max_time_s)
+        await _async_sleep(time_s, metrics)
+
+
+async def delay_rate_limited_inline_async(
+        time_s: float = 0.1,
+        rate_per_s: float = 1.0,
+        burst: int = 1,
+        func_id = 1,
+        disable: bool = False,
+        bucket: Optional[TokenBucket] = None,
+        site: Optional[str] = None,
+    ) -> None:
+    """Awaitable counterpart of :func:`delay_rate_limited_inline`.
+
+    Shares ``func_id`` buckets with :func:`delay_rate_limited_inline`.
+
+    Args:
+        time_s: Sleep duration in seconds. Must be non-negative.
+        rate_per_s: Sustained number of delays per second. Must be positive.
+        burst: Number of delays allowed back to back when the bucket is full. Must be a
+            positive integer.
+        func_id: Bucket key used to isolate different call sites.
+        disable: If ``True``, delay is skipped.
+        bucket: Token bucket to use instead of the ``func_id`` bucket.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+        ValueError: If ``rate_per_s`` is not positive or ``burst`` is not a positive integer.
+    """
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+    _validate_rate(rate_per_s, burst)
+
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    if bucket is None:
+        bucket = _RATE_LIMIT_INLINE_BUCKETS.get(func_id, rate_per_s, burst)
+    if bucket.try_acquire():
+        await _async_sleep(time_s, metrics)
+
+
+delay_at_nth_call.counters = _NTH_CALL_COUNTERS
+delay_at_nth_call_inline.counters = _NTH_CALL_INLINE_COUNTERS
+delay_at_nth_call_inline_async.counters = _NTH_CALL_INLINE_COUNTERS
+delay_on_schedule.counters = _SCHEDULE_COUNTERS
+delay_on_schedule_inline.counters = _SCHEDULE_INLINE_COUNTERS
+delay_on_schedule_inline_async.counters = _SCHEDULE_INLINE_COUNTERS
+delay_rate_limited_inline.buckets = _RATE_LIMIT_INLINE_BUCKETS
+delay_rate_limited_inline_async.buckets = _RATE_LIMIT_INLINE_BUCKETS
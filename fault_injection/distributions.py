@@ -0,0 +1,245 @@
+"""Latency distributions for :func:`~fault_injection.delay_distribution`.
+
+Every distribution draws from the ``random()`` (and for :class:`Lognormal`, ``gauss()``) method
+of the source it is given, so it works with the global ``random`` module, a
+:class:`~fault_injection.sampling.BatchSampler` and the per-site streams of
+:mod:`fault_injection.rng` alike.
+"""
+
+import abc
+import itertools
+import json
+import math
+import os
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Mapping, Sequence, Tuple, Union
+
+from .sampling import RandomSource
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class Distribution(abc.ABC):
+    """Base class of the latency distributions."""
+
+    @abc.abstractmethod
+    def sample(self, rng: RandomSource) -> float:
+        """Return one latency in seconds drawn with ``rng``."""
+
+
+class Exponential(Distribution):
+    """Exponential latency with mean ``mean_s``.
+
+    Args:
+        mean_s: Mean latency in seconds. Must be positive.
+
+    Raises:
+        ValueError: If ``mean_s`` is not positive.
+    """
+
+    def __init__(self, mean_s: float) -> None:
+        if mean_s <= 0:
+            raise ValueError("mean_s should be positive")
+        self.mean_s = mean_s
+
+    def sample(self, rng: RandomSource) -> float:
+        return -self.mean_s * math.log(1.0 - rng.random())
+
+    def __repr__(self) -> str:
+        return f"Exponential(mean_s={self.mean_s})"
+
+
+class Lognormal(Distribution):
+    """Lognormal latency: ``median_s * exp(sigma * Z)`` with ``Z`` standard normal.
+
+    Args:
+        median_s: Median latency in seconds. Must be positive.
+        sigma: Standard deviation of the log of the latency. Must be non-negative. The p99 is
+            about ``median_s * exp(2.33 * sigma)``.
+
+    Raises:
+        ValueError: If ``median_s`` is not positive or ``sigma`` is negative.
+    """
+
+    def __init__(self, median_s: float, sigma: float) -> None:
+        if median_s <= 0:
+            raise ValueError("median_s should be positive")
+        if sigma < 0:
+            raise ValueError("sigma should be non-negative")
+        self.median_s = median_s
+        self.sigma = sigma
+        self._mu = math.log(median_s)
+
+    def sample(self, rng: RandomSource) -> float:
+        return math.exp(rng.gauss(self._mu, self.sigma))
+
+    def __repr__(self) -> str:
+        return f"Lognormal(median_s={self.median_s}, sigma={self.sigma})"
+
+
+class Pareto(Distribution):
+    """Pareto latency with minimum ``scale_s`` and tail index ``alpha``.
+
+    Smaller ``alpha`` means a heavier tail; for ``alpha <= 1`` the mean is infinite, so cap
+    the delay with ``max_time_s``.
+
+    Args:
+        scale_s: Minimum latency in seconds. Must be positive.
+        alpha: Tail index. Must be positive.
+
+    Raises:
+        ValueError: If ``scale_s`` or ``alpha`` is not positive.
+    """
+
+    def __init__(self, scale_s: float, alpha: float) -> None:
+        if scale_s <= 0:
+            raise ValueError("scale_s should be positive")
+        if alpha <= 0:
+            raise ValueError("alpha should be positive")
+        self.scale_s = scale_s
+        self.alpha = alpha
+        self._exponent = -1.0 / alpha
+
+    def sample(self, rng: RandomSource) -> float:
+        return self.scale_s * (1.0 - rng.random()) ** self._exponent
+
+    def __repr__(self) -> str:
+        return f"Pareto(scale_s={self.scale_s}, alpha={self.alpha})"
+
+
+class Mixture(Distribution):
+    """Weighted mixture of distributions, e.g. a fast path with an occasional slow path.
+
+    Args:
+        components: ``(weight, distribution)`` pairs. Weights must be non-negative with a
+            positive sum; they are normalised.
+
+    Raises:
+        ValueError: If there are no components or the weights are invalid.
+    """
+
+    def __init__(self, components: Sequence[Tuple[float, Distribution]]) -> None:
+        if not components:
+            raise ValueError("Mixture needs at least one component")
+        weights = [weight for weight, _ in components]
+        if any(weight < 0 for weight in weights) or sum(weights) <= 0:
+            raise ValueError("Mixture weights should be non-negative with a positive sum")
+        total = sum(weights)
+        cumulative = 0.0
+        self._cdf = array("d")
+        for weight in weights:
+            cumulative += weight / total
+            self._cdf.append(cumulative)
+        self._cdf[-1] = 1.0
+        self.components = tuple(components)
+        self._distributions = tuple(distribution for _, distribution in components)
+
+    def sample(self, rng: RandomSource) -> float:
+        index = bisect_right(self._cdf, rng.random())
+        return self._distributions[min(index, len(self._distributions) - 1)].sample(rng)
+
+    def __repr__(self) -> str:
+        return f"Mixture({list(self.components)!r})"
+
+
+class Empirical(Distribution):
+    """Latency sampled from a recorded histogram through a precomputed inverse-CDF table.
+
+    The histogram's cumulative distribution is stored in ``array('d')`` tables, and each sample
+    is one uniform draw, a ``bisect`` over the bucket CDF (O(log n)) and a linear interpolation
+    within the chosen bucket.
+
+    Args:
+        bounds: Increasing bucket upper bounds in seconds. A final ``inf`` bucket is sampled as
+            its lower edge.
+        counts: Number of observations in each bucket, same length as ``bounds``.
+        low_s: Lower edge of the first bucket in seconds.
+
+    Raises:
+        ValueError: If the histogram is empty, unsorted or has negative counts.
+    """
+
+    def __init__(self, bounds: Sequence[float], counts: Sequence[float], low_s: float = 0.0) -> None:
+        if len(bounds) != len(counts) or not bounds:
+            raise ValueError("bounds and counts should be non-empty and of the same length")
+        if any(count < 0 for count in counts) or sum(counts) <= 0:
+            raise ValueError("counts should be non-negative with a positive sum")
+        edges = [low_s, *bounds]
+        if any(high < low for low, high in zip(edges, edges[1:])):
+            raise ValueError("bounds should be increasing and not below low_s")
+        total = sum(counts)
+        self._cdf = array("d")
+        self._lows = array("d", edges[:-1])
+        self._widths = array("d")
+        cumulative = 0.0
+        for low, high, count in zip(edges, bounds, counts):
+            cumulative += count / total
+            self._cdf.append(cumulative)
+            self._widths.append(0.0 if math.isinf(high) else high - low)
+        self._cdf[-1] = 1.0
+        self._starts = array("d", [0.0, *self._cdf[:-1]])
+
+    @classmethod
+    def from_histogram(cls, histogram: Mapping[Union[float, str], float]) -> "Empirical":
+        """Build from a mapping of bucket upper bound to count, e.g. a metrics ``sleep_histogram``.
+
+        Keys may be strings, as in a histogram loaded from JSON.
+        """
+        items = sorted((float(bound), count) for bound, count in histogram.items())
+        return cls([bound for bound, _ in items], [count for _, count in items])
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[float]) -> "Empirical":
+        """Build from raw latency samples; sampling then interpolates between recorded values."""
+        values = sorted(samples)
+        if not values:
+            raise ValueError("samples should not be empty")
+        bounds, counts = [], []
+        for value in values:
+            if bounds and bounds[-1] == value:
+                counts[-1] += 1
+            else:
+                bounds.append(value)
+                counts.append(1)
+        return cls(bounds, counts, low_s=values[0])
+
+    @classmethod
+    def load(cls, path: PathLike) -> "Empirical":
+        """Load a JSON histogram mapping bucket upper bounds in seconds to counts."""
+        with open(path) as file:
+            return cls.from_histogram(json.load(file))
+
+    def sample(self, rng: RandomSource) -> float:
+        u = rng.random()
+        index = min(bisect_right(self._cdf, u), len(self._cdf) - 1)
+        start = self._starts[index]
+        span = self._cdf[index] - start
+        fraction = (u - start) / span if span > 0 else 0.0
+        return self._lows[index] + self._widths[index] * fraction
+
+
+class Replay(Distribution):
+    """Recorded latencies returned in their original order, starting over after the last one.
+
+    Ignores the random source. Concurrent callers each get a distinct position in the sequence.
+
+    Args:
+        samples_s: Latencies in seconds, e.g. from a recorded
+            :class:`~fault_injection.profiles.LatencyProfile`.
+
+    Raises:
+        ValueError: If ``samples_s`` is empty.
+    """
+
+    def __init__(self, samples_s: Iterable[float]) -> None:
+        self._samples = array("d", samples_s)
+        if not self._samples:
+            raise ValueError("samples_s should not be empty")
+        self._positions = itertools.count()
+
+    def sample(self, rng: RandomSource) -> float:
+        return self._samples[next(self._positions) % len(self._samples)]
+
+    def __len__(self) -> int:
+        return len(self._samples)
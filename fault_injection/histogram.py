@@ -0,0 +1,255 @@
+"""Fixed-memory log-linear latency histogram in the style of HdrHistogram.
+
+Values are counted in integer multiples of ``lowest_s``. Each power of two is split into
+``2 ** precision_bits`` equal sub-buckets, so every bucket is at most ``2 ** -precision_bits`` of
+its value wide, and the counts live in one ``array('Q')`` sized when the histogram is created.
+Recording computes the bucket index from ``int.bit_length`` in O(1). Histograms with the same
+layout merge by adding counts, and serialise to a compact sparse binary form, so per-thread and
+per-process histograms can be combined after a run.
+"""
+
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+MAGIC = b"FIHIST01"
+# lowest_s, highest_s, precision_bits, total count, min_s, max_s, sum_s, nonzero buckets
+_HEADER = struct.Struct("<ddBQdddI")
+_SWAP = sys.byteorder != "little"
+
+
+class Histogram:
+    """Log-linear histogram of latencies in seconds.
+
+    Not locked: record from one thread per histogram and :meth:`merge` them, as
+    :mod:`fault_injection.metrics` does.
+
+    Args:
+        lowest_s: Resolution, the smallest distinguishable latency. Must be positive.
+        highest_s: Largest latency with full precision; larger values are counted in the last
+            bucket, though :attr:`max_s` stays exact. Must be larger than ``lowest_s``.
+        precision_bits: Sub-buckets per power of two are ``2 ** precision_bits``; ``7`` keeps
+            relative error under 1%. Must be between 1 and 16.
+
+    Raises:
+        ValueError: If an argument is out of range.
+    """
+
+    def __init__(
+        self,
+        lowest_s: float = 1e-6,
+        highest_s: float = 3600.0,
+        precision_bits: int = 7,
+    ) -> None:
+        if lowest_s <= 0:
+            raise ValueError("lowest_s should be positive")
+        if highest_s <= lowest_s:
+            raise ValueError("highest_s should be larger than lowest_s")
+        if not isinstance(precision_bits, int) or not 1 <= precision_bits <= 16:
+            raise ValueError("precision_bits should be an integer between 1 and 16.")
+        self.lowest_s = lowest_s
+        self.highest_s = highest_s
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self._highest_units = int(highest_s / lowest_s)
+        self.counts = array("Q", bytes(8 * (self._index(self._highest_units) + 1)))
+        self._last = len(self.counts) - 1
+        self.count = 0
+        self.sum_s = 0.0
+        self.min_s = math.inf
+        self.max_s = 0.0
+
+    def _index(self, units: int) -> int:
+        shift = units.bit_length() - self.precision_bits - 1
+        if shift <= 0:
+            return units
+        return (shift + 1) * self._sub_buckets + (units >> shift) - self._sub_buckets
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Return the lowest value and the width of bucket ``index``, in units."""
+        if index < 2 * self._sub_buckets:
+            return index, 1
+        shift = index // self._sub_buckets - 1
+        return (index % self._sub_buckets + self._sub_buckets) << shift, 1 << shift
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        """Count ``count`` occurrences of a latency of ``seconds``.
+
+        Raises:
+            ValueError: If ``seconds`` is negative.
+        """
+        if seconds < 0:
+            raise ValueError("record should have non-negative seconds")
+        units = int(seconds / self.lowest_s)
+        index = self._last if units >= self._highest_units else self._index(units)
+        self.counts[index] += count
+        self.count += count
+        self.sum_s += seconds * count
+        if seconds < self.min_s:
+            self.min_s = seconds
+        if seconds > self.max_s:
+            self.max_s = seconds
+
+    def _check_layout(self, other: "Histogram") -> None:
+        if (self.lowest_s, self.highest_s, self.precision_bits) != (
+            other.lowest_s, other.highest_s, other.precision_bits
+        ):
+            raise ValueError("histograms should have the same lowest_s, highest_s and "
+                             "precision_bits")
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add the counts of ``other`` to this histogram and return it.
+
+        Raises:
+            ValueError: If the histograms have different layouts.
+        """
+        self._check_layout(other)
+        counts = self.counts
+        for index, count in other.nonzero():
+            counts[index] += count
+        self.count += other.count
+        self.sum_s += other.sum_s
+        self.min_s = min(self.min_s, other.min_s)
+        self.max_s = max(self.max_s, other.max_s)
+        return self
+
+    def copy(self) -> "Histogram":
+        """Return an independent copy."""
+        return Histogram(self.lowest_s, self.highest_s, self.precision_bits).merge(self)
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        self.counts = array("Q", bytes(8 * len(self.counts)))
+        self.count = 0
+        self.sum_s = 0.0
+        self.min_s = math.inf
+        self.max_s = 0.0
+
+    def nonzero(self) -> Iterator[Tuple[int, int]]:
+        """Yield ``(bucket index, count)`` for every non-empty bucket."""
+        for index, count in enumerate(self.counts):
+            if count:
+                yield index, count
+
+    def buckets(self) -> Iterator[Tuple[float, float, int]]:
+        """Yield ``(low_s, high_s, count)`` for every non-empty bucket, in increasing order."""
+        for index, count in self.nonzero():
+            low, width = self._bounds(index)
+            high_s = math.inf if index == self._last else (low + width) * self.lowest_s
+            yield low * self.lowest_s, high_s, count
+
+    @property
+    def mean_s(self) -> float:
+        """Mean of the recorded latencies, ``nan`` if empty."""
+        return self.sum_s / self.count if self.count else math.nan
+
+    def percentiles(self, percents: Iterable[float]) -> Dict[float, float]:
+        """Return the latency at each of ``percents`` (0-100) in one pass over the buckets.
+
+        Each value is the upper edge of the bucket holding the nearest-rank sample, capped at
+        :attr:`max_s`, so it overestimates by at most one bucket width. Values are ``nan`` if
+        the histogram is empty.
+
+        Raises:
+            ValueError: If a percent is outside ``[0, 100]``.
+        """
+        wanted = sorted(set(percents))
+        if any(not 0 <= percent <= 100 for percent in wanted):
+            raise ValueError("percentiles should be between 0 and 100")
+        if not self.count or not wanted:
+            return {percent: math.nan for percent in wanted}
+        result = {}
+        ranks = iter((max(1, math.ceil(percent / 100 * self.count)), percent)
+                     for percent in wanted)
+        rank, percent = next(ranks)
+        cumulative = 0
+        for low_s, high_s, count in self.buckets():
+            cumulative += count
+            while cumulative >= rank:
+                result[percent] = min(high_s, self.max_s)
+                try:
+                    rank, percent = next(ranks)
+                except StopIteration:
+                    return result
+        return result
+
+    def percentile(self, percent: float) -> float:
+        """Return the latency at ``percent`` (0-100); see :meth:`percentiles`."""
+        return self.percentiles([percent])[percent]
+
+    def to_bytes(self) -> bytes:
+        """Serialise to a compact binary form that stores only non-empty buckets."""
+        pairs = array("Q")
+        for index, count in self.nonzero():
+            pairs.append(index)
+            pairs.append(count)
+        if _SWAP:
+            pairs.byteswap()
+        header = _HEADER.pack(
+            self.lowest_s, self.highest_s, self.precision_bits, self.count,
+            self.min_s, self.max_s, self.sum_s, len(pairs) // 2,
+        )
+        return MAGIC + header + pairs.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Histogram":
+        """Load a histogram written by :meth:`to_bytes`.
+
+        Raises:
+            ValueError: If ``data`` is not a serialised histogram.
+        """
+        data = bytes(data)
+        body = len(MAGIC) + _HEADER.size
+        if data[:len(MAGIC)] != MAGIC or len(data) < body:
+            raise ValueError("data is not a serialised histogram")
+        lowest_s, highest_s, precision_bits, count, min_s, max_s, sum_s, nonzero = (
+            _HEADER.unpack_from(data, len(MAGIC))
+        )
+        pairs = array("Q")
+        pairs.frombytes(data[body:])
+        if _SWAP:
+            pairs.byteswap()
+        if len(pairs) != 2 * nonzero:
+            raise ValueError("data is not a serialised histogram")
+        histogram = cls(lowest_s, highest_s, precision_bits)
+        try:
+            for position in range(0, len(pairs), 2):
+                histogram.counts[pairs[position]] = pairs[position + 1]
+        except IndexError:
+            raise ValueError("data is not a serialised histogram") from None
+        histogram.count = count
+        histogram.min_s = min_s
+        histogram.max_s = max_s
+        histogram.sum_s = sum_s
+        return histogram
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return (f"Histogram(count={self.count}, lowest_s={self.lowest_s}, "
+                f"highest_s={self.highest_s}, precision_bits={self.precision_bits})")
+
+
+def merged(histograms: Iterable[Histogram], template: Optional[Histogram] = None) -> Histogram:
+    """Return a new histogram holding the counts of all ``histograms``.
+
+    Args:
+        histograms: Histograms with the same layout.
+        template: Histogram whose layout the result takes when ``histograms`` is empty.
+            Defaults to the default layout.
+
+    Raises:
+        ValueError: If the histograms have different layouts.
+    """
+    histograms = list(histograms)
+    if histograms:
+        layout = histograms[0]
+    else:
+        layout = Histogram() if template is None else template
+    result = Histogram(layout.lowest_s, layout.highest_s, layout.precision_bits)
+    for histogram in histograms:
+        result.merge(histogram)
+    return result
@@ -0,0 +1,351 @@
+"""Drive a fault-injected callable under concurrent load and summarise its latency.
+
+:func:`run` calls a function, typically wrapped with one of the fault injection decorators, from
+a pool of threads, processes or asyncio tasks. It runs either in a closed loop, where each
+worker calls again as soon as its previous call returns, or at a target rate. The
+:class:`LoadReport` gives throughput and p50/p95/p99/p99.9 latency for all calls, and separately
+for calls during which a fault was injected and for clean calls, so a resilience regression
+shows up as a number. Latencies go into fixed-size :class:`~fault_injection.histogram.Histogram`
+objects, one per worker, so memory does not grow with the length of the run.
+
+A call counts as faulted if any helper injected a delay or an exception in the same thread or
+task while it ran. At a target rate, latency is measured from each call's scheduled start, so a
+worker that falls behind does not hide the queueing delay.
+"""
+
+import asyncio
+import inspect
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from .histogram import Histogram, merged
+from .metrics import _fault_tally
+
+MODES = ("threads", "processes", "asyncio")
+
+
+class LatencySummary(NamedTuple):
+    """Latency statistics of a group of calls, in seconds. ``nan`` when there are no calls."""
+
+    count: int
+    mean_s: float
+    p50_s: float
+    p95_s: float
+    p99_s: float
+    p999_s: float
+    max_s: float
+
+    @classmethod
+    def from_histogram(cls, histogram: Histogram) -> "LatencySummary":
+        """Summarise a histogram; percentiles are within one bucket width of the samples."""
+        if not histogram.count:
+            return cls(0, *([math.nan] * 6))
+        percentiles = histogram.percentiles((50, 95, 99, 99.9))
+        return cls(
+            histogram.count,
+            histogram.mean_s,
+            percentiles[50],
+            percentiles[95],
+            percentiles[99],
+            percentiles[99.9],
+            histogram.max_s,
+        )
+
+
+class LoadReport(NamedTuple):
+    """Outcome of a :func:`run`."""
+
+    mode: str
+    concurrency: int
+    duration_s: float
+    calls: int
+    throughput_per_s: float
+    overall: LatencySummary
+    clean: LatencySummary
+    faulted: LatencySummary
+    errors: Dict[str, int]
+
+    def format(self) -> str:
+        """Return the report as a plain-text table in milliseconds."""
+        lines = [
+            f"{self.calls} calls in {self.duration_s:.3f} s ({self.throughput_per_s:.1f}/s), "
+            f"{self.mode} x {self.concurrency}",
+            f"{'':8} {'count':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'p99.9':>9} {'max':>9}",
+        ]
+        for name, summary in (("all", self.overall), ("clean", self.clean),
+                              ("faulted", self.faulted)):
+            cells = " ".join(
+                f"{value * 1000:9.3f}" for value in (summary.p50_s, summary.p95_s,
+                                                     summary.p99_s, summary.p999_s, summary.max_s)
+            )
+            lines.append(f"{name:8} {summary.count:8d} {cells}")
+        for error, count in sorted(self.errors.items()):
+            lines.append(f"{error}: {count}")
+        return "\n".join(lines)
+
+
+class _Schedule:
+    """Hands out call slots to workers until the call or time budget runs out."""
+
+    def __init__(
+        self,
+        calls: Optional[int],
+        duration_s: Optional[float],
+        rate_per_s: Optional[float],
+    ) -> None:
+        self._calls = calls
+        self._rate_per_s = rate_per_s
+        self._indices = itertools.count()
+        self._lock = threading.Lock()
+        self.start = time.perf_counter()
+        self._deadline = math.inf if duration_s is None else self.start + duration_s
+
+    def next_start(self) -> Optional[float]:
+        """Return the scheduled start of the next call, or ``None`` when the run is over."""
+        with self._lock:
+            index = next(self._indices)
+        if self._calls is not None and index >= self._calls:
+            return None
+        if self._rate_per_s is None:
+            now = time.perf_counter()
+            return None if now >= self._deadline else now
+        start = self.start + index / self._rate_per_s
+        return None if start >= self._deadline else start
+
+
+class _Samples:
+    """Latencies and errors collected by one worker."""
+
+    def __init__(self) -> None:
+        self.clean = Histogram()
+        self.faulted = Histogram()
+        self.errors: Dict[str, int] = {}
+
+    def add(self, latency_s: float, faulted: bool, error: Optional[BaseException]) -> None:
+        (self.faulted if faulted else self.clean).record(latency_s)
+        if error is not None:
+            name = type(error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def _sync_worker(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Mapping[str, Any],
+    schedule: _Schedule,
+    samples: _Samples,
+) -> _Samples:
+    tally = [0]
+    _fault_tally.set(tally)
+    perf_counter = time.perf_counter
+    while True:
+        start = schedule.next_start()
+        if start is None:
+            return samples
+        wait_s = start - perf_counter()
+        if wait_s > 0:
+            time.sleep(wait_s)
+        faults = tally[0]
+        error = None
+        try:
+            func(*args, **kwargs)
+        except Exception as exception:
+            error = exception
+        samples.add(perf_counter() - start, tally[0] != faults, error)
+
+
+async def _async_worker(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Mapping[str, Any],
+    schedule: _Schedule,
+    samples: _Samples,
+) -> None:
+    tally = [0]
+    _fault_tally.set(tally)
+    perf_counter = time.perf_counter
+    while True:
+        start = schedule.next_start()
+        if start is None:
+            return
+        wait_s = start - perf_counter()
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+        else:
+            # Closed-loop workers whose calls never suspend would otherwise starve the others.
+            await asyncio.sleep(0)
+        faults = tally[0]
+        error = None
+        try:
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exception:
+            error = exception
+        samples.add(perf_counter() - start, tally[0] != faults, error)
+
+
+def _process_worker(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    kwargs: Mapping[str, Any],
+    calls: Optional[int],
+    duration_s: Optional[float],
+    rate_per_s: Optional[float],
+) -> Tuple[bytes, bytes, Dict[str, int]]:
+    samples = _sync_worker(func, args, kwargs, _Schedule(calls, duration_s, rate_per_s), _Samples())
+    return samples.clean.to_bytes(), samples.faulted.to_bytes(), samples.errors
+
+
+def _validate(
+    mode: str,
+    concurrency: int,
+    calls: Optional[int],
+    duration_s: Optional[float],
+    rate_per_s: Optional[float],
+) -> None:
+    if mode not in MODES:
+        raise ValueError(f"mode should be one of {', '.join(MODES)}")
+    if concurrency < 1 or not isinstance(concurrency, int):
+        raise ValueError("concurrency should be a positive integer.")
+    if calls is not None and (calls < 0 or not isinstance(calls, int)):
+        raise ValueError("calls should be a non-negative integer.")
+    if duration_s is not None and duration_s <= 0:
+        raise ValueError("duration_s should be positive")
+    if rate_per_s is not None and rate_per_s <= 0:
+        raise ValueError("rate_per_s should be positive")
+
+
+def _report(
+    mode: str,
+    concurrency: int,
+    elapsed_s: float,
+    parts: List[_Samples],
+) -> LoadReport:
+    clean = merged(part.clean for part in parts)
+    faulted = merged(part.faulted for part in parts)
+    errors: Dict[str, int] = {}
+    for part in parts:
+        for name, count in part.errors.items():
+            errors[name] = errors.get(name, 0) + count
+    calls = clean.count + faulted.count
+    return LoadReport(
+        mode,
+        concurrency,
+        elapsed_s,
+        calls,
+        calls / elapsed_s if elapsed_s > 0 else math.nan,
+        LatencySummary.from_histogram(clean.copy().merge(faulted)),
+        LatencySummary.from_histogram(clean),
+        LatencySummary.from_histogram(faulted),
+        errors,
+    )
+
+
+def run(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Mapping[str, Any]] = None,
+    mode: str = "threads",
+    concurrency: int = 8,
+    calls: Optional[int] = None,
+    duration_s: Optional[float] = None,
+    rate_per_s: Optional[float] = None,
+) -> LoadReport:
+    """Call ``func(*args, **kwargs)`` under concurrent load and report its latency.
+
+    Exceptions raised by ``func`` are counted in :attr:`LoadReport.errors` and do not stop the
+    run.
+
+    Args:
+        func: Callable to drive. In ``"asyncio"`` mode, awaitable results are awaited. In
+            ``"processes"`` mode it must be picklable, e.g. a module-level function.
+        args: Positional arguments of every call.
+        kwargs: Keyword arguments of every call.
+        mode: ``"threads"``, ``"processes"`` or ``"asyncio"`` (tasks on a new event loop).
+        concurrency: Number of threads, processes or tasks.
+        calls: Total number of calls. In ``"processes"`` mode it is split evenly between the
+            processes.
+        duration_s: Time limit in seconds. At least one of ``calls`` and ``duration_s`` must be
+            given; the run stops at whichever is reached first.
+        rate_per_s: Target total call rate, or ``None`` for a closed loop in which each worker
+            calls again as soon as its previous call returns.
+
+    Raises:
+        ValueError: If an argument is invalid or neither ``calls`` nor ``duration_s`` is given.
+    """
+    _validate(mode, concurrency, calls, duration_s, rate_per_s)
+    if calls is None and duration_s is None:
+        raise ValueError("run needs calls or duration_s")
+    kwargs = {} if kwargs is None else kwargs
+
+    if mode == "asyncio":
+        return asyncio.run(
+            run_async(func, args, kwargs, concurrency, calls, duration_s, rate_per_s)
+        )
+
+    start = time.perf_counter()
+    if mode == "processes":
+        with ProcessPoolExecutor(concurrency) as pool:
+            futures = [
+                pool.submit(
+                    _process_worker,
+                    func,
+                    args,
+                    kwargs,
+                    None if calls is None else calls // concurrency + (i < calls % concurrency),
+                    duration_s,
+                    None if rate_per_s is None else rate_per_s / concurrency,
+                )
+                for i in range(concurrency)
+            ]
+            parts = []
+            for future in futures:
+                clean, faulted, errors = future.result()
+                part = _Samples()
+                part.clean = Histogram.from_bytes(clean)
+                part.faulted = Histogram.from_bytes(faulted)
+                part.errors = errors
+                parts.append(part)
+        return _report(mode, concurrency, time.perf_counter() - start, parts)
+
+    schedule = _Schedule(calls, duration_s, rate_per_s)
+    parts = [_Samples() for _ in range(concurrency)]
+    threads = [
+        threading.Thread(target=_sync_worker, args=(func, args, kwargs, schedule, part),
+                         daemon=True)
+        for part in parts
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return _report(mode, concurrency, time.perf_counter() - schedule.start, parts)
+
+
+async def run_async(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...] = (),
+    kwargs: Optional[Mapping[str, Any]] = None,
+    concurrency: int = 8,
+    calls: Optional[int] = None,
+    duration_s: Optional[float] = None,
+    rate_per_s: Optional[float] = None,
+) -> LoadReport:
+    """Awaitable ``"asyncio"`` mode of :func:`run`, for use inside a running event loop.
+
+    Raises:
+        ValueError: If an argument is invalid or neither ``calls`` nor ``duration_s`` is given.
+    """
+    _validate("asyncio", concurrency, calls, duration_s, rate_per_s)
+    if calls is None and duration_s is None:
+        raise ValueError("run needs calls or duration_s")
+    kwargs = {} if kwargs is None else kwargs
+    schedule = _Schedule(calls, duration_s, rate_per_s)
+    parts = [_Samples() for _ in range(concurrency)]
+    await asyncio.gather(*(_async_worker(func, args, kwargs, schedule, part) for part in parts))
+    return _report("asyncio", concurrency, time.perf_counter() - schedule.start, parts)
@@ -0,0 +1,195 @@
+"""Per-site counters for injected faults."""
+
+import math
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from .histogram import Histogram, merged
+
+# Upper bounds of the injected sleep histogram buckets, in seconds: 1 us, 2 us, 4 us, ... ~1 h.
+SLEEP_BUCKET_BOUNDS_S = tuple(2 ** i / 1_000_000 for i in range(33))
+
+
+class _Accumulator:
+    """Counters owned by a single thread, so updates need no lock."""
+
+    __slots__ = (
+        "calls",
+        "faults",
+        "exceptions",
+        "sleeps",
+        "sleep_total_s",
+        "requested_sleep_total_s",
+        "sleep_buckets",
+        "sleep_latency",
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.faults = 0
+        self.exceptions = 0
+        self.sleeps = 0
+        self.sleep_total_s = 0.0
+        self.requested_sleep_total_s = 0.0
+        self.sleep_buckets = [0] * (len(SLEEP_BUCKET_BOUNDS_S) + 1)
+        # Allocated on the first sleep, so sites that only raise do not pay for it.
+        self.sleep_latency: Optional[Histogram] = None
+
+
+def _sleep_bucket(seconds: float) -> int:
+    """Return the index of the first bucket whose upper bound is ``>= seconds``."""
+    if seconds <= SLEEP_BUCKET_BOUNDS_S[0]:
+        return 0
+    mantissa, exponent = math.frexp(seconds * 1_000_000)
+    index = exponent - 1 if mantissa == 0.5 else exponent
+    return min(index, len(SLEEP_BUCKET_BOUNDS_S))
+
+
+class SiteMetrics:
+    """Counters for one injection site.
+
+    Every thread records into its own accumulator, so the hot path is a few attribute
+    increments with no lock. :meth:`snapshot` merges the accumulators of all threads.
+
+    Args:
+        site: Name of the injection site.
+    """
+
+    def __init__(self, site: str) -> None:
+        self.site = site
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._accumulators: List[_Accumulator] = []
+
+    def _accumulator(self) -> _Accumulator:
+        try:
+            return self._local.accumulator
+        except AttributeError:
+            accumulator = _Accumulator()
+            with self._lock:
+                self._accumulators.append(accumulator)
+            self._local.accumulator = accumulator
+            return accumulator
+
+    def record_call(self) -> None:
+        """Record a call that went through an enabled injection site."""
+        self._accumulator().calls += 1
+
+    def record_sleep(self, seconds: float, requested_s: Optional[float] = None) -> None:
+        """Record an injected delay of ``seconds``.
+
+        Args:
+            seconds: Duration of the injected sleep.
+            requested_s: Requested duration, if it differs from the measured ``seconds``.
+        """
+        accumulator = self._accumulator()
+        accumulator.faults += 1
+        accumulator.sleeps += 1
+        accumulator.sleep_total_s += seconds
+        accumulator.requested_sleep_total_s += seconds if requested_s is None else requested_s
+        accumulator.sleep_buckets[_sleep_bucket(seconds)] += 1
+        if accumulator.sleep_latency is None:
+            accumulator.sleep_latency = Histogram()
+        accumulator.sleep_latency.record(seconds)
+
+    def record_raise(self) -> None:
+        """Record an injected exception."""
+        accumulator = self._accumulator()
+        accumulator.faults += 1
+        accumulator.exceptions += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the counters merged across threads.
+
+        ``sleep_total_s`` is the measured injected sleep in precision mode and the requested
+        sleep otherwise; ``requested_sleep_total_s`` is always the requested sleep. The
+        ``sleep_histogram`` maps each bucket upper bound in seconds to the number of
+        injected sleeps that fell into it; ``inf`` holds sleeps longer than the last bound.
+        """
+        with self._lock:
+            accumulators = list(self._accumulators)
+        buckets = [0] * (len(SLEEP_BUCKET_BOUNDS_S) + 1)
+        for accumulator in accumulators:
+            for index, count in enumerate(accumulator.sleep_buckets):
+                buckets[index] += count
+        bounds = SLEEP_BUCKET_BOUNDS_S + (math.inf,)
+        return {
+            "calls": sum(accumulator.calls for accumulator in accumulators),
+            "faults": sum(accumulator.faults for accumulator in accumulators),
+            "exceptions": sum(accumulator.exceptions for accumulator in accumulators),
+            "sleeps": sum(accumulator.sleeps for accumulator in accumulators),
+            "sleep_total_s": sum(accumulator.sleep_total_s for accumulator in accumulators),
+            "requested_sleep_total_s": sum(
+                accumulator.requested_sleep_total_s for accumulator in accumulators
+            ),
+            "sleep_histogram": {
+                bound: count for bound, count in zip(bounds, buckets) if count
+            },
+        }
+
+    def sleep_latency(self) -> Histogram:
+        """Return the injected sleeps as a :class:`~fault_injection.histogram.Histogram`.
+
+        The per-thread histograms are merged. Its buckets are within 1% of their values, so
+        its percentiles are much finer than the power-of-two ``sleep_histogram``.
+        """
+        with self._lock:
+            accumulators = list(self._accumulators)
+        return merged(
+            accumulator.sleep_latency
+            for accumulator in accumulators
+            if accumulator.sleep_latency is not None
+        )
+
+    def reset(self) -> None:
+        """Drop all recorded counters."""
+        with self._lock:
+            self._accumulators = []
+            self._local = threading.local()
+
+
+_registry_lock = threading.Lock()
+_registry: Dict[str, SiteMetrics] = {}
+
+
+def site_metrics(site: str) -> SiteMetrics:
+    """Return the metrics of ``site``, creating them on first use."""
+    metrics = _registry.get(site)
+    if metrics is None:
+        with _registry_lock:
+            metrics = _registry.get(site)
+            if metrics is None:
+                metrics = SiteMetrics(site)
+                _registry[site] = metrics
+    return metrics
+
+
+# Fault count of the current thread or task, set by observers such as fault_injection.load.
+_fault_tally: "ContextVar[Optional[List[int]]]" = ContextVar("fault_tally", default=None)
+
+
+def _count_fault() -> None:
+    """Count an injected fault in the tally of the current context, if one is set."""
+    tally = _fault_tally.get()
+    if tally is not None:
+        tally[0] += 1
+
+
+def _optional_site_metrics(site: Optional[str]) -> Optional[SiteMetrics]:
+    return None if site is None else site_metrics(site)
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Return the merged counters of every site, keyed by site name."""
+    with _registry_lock:
+        sites = list(_registry.values())
+    return {metrics.site: metrics.snapshot() for metrics in sites}
+
+
+def reset() -> None:
+    """Drop the counters of every site."""
+    with _registry_lock:
+        sites = list(_registry.values())
+    for metrics in sites:
+        metrics.reset()
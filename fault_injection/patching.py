@@ -0,0 +1,265 @@
+"""Apply fault injection decorators to code named by import path.
+
+:class:`Patcher` replaces functions and methods such as ``"requests.Session.send"`` with
+decorated versions, for code that cannot be decorated at its definition. Targets in modules that
+are already imported are patched by :meth:`Patcher.start`; the others are patched right after
+their module is first imported, through a ``sys.meta_path`` finder, so nothing is imported
+eagerly. The finder only looks at modules named by pending targets, with one dictionary lookup
+per import. :meth:`Patcher.stop` puts back the exact objects that were replaced.
+
+Code that copied a target before it was patched, e.g. with ``from module import func``, keeps
+the original.
+"""
+
+import importlib.abc
+import inspect
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+Decorator = Callable[[Callable[..., Any]], Callable[..., Any]]
+
+_MISSING = object()
+
+
+class _Target:
+    __slots__ = ("path", "decorator", "modules", "applied")
+
+    def __init__(self, path: str, decorator: Decorator) -> None:
+        module, sep, attributes = path.partition(":")
+        if sep:
+            if not module or not attributes:
+                raise ValueError(f"target {path!r} should look like 'module:attribute'")
+            modules = [module]
+        else:
+            parts = path.split(".")
+            if len(parts) < 2 or not all(parts):
+                raise ValueError(f"target {path!r} should look like 'module.attribute'")
+            # Longest module name first: ``a.b.c.f`` may be ``f`` of module ``a.b.c``, or
+            # ``c.f`` of module ``a.b``, and so on.
+            modules = [".".join(parts[:end]) for end in range(len(parts) - 1, 0, -1)]
+        self.path = path
+        self.decorator = decorator
+        self.modules = modules
+        self.applied = False
+
+    def attributes(self, module_name: str) -> List[str]:
+        rest = self.path[len(module_name) + 1:]
+        return rest.split(".")
+
+
+class _Patch(NamedTuple):
+    target: _Target
+    owner: Any
+    name: str
+    original: Any
+
+
+def _decorate(raw: Any, decorator: Decorator) -> Any:
+    """Apply ``decorator`` to a raw class or module attribute, keeping its descriptor kind."""
+    if isinstance(raw, staticmethod):
+        return staticmethod(decorator(raw.__func__))
+    if isinstance(raw, classmethod):
+        return classmethod(decorator(raw.__func__))
+    if not callable(raw):
+        raise ValueError(f"{raw!r} is not callable")
+    return decorator(raw)
+
+
+class _PatchingLoader(importlib.abc.Loader):
+    """Loader that runs the wrapped loader, then patches the new module's targets."""
+
+    def __init__(self, loader: Any, patcher: "Patcher") -> None:
+        self._loader = loader
+        self._patcher = patcher
+
+    def create_module(self, spec: Any) -> Optional[ModuleType]:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        self._patcher._imported(module.__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _Finder(importlib.abc.MetaPathFinder):
+    def __init__(self, patcher: "Patcher") -> None:
+        self._patcher = patcher
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        if fullname not in self._patcher._pending:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or isinstance(finder, _Finder):
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _PatchingLoader(spec.loader, self._patcher)
+        return spec
+
+
+class Patcher:
+    """Decorate functions and methods named by import path, and undo it exactly.
+
+    Args:
+        targets: Mapping of target path to the decorator to apply, e.g.
+            ``{"requests.Session.send": delay_random(max_time_s=0.5)}``. A path is either dotted,
+            with the module found by trying the longest prefix first, or ``"module:Attr.name"``.
+
+    Raises:
+        ValueError: If a target path is malformed.
+    """
+
+    def __init__(self, targets: Optional[Mapping[str, Decorator]] = None) -> None:
+        self._lock = threading.RLock()
+        self._targets: List[_Target] = []
+        self._pending: Dict[str, List[_Target]] = {}
+        self._patches: List[_Patch] = []
+        self._finder: Optional[_Finder] = None
+        self._started = False
+        # Targets that failed to patch on import, where raising would break the importer.
+        self.errors: Dict[str, Exception] = {}
+        for path, decorator in (targets or {}).items():
+            self.add(path, decorator)
+
+    def add(self, path: str, decorator: Decorator) -> None:
+        """Add a target; patched at once if the patcher is started and its module is imported.
+
+        Raises:
+            ValueError: If ``path`` is malformed.
+        """
+        target = _Target(path, decorator)
+        with self._lock:
+            self._targets.append(target)
+            if self._started:
+                self._schedule(target)
+
+    def start(self) -> "Patcher":
+        """Patch targets in imported modules and hook the import of the others.
+
+        Raises:
+            ValueError: If a target in an imported module cannot be patched. Targets patched
+                so far are restored.
+        """
+        with self._lock:
+            if not self._started:
+                self._started = True
+                try:
+                    for target in self._targets:
+                        self._schedule(target)
+                except ValueError:
+                    self.stop()
+                    raise
+        return self
+
+    def stop(self) -> None:
+        """Restore every patched attribute, in reverse order, and remove the import hook."""
+        with self._lock:
+            self._started = False
+            self._pending.clear()
+            self._remove_finder()
+            while self._patches:
+                patch = self._patches.pop()
+                if patch.original is _MISSING:
+                    # The attribute was inherited; removing the override exposes it again.
+                    delattr(patch.owner, patch.name)
+                else:
+                    setattr(patch.owner, patch.name, patch.original)
+            for target in self._targets:
+                target.applied = False
+
+    def applied(self) -> Tuple[str, ...]:
+        """Return the paths of the targets that are currently patched."""
+        return tuple(patch.target.path for patch in self._patches)
+
+    def pending(self) -> Tuple[str, ...]:
+        """Return the paths of the targets waiting for their module to be imported."""
+        return tuple(target.path for target in self._targets
+                     if self._started and not target.applied)
+
+    def __enter__(self) -> "Patcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _schedule(self, target: _Target) -> None:
+        for module_name in target.modules:
+            module = sys.modules.get(module_name)
+            if module is not None and self._apply(target, module):
+                return
+        for module_name in target.modules:
+            self._pending.setdefault(module_name, []).append(target)
+        if self._finder is None:
+            self._finder = _Finder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def _imported(self, module_name: str) -> None:
+        with self._lock:
+            targets = self._pending.pop(module_name, None)
+            if not targets:
+                return
+            module = sys.modules.get(module_name)
+            for target in targets:
+                if not target.applied and module is not None:
+                    try:
+                        self._apply(target, module)
+                    except ValueError as error:
+                        self.errors[target.path] = error
+                        target.applied = True  # Stop waiting for it.
+            for name in [name for name, waiting in self._pending.items()
+                         if all(target.applied for target in waiting)]:
+                del self._pending[name]
+            if not self._pending:
+                self._remove_finder()
+
+    def _apply(self, target: _Target, module: ModuleType) -> bool:
+        """Patch ``target`` inside ``module``; return ``False`` if it is not found there."""
+        owner: Any = module
+        *path, name = target.attributes(module.__name__)
+        try:
+            for attribute in path:
+                owner = getattr(owner, attribute)
+            inspect.getattr_static(owner, name)
+        except AttributeError:
+            return False
+        original = vars(owner).get(name, _MISSING)
+        raw = inspect.getattr_static(owner, name) if original is _MISSING else original
+        replacement = _decorate(raw, target.decorator)
+        try:
+            setattr(owner, name, replacement)
+        except (AttributeError, TypeError) as error:
+            raise ValueError(f"cannot patch {target.path}: {error}") from None
+        self._patches.append(_Patch(target, owner, name, original))
+        target.applied = True
+        return True
+
+    def _remove_finder(self) -> None:
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+
+def patch(targets: Mapping[str, Decorator]) -> Patcher:
+    """Return a started :class:`Patcher` for ``targets``.
+
+    Use it as a context manager, or call :meth:`Patcher.stop` to undo it.
+
+    Raises:
+        ValueError: If a target path is malformed, or a target cannot be patched.
+    """
+    return Patcher(targets).start()
+
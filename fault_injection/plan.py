@@ -0,0 +1,261 @@
+"""Fault plans: named injection sites configured from a JSON or TOML file.
+
+A plan file maps site names to a fault and its parameters::
+
+    # faults.toml
+    [sites.db]
+    fault = "delay_random_norm"
+    mean_time_s = 0.2
+    std_time_s = 0.05
+
+    [sites.payments]
+    fault = "raise_random"
+    prob_of_raise = 0.05
+
+The file is parsed once into a table of prepared inline helper calls, so each call at a site is
+one dictionary lookup. The file's mtime is checked at most once per ``poll_interval_s``, and a
+changed file is parsed and swapped in atomically; a file that fails to parse keeps the previous
+table in force.
+"""
+
+import inspect
+import json
+import os
+import threading
+import time
+from functools import partial, wraps
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+from .delays import (
+    delay_at_nth_call_inline,
+    delay_at_nth_call_inline_async,
+    delay_inline,
+    delay_inline_async,
+    delay_on_schedule_inline,
+    delay_on_schedule_inline_async,
+    delay_random_inline,
+    delay_random_inline_async,
+    delay_random_norm_inline,
+    delay_random_norm_inline_async,
+    delay_rate_limited_inline,
+    delay_rate_limited_inline_async,
+)
+from .raise_exception import (
+    raise_at_nth_call_inline,
+    raise_inline,
+    raise_on_schedule_inline,
+    raise_random_inline,
+    raise_rate_limited_inline,
+)
+from .rate_limit import TokenBucket
+from .schedule import Schedule
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+Decorator = Callable[[Callable[..., Any]], Callable[..., Any]]
+PathLike = Union[str, "os.PathLike[str]"]
+
+# Fault name -> (sync inline helper, async inline helper or None if the sync one can be used).
+FAULTS: Dict[str, Tuple[Callable[..., Any], Optional[Callable[..., Any]]]] = {
+    "raise": (raise_inline, None),
+    "raise_at_nth_call": (raise_at_nth_call_inline, None),
+    "raise_on_schedule": (raise_on_schedule_inline, None),
+    "raise_random": (raise_random_inline, None),
+    "raise_rate_limited": (raise_rate_limited_inline, None),
+    "delay": (delay_inline, delay_inline_async),
+    "delay_at_nth_call": (delay_at_nth_call_inline, delay_at_nth_call_inline_async),
+    "delay_on_schedule": (delay_on_schedule_inline, delay_on_schedule_inline_async),
+    "delay_random": (delay_random_inline, delay_random_inline_async),
+    "delay_random_norm": (delay_random_norm_inline, delay_random_norm_inline_async),
+    "delay_rate_limited": (delay_rate_limited_inline, delay_rate_limited_inline_async),
+}
+
+
+class _CompiledSite(NamedTuple):
+    inject: Callable[[], Any]
+    inject_async: Optional[Callable[[], Any]]
+
+
+def _parse(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as file:
+        data = file.read()
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("TOML fault plans need Python 3.11+ or the tomli package")
+        try:
+            return tomllib.loads(data.decode("utf-8"))
+        except tomllib.TOMLDecodeError as error:
+            raise ValueError(f"invalid fault plan {path}: {error}") from None
+    try:
+        return json.loads(data)
+    except ValueError as error:
+        raise ValueError(f"invalid fault plan {path}: {error}") from None
+
+
+def _compile_site(name: str, spec: Any) -> Optional[_CompiledSite]:
+    if not isinstance(spec, dict):
+        raise ValueError(f"site {name!r} should be a table of parameters")
+    params = dict(spec)
+    fault = params.pop("fault", None)
+    if fault not in FAULTS:
+        raise ValueError(f"site {name!r} has unknown fault {fault!r}; expected one of "
+                         f"{', '.join(sorted(FAULTS))}")
+    if not params.pop("enabled", True):
+        return None
+    inline, inline_async = FAULTS[fault]
+    accepted = inspect.signature(inline).parameters
+    params.setdefault("site", name)
+    if "func_id" in accepted:
+        params.setdefault("func_id", f"plan:{name}")
+    try:
+        if isinstance(params.get("schedule"), dict):
+            params["schedule"] = Schedule(**params["schedule"])
+        if "bucket" in accepted:
+            # A fresh bucket per load, so an edited rate takes effect on reload.
+            params["bucket"] = TokenBucket(params.get("rate_per_s", 1.0), params.get("burst", 1))
+        inspect.signature(inline).bind(**params)
+        # Inline helpers validate their arguments before honouring ``disable``.
+        inline(**dict(params, disable=True))
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"site {name!r}: {error}") from None
+    return _CompiledSite(
+        partial(inline, **params),
+        None if inline_async is None else partial(inline_async, **params),
+    )
+
+
+def compile_plan(plan: Any) -> Dict[str, _CompiledSite]:
+    """Compile a parsed fault plan into a table of prepared inline helper calls.
+
+    Args:
+        plan: Mapping with a ``sites`` table of site name to ``fault`` and its parameters, and
+            an optional top-level ``enabled`` flag. Sites with ``enabled = false`` are skipped.
+
+    Raises:
+        ValueError: If the plan is malformed, names an unknown fault or has invalid parameters.
+    """
+    if not isinstance(plan, dict):
+        raise ValueError("fault plan should be a table")
+    sites = plan.get("sites", {})
+    if not isinstance(sites, dict):
+        raise ValueError("fault plan sites should be a table")
+    if not plan.get("enabled", True):
+        return {}
+    table = {}
+    for name, spec in sites.items():
+        compiled = _compile_site(name, spec)
+        if compiled is not None:
+            table[name] = compiled
+    return table
+
+
+def _file_stamp(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FaultPlan:
+    """Injection sites whose faults come from a JSON or TOML plan file.
+
+    Files ending in ``.toml`` are parsed as TOML, anything else as JSON.
+
+    Args:
+        path: Path of the plan file.
+        poll_interval_s: Minimum time between two checks of the file's mtime. ``0`` checks on
+            every call.
+
+    Raises:
+        ValueError: If ``poll_interval_s`` is negative, or the file is not a valid plan.
+        OSError: If the file cannot be read.
+    """
+
+    def __init__(self, path: PathLike, poll_interval_s: float = 1.0) -> None:
+        if poll_interval_s < 0:
+            raise ValueError("poll_interval_s should be non-negative")
+        self.path = os.fspath(path)
+        self.poll_interval_s = poll_interval_s
+        self.last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._table: Dict[str, _CompiledSite] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self.reload()
+
+    def reload(self) -> None:
+        """Parse the file now and swap in the new table.
+
+        Raises:
+            ValueError: If the file is not a valid plan. The previous table stays in force.
+            OSError: If the file cannot be read.
+        """
+        with self._lock:
+            stamp = _file_stamp(self.path)
+            self._table = compile_plan(_parse(self.path))
+            self._stamp = stamp
+            self._next_check = time.monotonic() + self.poll_interval_s
+            self.last_error = None
+
+    def _poll(self) -> None:
+        now = time.monotonic()
+        if now < self._next_check or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = now + self.poll_interval_s
+            try:
+                stamp = _file_stamp(self.path)
+                if stamp != self._stamp:
+                    self._stamp = stamp
+                    self._table = compile_plan(_parse(self.path))
+                    self.last_error = None
+            except (OSError, ValueError) as error:
+                self.last_error = error
+        finally:
+            self._lock.release()
+
+    def sites(self) -> Tuple[str, ...]:
+        """Return the names of the sites with an active fault."""
+        return tuple(self._table)
+
+    def inline(self, site: str) -> None:
+        """Inject the fault configured for ``site``, if any."""
+        self._poll()
+        compiled = self._table.get(site)
+        if compiled is not None:
+            compiled.inject()
+
+    async def inline_async(self, site: str) -> None:
+        """Awaitable counterpart of :meth:`inline`; delays suspend only the awaiting task."""
+        self._poll()
+        compiled = self._table.get(site)
+        if compiled is not None:
+            if compiled.inject_async is None:
+                compiled.inject()
+            else:
+                await compiled.inject_async()
+
+    def site(self, site: str) -> Decorator:
+        """Return a decorator that injects the fault configured for ``site`` before each call.
+
+        The fault is looked up on every call, so plan reloads apply to functions decorated
+        earlier.
+        """
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    await self.inline_async(site)
+                    return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                self.inline(site)
+                return func(*args, **kwargs)
+            return wrapper
+        return decorator
@@ -0,0 +1,159 @@
+"""High-precision sleeping for sub-millisecond latency injection.
+
+``time.sleep`` oversleeps by the kernel timer slack, typically 50-1000 us. In precision mode the
+sync delay helpers sleep coarsely until shortly before the deadline and spin on
+``time.perf_counter_ns`` for the rest, yielding the CPU between checks. The coarse part is
+shortened by the host's sleep overshoot, measured once by :func:`calibrate`.
+
+Async helpers are not affected: spinning would block the event loop.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional
+
+_yield = getattr(os, "sched_yield", lambda: None)
+
+
+class SleepReport(NamedTuple):
+    """Requested and actual duration of a precise sleep, in seconds."""
+
+    requested_s: float
+    actual_s: float
+
+    @property
+    def error_s(self) -> float:
+        """Actual minus requested duration."""
+        return self.actual_s - self.requested_s
+
+
+class _State:
+    __slots__ = ("enabled", "overshoot_s")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.overshoot_s: Optional[float] = None
+
+
+_state = _State()
+_local = threading.local()
+
+
+def calibrate(samples: int = 50, probe_s: float = 0.001) -> float:
+    """Measure how much ``time.sleep`` overshoots on this host and remember it.
+
+    The 90th percentile overshoot of ``samples`` sleeps of ``probe_s`` seconds is stored and
+    used by every later precise sleep. Calibration runs automatically on the first precise
+    sleep if it has not been done explicitly.
+
+    Args:
+        samples: Number of probe sleeps. Must be a positive integer.
+        probe_s: Duration of each probe sleep in seconds. Must be positive.
+
+    Returns:
+        The measured overshoot in seconds.
+
+    Raises:
+        ValueError: If ``samples`` is not a positive integer or ``probe_s`` is not positive.
+    """
+    if samples < 1 or not isinstance(samples, int):
+        raise ValueError("samples should be a positive integer.")
+    if probe_s <= 0:
+        raise ValueError("calibrate should have positive probe_s")
+    probe_ns = int(probe_s * 1e9)
+    overshoots_ns = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        time.sleep(probe_s)
+        overshoots_ns.append(max(0, time.perf_counter_ns() - start - probe_ns))
+    overshoots_ns.sort()
+    overshoot_s = overshoots_ns[int(0.9 * (samples - 1))] / 1e9
+    _state.overshoot_s = overshoot_s
+    return overshoot_s
+
+
+def overshoot_s() -> float:
+    """Return the calibrated sleep overshoot in seconds, calibrating on first use."""
+    overshoot = _state.overshoot_s
+    if overshoot is None:
+        overshoot = calibrate()
+    return overshoot
+
+
+def precise_sleep(time_s: float) -> float:
+    """Sleep for ``time_s`` seconds with sub-millisecond accuracy.
+
+    Sleeps with ``time.sleep`` until the calibrated overshoot before the deadline, then spins
+    on ``time.perf_counter_ns`` and yields the CPU until the deadline passes.
+
+    Args:
+        time_s: Sleep duration in seconds. Must be non-negative.
+
+    Returns:
+        The actual sleep duration in seconds. It is also available from
+        :func:`last_sleep_report` in the calling thread.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+    """
+    if time_s < 0:
+        raise ValueError("precise_sleep should have positive time_s")
+    start = time.perf_counter_ns()
+    deadline = start + int(time_s * 1e9)
+    coarse_s = time_s - overshoot_s()
+    if coarse_s > 0:
+        time.sleep(coarse_s)
+    now = time.perf_counter_ns()
+    while now < deadline:
+        _yield()
+        now = time.perf_counter_ns()
+    actual_s = (now - start) / 1e9
+    _local.report = SleepReport(time_s, actual_s)
+    return actual_s
+
+
+def last_sleep_report() -> Optional[SleepReport]:
+    """Return the report of the last precise sleep in the calling thread, if any."""
+    return getattr(_local, "report", None)
+
+
+def is_enabled() -> bool:
+    """Return ``True`` if the sync delay helpers use :func:`precise_sleep`."""
+    return _state.enabled
+
+
+def enable(calibrate_now: bool = True) -> None:
+    """Make the sync delay helpers use :func:`precise_sleep`.
+
+    Args:
+        calibrate_now: Calibrate immediately if not done yet, so the first injected delay
+            does not pay for it.
+    """
+    if calibrate_now and _state.overshoot_s is None:
+        calibrate()
+    _state.enabled = True
+
+
+def disable() -> None:
+    """Make the sync delay helpers use plain ``time.sleep`` again."""
+    _state.enabled = False
+
+
+@contextmanager
+def enabled(flag: bool = True) -> Iterator[None]:
+    """Temporarily set precision mode to ``flag`` and restore the previous value on exit.
+
+    Args:
+        flag: Value of precision mode inside the ``with`` block.
+    """
+    previous = _state.enabled
+    if flag:
+        enable()
+    else:
+        disable()
+    try:
+        yield
+    finally:
+        _state.enabled = previous
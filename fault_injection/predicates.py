@@ -0,0 +1,278 @@
+"""Argument-aware conditions for injecting faults into some calls only.
+
+:func:`when` applies a fault injection decorator only to calls whose arguments satisfy a
+:class:`Condition`, e.g. one tenant, a set of shard ids or large payloads::
+
+    @when(arg("tenant").equals("acme") & arg("payload", key=len).between(1_000_000),
+          raise_random(prob_of_raise=0.5))
+    def upload(tenant, payload): ...
+
+The argument is located in the function's signature once, when the function is decorated, so a
+call reads it with a tuple index or a dictionary lookup. Each condition is compiled into a plain
+closure at the same time, so checking it costs one or two Python calls.
+"""
+
+import abc
+import inspect
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional, Union
+
+Decorator = Callable[[Callable[..., Any]], Callable[..., Any]]
+Test = Callable[[tuple, dict], bool]
+
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _argument_getter(func: Callable[..., Any], arg: Union[int, str]) -> Callable[..., Any]:
+    """Return ``get(args, kwargs)`` fetching argument ``arg`` of ``func``, resolved once.
+
+    ``arg`` is a position (counting ``self`` for methods) or a name. Positions count positional
+    parameters only, then items of ``*args``. A missing argument reads as its default value, or
+    ``None`` without one.
+
+    Raises:
+        ValueError: If ``func`` has no argument named ``arg``, ``arg`` names ``*args`` or
+            ``**kwargs`` itself, or ``arg`` is a position past the positional parameters of a
+            function without ``*args``.
+    """
+    parameters = list(inspect.signature(func).parameters.values())
+    positional = [parameter for parameter in parameters if parameter.kind in _POSITIONAL]
+    name: Optional[str] = None
+    position: Optional[int] = None
+    default = None
+    if isinstance(arg, str):
+        matches = [other for other in parameters if other.name == arg]
+        if not matches:
+            raise ValueError(f"{func.__qualname__} has no argument {arg!r}")
+        parameter: Optional[inspect.Parameter] = matches[0]
+    elif arg < len(positional):
+        parameter = positional[arg]
+    elif any(other.kind is inspect.Parameter.VAR_POSITIONAL for other in parameters):
+        parameter = None  # An item of ``*args``, read by position.
+        position = arg
+    else:
+        raise ValueError(f"{func.__qualname__} has {len(positional)} positional arguments, "
+                         f"so it has no argument at position {arg}")
+    if parameter is not None:
+        if parameter.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            raise ValueError(f"{func.__qualname__} argument {parameter.name!r} is variadic; "
+                             "use a position to read an item of *args")
+        if parameter.kind in _POSITIONAL:
+            position = positional.index(parameter)
+        if parameter.kind is not inspect.Parameter.POSITIONAL_ONLY:
+            name = parameter.name
+        if parameter.default is not inspect.Parameter.empty:
+            default = parameter.default
+
+    if name is None:
+        def get(args: tuple, kwargs: dict) -> Any:
+            return args[position] if position < len(args) else default
+    elif position is None:
+        def get(args: tuple, kwargs: dict) -> Any:
+            return kwargs.get(name, default)
+    else:
+        def get(args: tuple, kwargs: dict) -> Any:
+            if position < len(args):
+                return args[position]
+            return kwargs.get(name, default)
+    return get
+
+
+class Condition(abc.ABC):
+    """Test on the arguments of a call. Combine with ``&``, ``|`` and ``~``."""
+
+    @abc.abstractmethod
+    def bind(self, func: Callable[..., Any]) -> Test:
+        """Return ``test(args, kwargs)`` for calls of ``func``, resolving arguments once.
+
+        Raises:
+            ValueError: If the condition names an argument ``func`` does not have.
+        """
+
+    def __and__(self, other: "Condition") -> "Condition":
+        return _All(self, other)
+
+    def __or__(self, other: "Condition") -> "Condition":
+        return _Any(self, other)
+
+    def __invert__(self) -> "Condition":
+        return _Not(self)
+
+
+class _All(Condition):
+    def __init__(self, first: Condition, second: Condition) -> None:
+        self.first = first
+        self.second = second
+
+    def bind(self, func: Callable[..., Any]) -> Test:
+        first, second = self.first.bind(func), self.second.bind(func)
+        return lambda args, kwargs: first(args, kwargs) and second(args, kwargs)
+
+    def __repr__(self) -> str:
+        return f"({self.first!r} & {self.second!r})"
+
+
+class _Any(Condition):
+    def __init__(self, first: Condition, second: Condition) -> None:
+        self.first = first
+        self.second = second
+
+    def bind(self, func: Callable[..., Any]) -> Test:
+        first, second = self.first.bind(func), self.second.bind(func)
+        return lambda args, kwargs: first(args, kwargs) or second(args, kwargs)
+
+    def __repr__(self) -> str:
+        return f"({self.first!r} | {self.second!r})"
+
+
+class _Not(Condition):
+    def __init__(self, condition: Condition) -> None:
+        self.condition = condition
+
+    def bind(self, func: Callable[..., Any]) -> Test:
+        test = self.condition.bind(func)
+        return lambda args, kwargs: not test(args, kwargs)
+
+    def __repr__(self) -> str:
+        return f"~{self.condition!r}"
+
+
+class _ArgCondition(Condition):
+    """Condition on one argument, tested by ``check`` after the argument's ``key``."""
+
+    def __init__(self, argument: "Arg", check: Callable[[Any], bool], text: str) -> None:
+        self.argument = argument
+        self.check = check
+        self.text = text
+
+    def bind(self, func: Callable[..., Any]) -> Test:
+        get = _argument_getter(func, self.argument.arg)
+        check = self.check
+        key = self.argument.key
+        if key is None:
+            return lambda args, kwargs: check(get(args, kwargs))
+        return lambda args, kwargs: check(key(get(args, kwargs)))
+
+    def __repr__(self) -> str:
+        return f"{self.argument!r}.{self.text}"
+
+
+class Arg:
+    """Builder of conditions on one argument; see :func:`arg`."""
+
+    def __init__(self, arg: Union[int, str], key: Optional[Callable[[Any], Any]] = None) -> None:
+        if not isinstance(arg, str) and (not isinstance(arg, int) or arg < 0):
+            raise ValueError("arg should be a name or a non-negative position")
+        self.arg = arg
+        self.key = key
+
+    def equals(self, value: Any) -> Condition:
+        """The argument equals ``value``."""
+        return _ArgCondition(self, lambda current: current == value, f"equals({value!r})")
+
+    def is_in(self, values: Iterable[Any]) -> Condition:
+        """The argument is one of ``values``; a ``frozenset`` lookup if they are hashable."""
+        values = tuple(values)
+        try:
+            members: Any = frozenset(values)
+        except TypeError:
+            members = values
+
+        def check(current: Any) -> bool:
+            try:
+                return current in members
+            except TypeError:  # Unhashable argument tested against a frozenset.
+                return False
+        return _ArgCondition(self, check, f"is_in({values!r})")
+
+    def between(self, low: Any = None, high: Any = None) -> Condition:
+        """``low <= argument < high``; a bound of ``None`` is open. Incomparable is false.
+
+        Raises:
+            ValueError: If both bounds are ``None``.
+        """
+        if low is None and high is None:
+            raise ValueError("between needs low or high")
+
+        if high is None:
+            def check(current: Any) -> bool:
+                try:
+                    return low <= current
+                except TypeError:
+                    return False
+        elif low is None:
+            def check(current: Any) -> bool:
+                try:
+                    return current < high
+                except TypeError:
+                    return False
+        else:
+            def check(current: Any) -> bool:
+                try:
+                    return low <= current < high
+                except TypeError:
+                    return False
+        return _ArgCondition(self, check, f"between({low!r}, {high!r})")
+
+    def matches(self, predicate: Callable[[Any], bool]) -> Condition:
+        """``predicate(argument)`` is true."""
+        return _ArgCondition(self, predicate, f"matches({predicate!r})")
+
+    def __repr__(self) -> str:
+        key = "" if self.key is None else f", key={self.key!r}"
+        return f"arg({self.arg!r}{key})"
+
+
+def arg(name: Union[int, str], key: Optional[Callable[[Any], Any]] = None) -> Arg:
+    """Return a builder of conditions on argument ``name``.
+
+    Args:
+        name: Argument name, or position counting ``self`` for methods. Positions count
+            positional parameters, then items of ``*args``. It is resolved against the
+            signature when the function is decorated, where a name or position the function
+            does not have raises ``ValueError``; a missing argument reads as its default value.
+        key: Function applied to the argument before the test, e.g. ``len`` for payload size.
+
+    Raises:
+        ValueError: If ``name`` is a negative position.
+    """
+    return Arg(name, key)
+
+
+def when(condition: Condition, decorator: Decorator) -> Decorator:
+    """Return a decorator that applies ``decorator`` only to calls satisfying ``condition``.
+
+    Other calls go straight to the undecorated function, so they also do not advance its call
+    counters. If ``decorator`` returns the function unchanged, e.g. with ``disable=True``,
+    it is returned as is.
+
+    Args:
+        condition: Condition on the call's arguments, built with :func:`arg`.
+        decorator: Any fault injection decorator, e.g. ``raise_random(prob_of_raise=0.1)``.
+
+    Raises:
+        ValueError: When decorating, if ``condition`` names an argument the function does not
+            have.
+    """
+    def wrap(func: Callable[..., Any]) -> Callable[..., Any]:
+        injected = decorator(func)
+        if injected is func:
+            return func
+        test = condition.bind(func)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if test(args, kwargs):
+                    return await injected(*args, **kwargs)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if test(args, kwargs):
+                return injected(*args, **kwargs)
+            return func(*args, **kwargs)
+        return wrapper
+
+    return wrap
@@ -0,0 +1,252 @@
+"""Record the latency of real functions and replay it as injected delays.
+
+A profile file is an 8-byte magic header followed by little-endian signed 64-bit latencies in
+nanoseconds, one per call. :class:`ProfileRecorder` keeps the file open and appends samples in
+batches from an in-memory ``array('q')``, so recording a call costs a ``perf_counter_ns`` pair and
+an array append.
+"""
+
+import atexit
+import inspect
+import os
+import sys
+import threading
+import time
+import weakref
+from array import array
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from .delays import Decorator, delay_distribution
+from .distributions import Empirical, Replay
+from .sampling import RandomSource
+from .switch import _state
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+MAGIC = b"FIPROF01"
+_SWAP = sys.byteorder != "little"
+
+
+class LatencyProfile:
+    """Recorded latencies in nanoseconds, in call order.
+
+    Args:
+        samples_ns: Latencies in nanoseconds.
+    """
+
+    def __init__(self, samples_ns: Iterable[int] = ()) -> None:
+        self.samples_ns = array("q", samples_ns)
+
+    @classmethod
+    def load(cls, path: PathLike) -> "LatencyProfile":
+        """Read a profile file written by :class:`ProfileRecorder`.
+
+        A partially written trailing sample is ignored.
+
+        Raises:
+            ValueError: If the file is not a latency profile.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{os.fspath(path)} is not a latency profile")
+        body = data[len(MAGIC):]
+        samples = array("q")
+        samples.frombytes(body[:len(body) - len(body) % samples.itemsize])
+        if _SWAP:
+            samples.byteswap()
+        profile = cls()
+        profile.samples_ns = samples
+        return profile
+
+    def samples_s(self) -> array:
+        """Return the latencies in seconds as ``array('d')``."""
+        return array("d", (sample / 1e9 for sample in self.samples_ns))
+
+    def replay(self) -> Replay:
+        """Return a distribution that yields the recorded latencies in order."""
+        return Replay(self.samples_s())
+
+    def sampler(self) -> Empirical:
+        """Return a distribution that samples the recorded latencies."""
+        return Empirical.from_samples(self.samples_s())
+
+    def __len__(self) -> int:
+        return len(self.samples_ns)
+
+
+class ProfileRecorder:
+    """Append latency samples to a profile file that stays open.
+
+    Samples are buffered in an ``array('q')`` and written every ``flush_every`` samples, on
+    :meth:`flush` and :meth:`close`, and at interpreter exit.
+
+    Args:
+        path: Profile file. Created with a header if missing, appended to otherwise, after
+            dropping a partially written trailing sample.
+        flush_every: Number of buffered samples that triggers a write. Must be a positive
+            integer.
+
+    Raises:
+        ValueError: If ``flush_every`` is not a positive integer, or ``path`` exists and is not
+            a latency profile.
+    """
+
+    def __init__(self, path: PathLike, flush_every: int = 1024) -> None:
+        if flush_every < 1 or not isinstance(flush_every, int):
+            raise ValueError("flush_every should be a positive integer.")
+        self.path = os.fspath(path)
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._buffer = array("q")
+        self._file = open(self.path, "a+b")
+        self._file.seek(0)
+        header = self._file.read(len(MAGIC))
+        if not header:
+            self._file.write(MAGIC)
+            self._file.flush()
+        elif header != MAGIC:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a latency profile")
+        else:
+            # Drop a partially written trailing sample, e.g. after a crash during a flush, so
+            # new samples stay aligned.
+            size = self._file.seek(0, os.SEEK_END)
+            partial = (size - len(MAGIC)) % self._buffer.itemsize
+            if partial:
+                self._file.truncate(size - partial)
+        _RECORDERS.add(self)
+
+    def record_ns(self, latency_ns: int) -> None:
+        """Buffer one latency sample in nanoseconds."""
+        with self._lock:
+            self._buffer.append(latency_ns)
+            if len(self._buffer) >= self.flush_every:
+                self._write()
+
+    def _write(self) -> None:
+        if self._buffer and not self._file.closed:
+            if _SWAP:
+                self._buffer.byteswap()
+            self._buffer.tofile(self._file)
+            self._file.flush()
+            self._buffer = array("q")
+
+    def flush(self) -> None:
+        """Write buffered samples to the file."""
+        with self._lock:
+            self._write()
+
+    def close(self) -> None:
+        """Write buffered samples and close the file."""
+        with self._lock:
+            self._write()
+            self._file.close()
+
+    def __enter__(self) -> "ProfileRecorder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_RECORDERS: "weakref.WeakSet[ProfileRecorder]" = weakref.WeakSet()
+_recorders_lock = threading.Lock()
+_recorders_by_path: Dict[str, ProfileRecorder] = {}
+
+
+@atexit.register
+def _flush_all() -> None:
+    for recorder in list(_RECORDERS):
+        recorder.flush()
+
+
+def recorder(path: PathLike) -> ProfileRecorder:
+    """Return the shared recorder of ``path``, opening it on first use."""
+    key = os.path.abspath(path)
+    with _recorders_lock:
+        shared = _recorders_by_path.get(key)
+        if shared is None or shared._file.closed:
+            shared = ProfileRecorder(key)
+            _recorders_by_path[key] = shared
+    return shared
+
+
+def record_latency(
+    profile: Union[PathLike, ProfileRecorder],
+    disable: bool = False,
+) -> Decorator:
+    """Return a decorator that records the latency of every call into ``profile``.
+
+    Latency is measured with ``time.perf_counter_ns`` around the call, including calls that
+    raise. For coroutine functions the awaited time is recorded.
+
+    Args:
+        profile: Profile file path, whose recorder is shared by every decorator using it, or a
+            :class:`ProfileRecorder`.
+        disable: If ``True``, the function is returned undecorated. As with the fault
+            injection decorators, it is also returned undecorated while injection is globally
+            disabled, and calls are not recorded while the switch is off.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if disable or not _state.enabled:
+            return func
+        target = profile if isinstance(profile, ProfileRecorder) else recorder(profile)
+        record_ns = target.record_ns
+        perf_counter_ns = time.perf_counter_ns
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _state.enabled:
+                    return await func(*args, **kwargs)
+                start = perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record_ns(perf_counter_ns() - start)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_ns(perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
+def delay_replay(
+    profile: Union[PathLike, LatencyProfile],
+    sampled: bool = False,
+    max_time_s: Optional[float] = None,
+    disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
+) -> Decorator:
+    """Return a :func:`~fault_injection.delay_distribution` decorator that replays ``profile``.
+
+    Args:
+        profile: Profile file path or a loaded :class:`LatencyProfile`.
+        sampled: If ``False``, delays follow the recorded order and start over at the end. If
+            ``True``, delays are sampled from the recorded latencies.
+        max_time_s: Upper bound of the delay in seconds, or ``None`` for no bound.
+        disable: If ``True``, the function is returned undecorated.
+        rng: Source of random numbers for ``sampled`` replay.
+        site: Name under which calls and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If the profile is empty or not a latency profile.
+    """
+    if not isinstance(profile, LatencyProfile):
+        profile = LatencyProfile.load(profile)
+    if not len(profile):
+        raise ValueError("profile should not be empty")
+    distribution = profile.sampler() if sampled else profile.replay()
+    return delay_distribution(distribution, max_time_s, disable, rng, site)
@@ -1,38 +1,91 @@
 """Exception-based fault injection helpers."""
 
+import inspect
 import random
-from functools import wraps
-from typing import Any, Callable
+from functools import partial, wraps
+from typing import Any, Callable, NoReturn, Optional
+
+from .counters import Counters, CounterStore
+from .metrics import SiteMetrics, _count_fault, _optional_site_metrics
+from .rate_limit import BucketStore, TokenBucket, _validate as _validate_rate
+from .rng import site_stream
+from .sampling import RandomSource
+from .schedule import Schedule
+from .switch import _state
 
 Decorator = Callable[[Callable[..., Any]], Callable[..., Any]]
 
+_NTH_CALL_COUNTERS = CounterStore()
+_NTH_CALL_INLINE_COUNTERS = CounterStore()
+_SCHEDULE_COUNTERS = CounterStore()
+_SCHEDULE_INLINE_COUNTERS = CounterStore()
+_RATE_LIMIT_INLINE_BUCKETS = BucketStore()
+
+
+def _raise(msg: str, metrics: Optional[SiteMetrics]) -> NoReturn:
+    """Record the injected exception and raise ``RuntimeError(msg)``."""
+    _count_fault()
+    if metrics is not None:
+        metrics.record_raise()
+    raise RuntimeError(msg)
 
-def raise_inline(msg: str = "raise_inline exception is raised", disable: bool = False) -> None:
+
+def raise_inline(
+    msg: str = "raise_inline exception is raised",
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> None:
     """Raise ``RuntimeError`` immediately unless disabled.
 
     Args:
         msg: Exception message.
         disable: If ``True``, raising is skipped.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
     """
-    if not disable:
-        raise RuntimeError(msg)
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        _raise(msg, metrics)
 
 
-def raise_(msg: str = "raise_ exception is raised", disable: bool = False) -> Decorator:
+def raise_(
+    msg: str = "raise_ exception is raised",
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> Decorator:
     """Return a decorator that always raises ``RuntimeError`` unless disabled.
 
     Args:
         msg: Exception message. This is the first positional argument.
-        disable: If ``True``, no exception is injected and the function executes.
+        disable: If ``True``, the function is returned undecorated.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
     """
+    metrics = _optional_site_metrics(site)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         """Wrap ``func`` with deterministic exception injection."""
+        if disable or not _state.enabled:
+            return func
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _state.enabled:
+                    return await func(*args, **kwargs)
+                if metrics is not None:
+                    metrics.record_call()
+                _raise(msg, metrics)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if disable:
+            if not _state.enabled:
                 return func(*args, **kwargs)
-            raise RuntimeError(msg)
+            if metrics is not None:
+                metrics.record_call()
+            _raise(msg, metrics)
         return wrapper
     return decorator
 
@@ -41,7 +94,9 @@ def raise_at_nth_call_inline(
         msg: str = "raise_at_nth_call_inline exception is raised",
         n: int = 5,
         func_id = 1,
-        disable: bool = False
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
     ) -> None:
     """Raise ``RuntimeError`` at the n-th call for a given ``func_id``.
 
@@ -51,6 +106,10 @@ def raise_at_nth_call_inline(
         func_id: Counter key used to isolate different call sites. Calls that use the same
             ``func_id`` share the same counter.
         disable: If ``True``, raising is skipped.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``n`` is not a positive integer.
@@ -58,21 +117,23 @@ def raise_at_nth_call_inline(
     if n < 1 or not isinstance(n, int):
         raise ValueError("n should be a positive integer.")
 
-    if not hasattr(raise_at_nth_call_inline, "n_called_dict"):
-        raise_at_nth_call_inline.n_called_dict = {}
-
-    if func_id not in raise_at_nth_call_inline.n_called_dict.keys():
-        raise_at_nth_call_inline.n_called_dict[func_id] = 0
-    raise_at_nth_call_inline.n_called_dict[func_id] += 1
-    if raise_at_nth_call_inline.n_called_dict[func_id] == n and not disable:
-        raise RuntimeError(msg + f"\nFunc id {func_id}")
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    store = _NTH_CALL_INLINE_COUNTERS if counters is None else counters
+    if store.increment(func_id) == n:
+        _raise(msg + f"\nFunc id {func_id}", metrics)
 
 
 def raise_at_nth_call(
         msg: str = "raise_at_nth_call exception is raised",
         n: int = 5,
         func_id = 1,
-        disable: bool = False
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
     ) -> Decorator:
     """Return a decorator that raises ``RuntimeError`` on the n-th call.
 
@@ -80,27 +141,145 @@ def raise_at_nth_call(
         msg: Exception message. This is the first positional argument.
         n: 1-based call number at which to raise.
         func_id: Counter key used to isolate different decorated functions. Decorators that
-            use the same ``func_id`` share the same counter.
-        disable: If ``True``, no exception is injected and the function executes.
+            use the same ``func_id`` share the same counter. If ``None``, the decorated
+            function gets its own counter, which is released together with the function.
+        disable: If ``True``, the function is returned undecorated.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``n`` is not a positive integer.
     """
     if n < 1 or not isinstance(n, int):
         raise ValueError("n should be a positive integer.")
+    store = _NTH_CALL_COUNTERS if counters is None else counters
+    metrics = _optional_site_metrics(site)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         """Wrap ``func`` with deterministic exception injection."""
+        if disable or not _state.enabled:
+            return func
+        if func_id is None:
+            count = store.function_counter(func).increment
+            error_msg = msg + f"\nFunc id {func.__qualname__}"
+        else:
+            count = partial(store.increment, func_id)
+            error_msg = msg + f"\nFunc id {func_id}"
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    if count() == n:
+                        _raise(error_msg, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not hasattr(raise_at_nth_call, "n_called_dict"):
-                raise_at_nth_call.n_called_dict = {}
-
-            if func_id not in raise_at_nth_call.n_called_dict.keys():
-                raise_at_nth_call.n_called_dict[func_id] = 0
-            raise_at_nth_call.n_called_dict[func_id] += 1
-            if raise_at_nth_call.n_called_dict[func_id] == n and not disable:
-                raise RuntimeError(msg + f"\nFunc id {func_id}")
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                if count() == n:
+                    _raise(error_msg, metrics)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def raise_on_schedule_inline(
+        schedule: Schedule,
+        msg: str = "raise_on_schedule_inline exception is raised",
+        func_id = 1,
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
+    ) -> None:
+    """Raise ``RuntimeError`` on the calls in ``schedule`` for a given ``func_id``.
+
+    Args:
+        schedule: Call numbers that raise, e.g. ``schedule.window(1000, 1100)``.
+        msg: Exception message.
+        func_id: Counter key used to isolate different call sites. Calls that use the same
+            ``func_id`` share the same counter.
+        disable: If ``True``, raising is skipped.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+    """
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    store = _SCHEDULE_INLINE_COUNTERS if counters is None else counters
+    count = store.increment(func_id)
+    if schedule.fires(count):
+        _raise(msg + f"\nFunc id {func_id}, call {count}", metrics)
+
+
+def raise_on_schedule(
+        schedule: Schedule,
+        msg: str = "raise_on_schedule exception is raised",
+        func_id = 1,
+        disable: bool = False,
+        counters: Optional[Counters] = None,
+        site: Optional[str] = None,
+    ) -> Decorator:
+    """Return a decorator that raises ``RuntimeError`` on the calls in ``schedule``.
+
+    Args:
+        schedule: Call numbers that raise, e.g. ``schedule.window(1000, 1100)``.
+        msg: Exception message.
+        func_id: Counter key used to isolate different decorated functions. Decorators that
+            use the same ``func_id`` share the same counter. If ``None``, the decorated
+            function gets its own counter, which is released together with the function.
+        disable: If ``True``, the function is returned undecorated.
+        counters: Counter store to use instead of the default per-process store, e.g. a
+            :class:`~fault_injection.counters.SharedCounterStore` shared by all processes.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+    """
+    store = _SCHEDULE_COUNTERS if counters is None else counters
+    metrics = _optional_site_metrics(site)
+    fires = schedule.fires
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap ``func`` with scheduled exception injection."""
+        if disable or not _state.enabled:
+            return func
+        if func_id is None:
+            count = store.function_counter(func).increment
+            error_msg = msg + f"\nFunc id {func.__qualname__}, call "
+        else:
+            count = partial(store.increment, func_id)
+            error_msg = msg + f"\nFunc id {func_id}, call "
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    call = count()
+                    if fires(call):
+                        _raise(error_msg + str(call), metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                call = count()
+                if fires(call):
+                    _raise(error_msg + str(call), metrics)
             return func(*args, **kwargs)
         return wrapper
     return decorator
@@ -110,6 +289,8 @@ def raise_random_inline(
     msg: str = "raise_random exception is raised",
     prob_of_raise: float = 0.1,
     disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
 ) -> None:
     """Raise ``RuntimeError`` with probability ``prob_of_raise`` unless disabled.
 
@@ -117,44 +298,186 @@ def raise_random_inline(
         msg: Exception message.
         prob_of_raise: Probability in ``[0, 1]`` used to raise an exception.
         disable: If ``True``, raising is skipped.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``prob_of_raise`` is outside ``[0, 1]``.
     """
     if not 0 <= prob_of_raise <= 1:
         raise ValueError("prob_of_raise should be 0-1")
-    if not disable:
-        rnd = random.random()
+    if not disable and _state.enabled:
+        metrics = _optional_site_metrics(site)
+        if metrics is not None:
+            metrics.record_call()
+        if rng is None:
+            rng = random if site is None else site_stream(site)
+        rnd = rng.random()
         if rnd < prob_of_raise:
-            raise RuntimeError(msg)
+            _raise(msg, metrics)
 
 
 def raise_random(
     msg: str = "raise_random exception is raised",
     prob_of_raise: float = 0.1,
     disable: bool = False,
+    rng: Optional[RandomSource] = None,
+    site: Optional[str] = None,
 ) -> Decorator:
     """Return a decorator that raises ``RuntimeError`` with a set probability.
 
     Args:
         msg: Exception message. This is the first positional argument.
         prob_of_raise: Probability in ``[0, 1]`` used to raise an exception.
-        disable: If ``True``, exception injection is skipped.
+        disable: If ``True``, the function is returned undecorated.
+        rng: Source of random numbers, e.g. a :class:`~fault_injection.sampling.BatchSampler`.
+            Defaults to the :mod:`~fault_injection.rng` stream of ``site``, or the global
+            ``random`` module if ``site`` is ``None``.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
 
     Raises:
         ValueError: If ``prob_of_raise`` is outside ``[0, 1]``.
     """
     if not 0 <= prob_of_raise <= 1:
         raise ValueError("prob_of_raise should be 0-1")
+    if rng is None:
+        rng = random if site is None else site_stream(site)
+    metrics = _optional_site_metrics(site)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         """Wrap ``func`` with probabilistic exception injection."""
+        if disable or not _state.enabled:
+            return func
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    rnd = rng.random()
+                    if rnd < prob_of_raise:
+                        _raise(msg, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not disable:
-                rnd = random.random()
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                rnd = rng.random()
                 if rnd < prob_of_raise:
-                    raise RuntimeError(msg)
+                    _raise(msg, metrics)
             return func(*args, **kwargs)
         return wrapper
     return decorator
+
+
+def raise_rate_limited_inline(
+        msg: str = "raise_rate_limited_inline exception is raised",
+        rate_per_s: float = 1.0,
+        burst: int = 1,
+        func_id = 1,
+        disable: bool = False,
+        bucket: Optional[TokenBucket] = None,
+        site: Optional[str] = None,
+    ) -> None:
+    """Raise ``RuntimeError`` at most ``rate_per_s`` times per second for a given ``func_id``.
+
+    Every call takes a token from the bucket of ``func_id`` and raises if it gets one, so the
+    number of faults per second stays fixed however fast the call site is called.
+
+    Args:
+        msg: Exception message.
+        rate_per_s: Sustained number of exceptions per second. Must be positive.
+        burst: Number of exceptions allowed back to back when the bucket is full. Must be a
+            positive integer.
+        func_id: Bucket key used to isolate different call sites. The bucket is created with
+            the rate and burst of its first call.
+        disable: If ``True``, raising is skipped.
+        bucket: Token bucket to use instead of the ``func_id`` bucket, e.g. one shared by
+            several call sites.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``rate_per_s`` is not positive or ``burst`` is not a positive integer.
+    """
+    _validate_rate(rate_per_s, burst)
+
+    if disable or not _state.enabled:
+        return
+    metrics = _optional_site_metrics(site)
+    if metrics is not None:
+        metrics.record_call()
+    if bucket is None:
+        bucket = _RATE_LIMIT_INLINE_BUCKETS.get(func_id, rate_per_s, burst)
+    if bucket.try_acquire():
+        _raise(msg, metrics)
+
+
+def raise_rate_limited(
+        msg: str = "raise_rate_limited exception is raised",
+        rate_per_s: float = 1.0,
+        burst: int = 1,
+        disable: bool = False,
+        bucket: Optional[TokenBucket] = None,
+        site: Optional[str] = None,
+    ) -> Decorator:
+    """Return a decorator that raises ``RuntimeError`` at most ``rate_per_s`` times per second.
+
+    Args:
+        msg: Exception message. This is the first positional argument.
+        rate_per_s: Sustained number of exceptions per second. Must be positive.
+        burst: Number of exceptions allowed back to back when the bucket is full. Must be a
+            positive integer.
+        disable: If ``True``, the function is returned undecorated.
+        bucket: Token bucket to use instead of a new one per decorated function, e.g. one
+            shared by several functions.
+        site: Name under which calls and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``rate_per_s`` is not positive or ``burst`` is not a positive integer.
+    """
+    _validate_rate(rate_per_s, burst)
+    metrics = _optional_site_metrics(site)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap ``func`` with rate-limited exception injection."""
+        if disable or not _state.enabled:
+            return func
+        try_acquire = (TokenBucket(rate_per_s, burst) if bucket is None else bucket).try_acquire
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _state.enabled:
+                    if metrics is not None:
+                        metrics.record_call()
+                    if try_acquire():
+                        _raise(msg, metrics)
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _state.enabled:
+                if metrics is not None:
+                    metrics.record_call()
+                if try_acquire():
+                    _raise(msg, metrics)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+raise_at_nth_call.counters = _NTH_CALL_COUNTERS
+raise_at_nth_call_inline.counters = _NTH_CALL_INLINE_COUNTERS
+raise_on_schedule.counters = _SCHEDULE_COUNTERS
+raise_on_schedule_inline.counters = _SCHEDULE_INLINE_COUNTERS
+raise_rate_limited_inline.buckets = _RATE_LIMIT_INLINE_BUCKETS
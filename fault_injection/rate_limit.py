@@ -0,0 +1,100 @@
+"""Token buckets for the rate-limited fault injection helpers."""
+
+import threading
+from typing import Dict, Hashable, Optional
+
+from . import clock
+
+
+def _validate(rate_per_s: float, burst: int) -> None:
+    if rate_per_s <= 0:
+        raise ValueError("rate_per_s should be positive")
+    if burst < 1 or not isinstance(burst, int):
+        raise ValueError("burst should be a positive integer.")
+
+
+class TokenBucket:
+    """Token bucket that allows at most ``rate_per_s`` events per second after a ``burst``.
+
+    The bucket is stored as a single theoretical arrival time (GCRA): an event is allowed if the
+    clock has reached it, minus the burst allowance, and then moves it one emission interval
+    forward. Denied events only read that one integer and never take the lock, so the cost stays
+    flat when most calls are denied at high throughput. Time comes from
+    :func:`fault_injection.clock.monotonic_ns`, which is ``time.monotonic_ns`` outside virtual
+    time.
+
+    Args:
+        rate_per_s: Sustained number of allowed events per second. Must be positive.
+        burst: Number of events allowed back to back when the bucket is full. Must be a
+            positive integer.
+
+    Raises:
+        ValueError: If ``rate_per_s`` is not positive or ``burst`` is not a positive integer.
+    """
+
+    __slots__ = ("rate_per_s", "burst", "_interval_ns", "_tolerance_ns", "_tat_ns", "_lock")
+
+    def __init__(self, rate_per_s: float = 1.0, burst: int = 1) -> None:
+        _validate(rate_per_s, burst)
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self._interval_ns = max(1, round(1e9 / rate_per_s))
+        self._tolerance_ns = (burst - 1) * self._interval_ns
+        self._tat_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take one token and return ``True``, or return ``False`` if the bucket is empty."""
+        now = clock.monotonic_ns()
+        tat = self._tat_ns
+        if tat is not None and now < tat - self._tolerance_ns:
+            return False
+        with self._lock:
+            tat = self._tat_ns
+            if tat is None or tat < now:
+                tat = now
+            elif now < tat - self._tolerance_ns:
+                return False
+            self._tat_ns = tat + self._interval_ns
+            return True
+
+    def reset(self) -> None:
+        """Refill the bucket."""
+        with self._lock:
+            self._tat_ns = None
+
+
+class BucketStore:
+    """Mapping of ``func_id`` to :class:`TokenBucket`.
+
+    A bucket is created with the rate and burst of the first call that uses its ``func_id``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+
+    def get(self, func_id: Hashable, rate_per_s: float = 1.0, burst: int = 1) -> TokenBucket:
+        """Return the bucket for ``func_id``, creating it on first use."""
+        bucket = self._buckets.get(func_id)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(func_id)
+                if bucket is None:
+                    bucket = TokenBucket(rate_per_s, burst)
+                    self._buckets[func_id] = bucket
+        return bucket
+
+    def reset(self, func_id: Optional[Hashable] = None) -> None:
+        """Drop the bucket for ``func_id``, or every bucket if ``None``."""
+        with self._lock:
+            if func_id is None:
+                self._buckets = {}
+            else:
+                self._buckets.pop(func_id, None)
+
+    def __contains__(self, func_id: Hashable) -> bool:
+        return func_id in self._buckets
+
+    def __len__(self) -> int:
+        return len(self._buckets)
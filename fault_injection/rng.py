@@ -0,0 +1,126 @@
+"""Reproducible per-site random streams for the random fault injection helpers.
+
+Every site name owns a :class:`SiteStream`. Each thread draws from its own
+:class:`random.Random`, seeded from the master seed, the site name, the thread name and how many
+threads of that name drew from the site before, so a run can be replayed from its master seed
+and threads never share generator state.
+
+The master seed is read from the ``FAULT_INJECTION_SEED`` environment variable, or drawn
+from the OS on first use. Print :func:`get_seed` in test logs to reproduce a failing run.
+"""
+
+import hashlib
+import itertools
+import os
+import random
+import secrets
+import threading
+from typing import Dict, Iterator, Optional
+
+ENV_VAR = "FAULT_INJECTION_SEED"
+
+
+class _State:
+    __slots__ = ("seed",)
+
+    def __init__(self) -> None:
+        self.seed: Optional[int] = None
+
+
+_state = _State()
+_registry_lock = threading.Lock()
+_registry: Dict[str, "SiteStream"] = {}
+
+
+def get_seed() -> int:
+    """Return the master seed, reading ``FAULT_INJECTION_SEED`` or drawing one on first use.
+
+    Raises:
+        ValueError: If ``FAULT_INJECTION_SEED`` is set but is not an integer.
+    """
+    seed = _state.seed
+    if seed is None:
+        with _registry_lock:
+            seed = _state.seed
+            if seed is None:
+                value = os.environ.get(ENV_VAR, "").strip()
+                if value:
+                    try:
+                        seed = int(value, 0)
+                    except ValueError:
+                        raise ValueError(f"{ENV_VAR} should be an integer") from None
+                else:
+                    seed = secrets.randbits(64)
+                _state.seed = seed
+    return seed
+
+
+def set_seed(seed: int) -> None:
+    """Set the master seed and restart every site stream from it.
+
+    Args:
+        seed: New master seed.
+    """
+    with _registry_lock:
+        _state.seed = seed
+        streams = list(_registry.values())
+    for stream in streams:
+        stream.reset()
+
+
+class SiteStream:
+    """Random numbers for one site, with an independent generator per thread.
+
+    Provides the ``random()`` and ``gauss()`` methods used by the random helpers, so it can be
+    passed as their ``rng`` argument.
+
+    Args:
+        site: Stable key of the stream, usually the site name.
+    """
+
+    def __init__(self, site: str) -> None:
+        self.site = site
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Threads sharing a name, e.g. pool workers, get consecutive sequence numbers.
+        self._sequences: Dict[str, Iterator[int]] = {}
+
+    def _generator(self) -> random.Random:
+        try:
+            return self._local.generator
+        except AttributeError:
+            name = threading.current_thread().name
+            with self._lock:
+                sequence = next(self._sequences.setdefault(name, itertools.count()))
+            key = f"{get_seed()}:{self.site}:{name}:{sequence}"
+            digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+            generator = random.Random(int.from_bytes(digest, "big"))
+            self._local.generator = generator
+            return generator
+
+    def random(self) -> float:
+        """Return the next uniform sample in ``[0.0, 1.0)``."""
+        return self._generator().random()
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        """Return the next normal sample with mean ``mu`` and standard deviation ``sigma``."""
+        return self._generator().gauss(mu, sigma)
+
+    def reset(self) -> None:
+        """Restart the stream of every thread from the current master seed."""
+        with self._lock:
+            self._local = threading.local()
+            self._sequences = {}
+
+
+def site_stream(site: str) -> SiteStream:
+    """Return the stream of ``site``, creating it on first use."""
+    stream = _registry.get(site)
+    if stream is None:
+        with _registry_lock:
+            stream = _registry.get(site)
+            if stream is None:
+                stream = SiteStream(site)
+                _registry[site] = stream
+    return stream
+
@@ -0,0 +1,100 @@
+"""Pre-drawn random samples for the random fault injection helpers."""
+
+import random
+import threading
+from array import array
+from typing import Iterator, Optional, Union
+
+from .rng import SiteStream
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class BatchSampler:
+    """Source of random numbers that serves pre-drawn samples from array-backed buffers.
+
+    Provides the ``random()`` and ``gauss()`` methods used by the random helpers, so it can be
+    passed as their ``rng`` argument. Samples are drawn in bulk, vectorized with NumPy when it
+    is installed and into ``array('d')`` with :class:`random.Random` otherwise, and each call
+    pops one precomputed value. Every thread owns its own generator and buffers, so the hot
+    path takes no lock and never touches the global ``random`` state.
+
+    ``gauss(mu, sigma)`` scales pre-drawn standard normal samples, which gives the same
+    distribution as :func:`random.gauss`.
+
+    Args:
+        batch_size: Number of samples drawn per refill. Must be a positive integer.
+        seed: Optional seed. Threads derive their generators from it in the order they first
+            draw a sample.
+        use_numpy: Use NumPy for refills when available. Set to ``False`` to always use the
+            standard library.
+
+    Raises:
+        ValueError: If ``batch_size`` is not a positive integer.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 4096,
+        seed: Optional[int] = None,
+        use_numpy: bool = True,
+    ) -> None:
+        if batch_size < 1 or not isinstance(batch_size, int):
+            raise ValueError("batch_size should be a positive integer.")
+        self.batch_size = batch_size
+        self.use_numpy = use_numpy and numpy is not None
+        self._seeds = random.Random(seed)
+        self._seeds_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _thread_generator(self):
+        local = self._local
+        generator = getattr(local, "generator", None)
+        if generator is None:
+            with self._seeds_lock:
+                thread_seed = self._seeds.getrandbits(64)
+            if self.use_numpy:
+                generator = numpy.random.default_rng(thread_seed)
+            else:
+                generator = random.Random(thread_seed)
+            local.generator = generator
+        return generator
+
+    def _draw_uniform(self) -> Iterator[float]:
+        generator = self._thread_generator()
+        if self.use_numpy:
+            samples = array("d", generator.random(self.batch_size).tobytes())
+        else:
+            samples = array("d", [generator.random() for _ in range(self.batch_size)])
+        return iter(samples)
+
+    def _draw_standard_normal(self) -> Iterator[float]:
+        generator = self._thread_generator()
+        if self.use_numpy:
+            samples = array("d", generator.standard_normal(self.batch_size).tobytes())
+        else:
+            samples = array("d", [generator.gauss(0.0, 1.0) for _ in range(self.batch_size)])
+        return iter(samples)
+
+    def random(self) -> float:
+        """Return the next pre-drawn uniform sample in ``[0, 1)``."""
+        try:
+            return next(self._local.uniform)
+        except (AttributeError, StopIteration):
+            self._local.uniform = self._draw_uniform()
+            return next(self._local.uniform)
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        """Return the next pre-drawn Gaussian sample with mean ``mu`` and deviation ``sigma``."""
+        try:
+            z = next(self._local.normal)
+        except (AttributeError, StopIteration):
+            self._local.normal = self._draw_standard_normal()
+            z = next(self._local.normal)
+        return mu + sigma * z
+
+
+RandomSource = Union[random.Random, BatchSampler, SiteStream]
@@ -0,0 +1,85 @@
+"""Call-count schedules for the ``*_on_schedule`` helpers.
+
+A :class:`Schedule` is the set of 1-based call numbers ``start, start + period, ...`` up to
+``stop``. Whether a call fires is decided from the call counter alone in constant time, so one
+counter per ``func_id`` covers periodic, windowed and open-ended schedules::
+
+    schedule.at(7)             # call 7 only
+    schedule.every(500)        # calls 500, 1000, 1500, ...
+    schedule.window(1000, 1100)  # calls 1000-1100
+    schedule.first(10)         # calls 1-10
+    schedule.after(100)        # calls 101, 102, ...
+"""
+
+from typing import Optional
+
+
+class Schedule:
+    """Call numbers ``start, start + period, ...`` that are ``<= stop``.
+
+    Args:
+        start: First call that fires. Must be a positive integer.
+        stop: Last call that may fire, or ``None`` for no limit. Must be ``>= start``.
+        period: Distance between firing calls. Must be a positive integer.
+
+    Raises:
+        ValueError: If ``start`` or ``period`` is not a positive integer, or ``stop`` is
+            smaller than ``start``.
+    """
+
+    __slots__ = ("start", "stop", "period")
+
+    def __init__(self, start: int = 1, stop: Optional[int] = None, period: int = 1) -> None:
+        if start < 1 or not isinstance(start, int):
+            raise ValueError("start should be a positive integer.")
+        if stop is not None and (stop < start or not isinstance(stop, int)):
+            raise ValueError("stop should be an integer >= start.")
+        if period < 1 or not isinstance(period, int):
+            raise ValueError("period should be a positive integer.")
+        self.start = start
+        self.stop = stop
+        self.period = period
+
+    def fires(self, count: int) -> bool:
+        """Return ``True`` if the ``count``-th call is in the schedule."""
+        if count < self.start or (self.stop is not None and count > self.stop):
+            return False
+        return self.period == 1 or (count - self.start) % self.period == 0
+
+    def __repr__(self) -> str:
+        return f"Schedule(start={self.start}, stop={self.stop}, period={self.period})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Schedule):
+            return NotImplemented
+        return (self.start, self.stop, self.period) == (other.start, other.stop, other.period)
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.stop, self.period))
+
+
+def at(n: int) -> Schedule:
+    """Fire on call ``n`` only."""
+    return Schedule(n, n)
+
+
+def every(period: int, start: Optional[int] = None, stop: Optional[int] = None) -> Schedule:
+    """Fire on every ``period``-th call, from call ``start`` (default ``period``) to ``stop``."""
+    return Schedule(period if start is None else start, stop, period)
+
+
+def window(start: int, stop: int) -> Schedule:
+    """Fire on calls ``start`` to ``stop``, inclusive."""
+    return Schedule(start, stop)
+
+
+def first(k: int) -> Schedule:
+    """Fire on the first ``k`` calls."""
+    return Schedule(1, k)
+
+
+def after(n: int) -> Schedule:
+    """Fire on every call after call ``n``."""
+    if n < 0 or not isinstance(n, int):
+        raise ValueError("n should be a non-negative integer.")
+    return Schedule(n + 1)
@@ -0,0 +1,348 @@
+"""Fault injection for items flowing through sync and async iterators.
+
+Every wrapper is a lazy generator: items are pulled from the wrapped iterator one at a time and
+yielded unchanged, so nothing is buffered. Faults are injected before an item is yielded.
+Arguments are validated when the wrapper is created. As with the decorators, the iterator is
+returned unwrapped if ``disable`` is ``True`` or injection is globally disabled, and the global
+switch is also checked for every item.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Sized
+
+from .delays import _async_sleep, _sleep
+from .metrics import SiteMetrics, _optional_site_metrics
+from .raise_exception import _raise
+from .schedule import Schedule
+from .switch import _state
+
+
+def _check_time_s(time_s: float) -> None:
+    if time_s < 0:
+        raise ValueError("delay should have positive time_s")
+
+
+def _check_n(n: int) -> None:
+    if n < 1 or not isinstance(n, int):
+        raise ValueError("n should be a positive integer.")
+
+
+def _check_bytes_per_s(bytes_per_s: float) -> None:
+    if bytes_per_s <= 0:
+        raise ValueError("bytes_per_s should be positive")
+
+
+def _check_max_bytes(max_bytes: int) -> None:
+    if max_bytes < 0 or not isinstance(max_bytes, int):
+        raise ValueError("max_bytes should be a non-negative integer.")
+
+
+def delay_items(
+    iterable: Iterable[Any],
+    time_s: float = 0.1,
+    schedule: Optional[Schedule] = None,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> Iterator[Any]:
+    """Delay items of ``iterable`` by ``time_s`` before they are yielded.
+
+    Args:
+        iterable: Items to pass through.
+        time_s: Sleep duration in seconds. Must be non-negative.
+        schedule: 1-based item numbers to delay, e.g. ``schedule.every(100)``. Every item is
+            delayed if ``None``.
+        disable: If ``True``, the iterator is returned unwrapped.
+        site: Name under which items and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+    """
+    _check_time_s(time_s)
+    if disable or not _state.enabled:
+        return iter(iterable)
+    return _delay_items(iterable, time_s, schedule, _optional_site_metrics(site))
+
+
+def _delay_items(
+    iterable: Iterable[Any],
+    time_s: float,
+    schedule: Optional[Schedule],
+    metrics: Optional[SiteMetrics],
+) -> Iterator[Any]:
+    fires = None if schedule is None else schedule.fires
+    for count, item in enumerate(iterable, 1):
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            if fires is None or fires(count):
+                _sleep(time_s, metrics)
+        yield item
+
+
+def raise_at_nth_item(
+    iterable: Iterable[Any],
+    msg: str = "raise_at_nth_item exception is raised",
+    n: int = 5,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> Iterator[Any]:
+    """Yield the first ``n - 1`` items of ``iterable``, then raise ``RuntimeError``.
+
+    Args:
+        iterable: Items to pass through.
+        msg: Exception message.
+        n: 1-based item number at which to raise instead of yielding.
+        disable: If ``True``, the iterator is returned unwrapped.
+        site: Name under which items and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``n`` is not a positive integer.
+    """
+    _check_n(n)
+    if disable or not _state.enabled:
+        return iter(iterable)
+    return _raise_at_nth_item(iterable, msg, n, _optional_site_metrics(site))
+
+
+def _raise_at_nth_item(
+    iterable: Iterable[Any],
+    msg: str,
+    n: int,
+    metrics: Optional[SiteMetrics],
+) -> Iterator[Any]:
+    for count, item in enumerate(iterable, 1):
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            if count == n:
+                _raise(msg + f"\nItem {n}", metrics)
+        yield item
+
+
+def delay_bytes(
+    iterable: Iterable[Sized],
+    bytes_per_s: float = 1_000_000,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> Iterator[Any]:
+    """Throttle a stream of chunks to ``bytes_per_s``.
+
+    Each chunk is delayed by ``len(chunk) / bytes_per_s`` seconds before it is yielded, which
+    simulates a slow link or a slow producer.
+
+    Args:
+        iterable: Chunks to pass through, e.g. ``bytes`` read from a file or socket.
+        bytes_per_s: Simulated throughput. Must be positive.
+        disable: If ``True``, the iterator is returned unwrapped.
+        site: Name under which chunks and injected delays are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``bytes_per_s`` is not positive.
+    """
+    _check_bytes_per_s(bytes_per_s)
+    if disable or not _state.enabled:
+        return iter(iterable)
+    return _delay_bytes(iterable, bytes_per_s, _optional_site_metrics(site))
+
+
+def _delay_bytes(
+    iterable: Iterable[Sized],
+    bytes_per_s: float,
+    metrics: Optional[SiteMetrics],
+) -> Iterator[Any]:
+    for chunk in iterable:
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            _sleep(len(chunk) / bytes_per_s, metrics)
+        yield chunk
+
+
+def raise_after_bytes(
+    iterable: Iterable[Sized],
+    max_bytes: int = 1_000_000,
+    msg: str = "raise_after_bytes exception is raised",
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> Iterator[Any]:
+    """Pass through the first ``max_bytes`` of a stream of chunks, then raise ``RuntimeError``.
+
+    The chunk that crosses ``max_bytes`` is cut at the limit and yielded before the exception,
+    like a connection that drops mid-transfer. Chunks must support slicing.
+
+    Args:
+        iterable: Chunks to pass through, e.g. ``bytes`` read from a file or socket.
+        max_bytes: Number of bytes delivered before the failure. Must be a non-negative integer.
+        msg: Exception message.
+        disable: If ``True``, the iterator is returned unwrapped.
+        site: Name under which chunks and injected exceptions are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If ``max_bytes`` is not a non-negative integer.
+    """
+    _check_max_bytes(max_bytes)
+    if disable or not _state.enabled:
+        return iter(iterable)
+    return _raise_after_bytes(iterable, max_bytes, msg, _optional_site_metrics(site))
+
+
+def _raise_after_bytes(
+    iterable: Iterable[Sized],
+    max_bytes: int,
+    msg: str,
+    metrics: Optional[SiteMetrics],
+) -> Iterator[Any]:
+    remaining = max_bytes
+    for chunk in iterable:
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            size = len(chunk)
+            if size > remaining:
+                if remaining:
+                    yield chunk[:remaining]
+                _raise(msg + f"\nAfter {max_bytes} bytes", metrics)
+            remaining -= size
+        yield chunk
+
+
+def delay_items_async(
+    iterable: AsyncIterable[Any],
+    time_s: float = 0.1,
+    schedule: Optional[Schedule] = None,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`delay_items`; delays suspend only the consuming task.
+
+    Raises:
+        ValueError: If ``time_s`` is negative.
+    """
+    _check_time_s(time_s)
+    if disable or not _state.enabled:
+        return iterable.__aiter__()
+    return _delay_items_async(iterable, time_s, schedule, _optional_site_metrics(site))
+
+
+async def _delay_items_async(
+    iterable: AsyncIterable[Any],
+    time_s: float,
+    schedule: Optional[Schedule],
+    metrics: Optional[SiteMetrics],
+) -> AsyncIterator[Any]:
+    fires = None if schedule is None else schedule.fires
+    count = 0
+    async for item in iterable:
+        count += 1
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            if fires is None or fires(count):
+                await _async_sleep(time_s, metrics)
+        yield item
+
+
+def raise_at_nth_item_async(
+    iterable: AsyncIterable[Any],
+    msg: str = "raise_at_nth_item exception is raised",
+    n: int = 5,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`raise_at_nth_item`.
+
+    Raises:
+        ValueError: If ``n`` is not a positive integer.
+    """
+    _check_n(n)
+    if disable or not _state.enabled:
+        return iterable.__aiter__()
+    return _raise_at_nth_item_async(iterable, msg, n, _optional_site_metrics(site))
+
+
+async def _raise_at_nth_item_async(
+    iterable: AsyncIterable[Any],
+    msg: str,
+    n: int,
+    metrics: Optional[SiteMetrics],
+) -> AsyncIterator[Any]:
+    count = 0
+    async for item in iterable:
+        count += 1
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            if count == n:
+                _raise(msg + f"\nItem {n}", metrics)
+        yield item
+
+
+def delay_bytes_async(
+    iterable: AsyncIterable[Sized],
+    bytes_per_s: float = 1_000_000,
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`delay_bytes`; delays suspend only the consuming task.
+
+    Raises:
+        ValueError: If ``bytes_per_s`` is not positive.
+    """
+    _check_bytes_per_s(bytes_per_s)
+    if disable or not _state.enabled:
+        return iterable.__aiter__()
+    return _delay_bytes_async(iterable, bytes_per_s, _optional_site_metrics(site))
+
+
+async def _delay_bytes_async(
+    iterable: AsyncIterable[Sized],
+    bytes_per_s: float,
+    metrics: Optional[SiteMetrics],
+) -> AsyncIterator[Any]:
+    async for chunk in iterable:
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            await _async_sleep(len(chunk) / bytes_per_s, metrics)
+        yield chunk
+
+
+def raise_after_bytes_async(
+    iterable: AsyncIterable[Sized],
+    max_bytes: int = 1_000_000,
+    msg: str = "raise_after_bytes exception is raised",
+    disable: bool = False,
+    site: Optional[str] = None,
+) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`raise_after_bytes`.
+
+    Raises:
+        ValueError: If ``max_bytes`` is not a non-negative integer.
+    """
+    _check_max_bytes(max_bytes)
+    if disable or not _state.enabled:
+        return iterable.__aiter__()
+    return _raise_after_bytes_async(iterable, max_bytes, msg, _optional_site_metrics(site))
+
+
+async def _raise_after_bytes_async(
+    iterable: AsyncIterable[Sized],
+    max_bytes: int,
+    msg: str,
+    metrics: Optional[SiteMetrics],
+) -> AsyncIterator[Any]:
+    remaining = max_bytes
+    async for chunk in iterable:
+        if _state.enabled:
+            if metrics is not None:
+                metrics.record_call()
+            size = len(chunk)
+            if size > remaining:
+                if remaining:
+                    yield chunk[:remaining]
+                _raise(msg + f"\nAfter {max_bytes} bytes", metrics)
+            remaining -= size
+        yield chunk
@@ -0,0 +1,64 @@
+"""Process-wide switch that turns every fault injection helper into a pass-through."""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+ENV_VAR = "FAULT_INJECTION_ENABLED"
+_FALSE_VALUES = ("0", "false", "no", "off")
+
+
+class _State:
+    """Mutable holder read by wrappers on every call."""
+
+    __slots__ = ("enabled",)
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+
+
+_state = _State(os.environ.get(ENV_VAR, "1").strip().lower() not in _FALSE_VALUES)
+
+
+def is_enabled() -> bool:
+    """Return ``True`` if fault injection is globally enabled."""
+    return _state.enabled
+
+
+def enable() -> None:
+    """Globally enable fault injection.
+
+    Only wrappers created while injection was enabled, and inline helpers, start injecting
+    again. Functions decorated while it was off, e.g. modules imported with
+    ``FAULT_INJECTION_ENABLED=0``, were returned undecorated and stay fault free.
+    """
+    _state.enabled = True
+
+
+def disable() -> None:
+    """Globally disable fault injection.
+
+    Decorators applied while disabled return the original function untouched, so they add no
+    per-call cost. Wrappers created earlier stop injecting faults until :func:`enable` is
+    called again.
+    """
+    _state.enabled = False
+
+
+@contextmanager
+def enabled(flag: bool = True) -> Iterator[None]:
+    """Temporarily set the global switch to ``flag`` and restore the previous value on exit.
+
+    The switch is checked when a decorator is applied and on every call of the wrapper. So
+    ``enabled(True)`` does not add faults to functions decorated while injection was off; apply
+    the decorators, or import the modules that use them, with injection enabled.
+
+    Args:
+        flag: Value of the switch inside the ``with`` block.
+    """
+    previous = _state.enabled
+    _state.enabled = flag
+    try:
+        yield
+    finally:
+        _state.enabled = previous
@@ -0,0 +1,262 @@
+"""Bandwidth throttling, short reads and mid-transfer failures for file and socket objects.
+
+The wrappers pass ``memoryview`` slices of the caller's buffer straight to the wrapped object's
+``readinto``/``recv_into``/``write``/``send``, so throttling adds no copies. Throughput is paced
+against the cumulative byte count since the first transfer, with sleeps going through the delay
+helpers' sleep, so :mod:`~fault_injection.clock` virtual time, precision mode and metrics apply.
+Injected failures raise ``RuntimeError`` like the other helpers.
+"""
+
+import io
+from typing import Any, Optional
+
+from . import clock
+from .delays import _sleep
+from .metrics import SiteMetrics, _optional_site_metrics
+from .raise_exception import _raise
+from .switch import _state
+
+
+class _Limiter:
+    """Byte budget and pacing shared by the wrappers."""
+
+    def __init__(
+        self,
+        bytes_per_s: Optional[float],
+        max_chunk: Optional[int],
+        fail_after_bytes: Optional[int],
+        msg: str,
+        metrics: Optional[SiteMetrics],
+    ) -> None:
+        if bytes_per_s is not None and bytes_per_s <= 0:
+            raise ValueError("bytes_per_s should be positive or None")
+        if max_chunk is not None and (max_chunk < 1 or not isinstance(max_chunk, int)):
+            raise ValueError("max_chunk should be a positive integer or None.")
+        if fail_after_bytes is not None and (
+            fail_after_bytes < 0 or not isinstance(fail_after_bytes, int)
+        ):
+            raise ValueError("fail_after_bytes should be a non-negative integer or None.")
+        self.bytes_per_s = bytes_per_s
+        self.max_chunk = max_chunk
+        self.fail_after_bytes = fail_after_bytes
+        self.msg = msg
+        self.metrics = metrics
+        self.transferred = 0
+        self._start_s: Optional[float] = None
+
+    def allow(self, requested: int) -> int:
+        """Return how many of ``requested`` bytes the next transfer may move."""
+        if self.metrics is not None:
+            self.metrics.record_call()
+        limit = requested
+        if self.max_chunk is not None:
+            limit = min(limit, self.max_chunk)
+        if self.fail_after_bytes is not None and requested:
+            remaining = self.fail_after_bytes - self.transferred
+            if remaining <= 0:
+                _raise(self.msg + f"\nAfter {self.fail_after_bytes} bytes", self.metrics)
+            limit = min(limit, remaining)
+        if self._start_s is None:
+            self._start_s = clock.monotonic()
+        return limit
+
+    def consumed(self, count: int) -> None:
+        """Account for ``count`` transferred bytes and sleep to keep to ``bytes_per_s``."""
+        self.transferred += count
+        if self.bytes_per_s is not None and count:
+            now = clock.monotonic()
+            wait_s = self._start_s + self.transferred / self.bytes_per_s - now
+            if wait_s > 0:
+                _sleep(wait_s, self.metrics)
+            elif wait_s < -(self.max_chunk or count) / self.bytes_per_s:
+                # Idle time earns at most one chunk of credit, so a slow consumer cannot
+                # burst through the limit afterwards.
+                self._start_s = now - self.transferred / self.bytes_per_s
+
+
+class ThrottledReader(io.RawIOBase):
+    """Readable raw stream over a binary file-like object with injected faults.
+
+    Wrap it in :class:`io.BufferedReader` for ``readline`` and buffered reads. Reads into a
+    caller buffer with :meth:`readinto` do not copy when the wrapped object has ``readinto``.
+
+    Args:
+        raw: Binary file-like object to read from.
+        bytes_per_s: Maximum throughput, or ``None`` for no limit.
+        max_chunk: Maximum bytes returned per read, which injects short reads, or ``None``.
+        fail_after_bytes: Number of bytes delivered before reads raise ``RuntimeError``, or
+            ``None`` to never fail.
+        msg: Exception message of the injected failure.
+        site: Name under which reads and injected faults are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If a limit is not positive (``fail_after_bytes`` may be ``0``).
+    """
+
+    def __init__(
+        self,
+        raw: Any,
+        bytes_per_s: Optional[float] = None,
+        max_chunk: Optional[int] = None,
+        fail_after_bytes: Optional[int] = None,
+        msg: str = "ThrottledReader exception is raised",
+        site: Optional[str] = None,
+    ) -> None:
+        super().__init__()
+        self.raw = raw
+        self._limiter = _Limiter(
+            bytes_per_s, max_chunk, fail_after_bytes, msg, _optional_site_metrics(site)
+        )
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> Optional[int]:
+        view = memoryview(buffer).cast("B")
+        if not _state.enabled:
+            return _readinto(self.raw, view)
+        count = _readinto(self.raw, view[:self._limiter.allow(len(view))])
+        if count:
+            self._limiter.consumed(count)
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            super().close()
+            self.raw.close()
+
+
+class ThrottledWriter(io.RawIOBase):
+    """Writable raw stream over a binary file-like object with injected faults.
+
+    Writes may be short, as allowed for raw streams; wrap it in :class:`io.BufferedWriter` to
+    write everything.
+
+    Args:
+        raw: Binary file-like object to write to.
+        bytes_per_s: Maximum throughput, or ``None`` for no limit.
+        max_chunk: Maximum bytes accepted per write, which injects short writes, or ``None``.
+        fail_after_bytes: Number of bytes accepted before writes raise ``RuntimeError``, or
+            ``None`` to never fail.
+        msg: Exception message of the injected failure.
+        site: Name under which writes and injected faults are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If a limit is not positive (``fail_after_bytes`` may be ``0``).
+    """
+
+    def __init__(
+        self,
+        raw: Any,
+        bytes_per_s: Optional[float] = None,
+        max_chunk: Optional[int] = None,
+        fail_after_bytes: Optional[int] = None,
+        msg: str = "ThrottledWriter exception is raised",
+        site: Optional[str] = None,
+    ) -> None:
+        super().__init__()
+        self.raw = raw
+        self._limiter = _Limiter(
+            bytes_per_s, max_chunk, fail_after_bytes, msg, _optional_site_metrics(site)
+        )
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> Optional[int]:
+        view = memoryview(data).cast("B")
+        if not _state.enabled:
+            return self.raw.write(view)
+        count = self.raw.write(view[:self._limiter.allow(len(view))])
+        if count:
+            self._limiter.consumed(count)
+        return count
+
+    def flush(self) -> None:
+        super().flush()
+        self.raw.flush()
+
+    def close(self) -> None:
+        if not self.closed:
+            super().close()
+            self.raw.close()
+
+
+class ThrottledSocket:
+    """Socket-like wrapper with throttled, short or failing ``recv``/``send`` calls.
+
+    Attributes not overridden here are forwarded to the wrapped socket.
+
+    Args:
+        sock: Socket-like object.
+        bytes_per_s: Maximum throughput in each direction, or ``None`` for no limit.
+        max_chunk: Maximum bytes per ``recv``/``send`` call, or ``None``.
+        fail_after_bytes: Number of bytes received, and separately sent, before the
+            corresponding calls raise ``RuntimeError``, or ``None`` to never fail.
+        msg: Exception message of the injected failure.
+        site: Name under which calls and injected faults are recorded in
+            :mod:`fault_injection.metrics`. Nothing is recorded if ``None``.
+
+    Raises:
+        ValueError: If a limit is not positive (``fail_after_bytes`` may be ``0``).
+    """
+
+    def __init__(
+        self,
+        sock: Any,
+        bytes_per_s: Optional[float] = None,
+        max_chunk: Optional[int] = None,
+        fail_after_bytes: Optional[int] = None,
+        msg: str = "ThrottledSocket exception is raised",
+        site: Optional[str] = None,
+    ) -> None:
+        metrics = _optional_site_metrics(site)
+        self.sock = sock
+        self._recv = _Limiter(bytes_per_s, max_chunk, fail_after_bytes, msg, metrics)
+        self._send = _Limiter(bytes_per_s, max_chunk, fail_after_bytes, msg, metrics)
+
+    def recv_into(self, buffer: Any, nbytes: int = 0, flags: int = 0) -> int:
+        view = memoryview(buffer).cast("B")
+        size = nbytes or len(view)
+        if not _state.enabled:
+            return self.sock.recv_into(view, size, flags)
+        limit = self._recv.allow(size)
+        count = self.sock.recv_into(view[:limit], limit, flags)
+        self._recv.consumed(count)
+        return count
+
+    def recv(self, bufsize: int, flags: int = 0) -> bytes:
+        if not _state.enabled:
+            return self.sock.recv(bufsize, flags)
+        data = self.sock.recv(self._recv.allow(bufsize), flags)
+        self._recv.consumed(len(data))
+        return data
+
+    def send(self, data: Any, flags: int = 0) -> int:
+        view = memoryview(data).cast("B")
+        if not _state.enabled:
+            return self.sock.send(view, flags)
+        count = self.sock.send(view[:self._send.allow(len(view))], flags)
+        self._send.consumed(count)
+        return count
+
+    def sendall(self, data: Any, flags: int = 0) -> None:
+        view = memoryview(data).cast("B")
+        while view:
+            view = view[self.send(view, flags):]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.sock, name)
+
+
+def _readinto(raw: Any, view: memoryview) -> Optional[int]:
+    readinto = getattr(raw, "readinto", None)
+    if readinto is not None:
+        return readinto(view)
+    data = raw.read(len(view))
+    if data is None:
+        return None
+    view[:len(data)] = data
+    return len(data)
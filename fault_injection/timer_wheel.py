@@ -0,0 +1,176 @@
+"""Hashed timer wheel backend for async injected delays.
+
+With thousands of concurrently delayed tasks, one ``asyncio.sleep`` per task puts one timer
+handle per task on the event loop's heap. In timer-wheel mode the async delay helpers instead
+append the sleeper to a slot of a per-loop wheel in O(1), and a single loop timer advances the
+wheel once per tick and wakes every sleeper whose deadline has passed. Deadlines are rounded up
+to the tick, so delays are never shorter than requested and at most one tick longer.
+
+Sync helpers are not affected.
+"""
+
+import asyncio
+import math
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+
+class TimerWheel:
+    """Hashed timer wheel driving the sleepers of one event loop.
+
+    Args:
+        loop: Event loop whose clock and timers the wheel uses.
+        tick_s: Tick resolution in seconds. Must be positive.
+        slots: Number of slots. Deadlines more than ``slots`` ticks away share a slot with
+            nearer ones and are skipped until their round comes. Must be a positive integer.
+
+    Raises:
+        ValueError: If ``tick_s`` is not positive or ``slots`` is not a positive integer.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        tick_s: float = 0.001,
+        slots: int = 512,
+    ) -> None:
+        _validate(tick_s, slots)
+        self.tick_s = tick_s
+        self.slots = slots
+        self._loop = loop
+        self._origin = loop.time()
+        self._tick = 0
+        self._buckets: List[List[Tuple[int, asyncio.Future]]] = [[] for _ in range(slots)]
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.pending = 0
+
+    def sleep(self, seconds: float) -> "asyncio.Future[None]":
+        """Return a future that completes ``seconds`` from now, rounded up to the next tick.
+
+        Must be called from the wheel's event loop.
+        """
+        future = self._loop.create_future()
+        deadline = math.ceil((self._loop.time() - self._origin + seconds) / self.tick_s)
+        deadline = max(deadline, self._tick + 1)
+        self._buckets[deadline % self.slots].append((deadline, future))
+        self.pending += 1
+        if self._handle is None:
+            self._schedule()
+        return future
+
+    def _schedule(self) -> None:
+        when = self._origin + (self._tick + 1) * self.tick_s
+        self._handle = self._loop.call_at(when, self._advance)
+
+    def _advance(self) -> None:
+        self._handle = None
+        elapsed = int((self._loop.time() - self._origin) / self.tick_s)
+        # The loop may run a timer up to its clock resolution early; the tick is still due.
+        now = max(elapsed, self._tick + 1)
+        for tick in range(self._tick + 1, min(now, self._tick + self.slots) + 1):
+            index = tick % self.slots
+            bucket = self._buckets[index]
+            if not bucket:
+                continue
+            waiting = []
+            for entry in bucket:
+                if entry[0] > now:
+                    waiting.append(entry)
+                    continue
+                future = entry[1]
+                if not future.done():
+                    future.set_result(None)
+            self.pending -= len(bucket) - len(waiting)
+            self._buckets[index] = waiting
+        self._tick = now
+        if self.pending:
+            self._schedule()
+
+
+def _validate(tick_s: float, slots: int) -> None:
+    if tick_s <= 0:
+        raise ValueError("tick_s should be positive")
+    if slots < 1 or not isinstance(slots, int):
+        raise ValueError("slots should be a positive integer.")
+
+
+class _State:
+    __slots__ = ("enabled", "tick_s", "slots")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.tick_s = 0.001
+        self.slots = 512
+
+
+_state = _State()
+_lock = threading.Lock()
+_wheels: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, TimerWheel]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def wheel(loop: Optional[asyncio.AbstractEventLoop] = None) -> TimerWheel:
+    """Return the wheel of ``loop`` (the running loop by default) for the current settings."""
+    if loop is None:
+        loop = asyncio.get_running_loop()
+    current = _wheels.get(loop)
+    if current is None or (current.tick_s, current.slots) != (_state.tick_s, _state.slots):
+        with _lock:
+            current = _wheels.get(loop)
+            if current is None or (current.tick_s, current.slots) != (_state.tick_s, _state.slots):
+                # A replaced wheel keeps driving its own sleepers until they are woken.
+                current = _wheels[loop] = TimerWheel(loop, _state.tick_s, _state.slots)
+    return current
+
+
+async def sleep_async(seconds: float) -> None:
+    """Suspend the awaiting task for ``seconds`` on the running loop's timer wheel."""
+    if seconds <= 0:
+        await asyncio.sleep(0)
+        return
+    await wheel().sleep(seconds)
+
+
+def is_enabled() -> bool:
+    """Return ``True`` if the async delay helpers sleep on the timer wheel."""
+    return _state.enabled
+
+
+def enable(tick_s: float = 0.001, slots: int = 512) -> None:
+    """Make the async delay helpers sleep on a per-loop timer wheel.
+
+    Args:
+        tick_s: Tick resolution in seconds. Injected delays are rounded up to it.
+        slots: Number of wheel slots. ``tick_s * slots`` should cover the usual delay, so most
+            slots hold sleepers of a single round.
+
+    Raises:
+        ValueError: If ``tick_s`` is not positive or ``slots`` is not a positive integer.
+    """
+    _validate(tick_s, slots)
+    _state.tick_s = tick_s
+    _state.slots = slots
+    _state.enabled = True
+
+
+def disable() -> None:
+    """Make the async delay helpers use ``asyncio.sleep`` again."""
+    _state.enabled = False
+
+
+@contextmanager
+def enabled(flag: bool = True) -> Iterator[None]:
+    """Temporarily set timer-wheel mode to ``flag`` and restore the previous value on exit.
+
+    Args:
+        flag: Value of timer-wheel mode inside the ``with`` block.
+    """
+    previous = _state.enabled
+    _state.enabled = flag
+    try:
+        yield
+    finally:
+        _state.enabled = previous
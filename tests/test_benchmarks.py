@@ -0,0 +1,41 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from benchmarks import overhead
+
+
+class TestOverheadBenchmark(unittest.TestCase):
+    def test_every_public_injecting_api_has_a_case(self):
+        self.assertEqual(set(overhead.public_injecting_apis()) - set(overhead.CASES), set())
+
+    def test_run_writes_machine_readable_results(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "results.json")
+            with redirect_stdout(io.StringIO()):
+                overhead.main([
+                    "--calls", "64",
+                    "--threads", "2",
+                    "--tasks", "2",
+                    "--api", "raise_random",
+                    "--api", "delay_inline_async",
+                    "--output", path,
+                ])
+            with open(path) as file:
+                report = json.load(file)
+
+        rows = {(row["api"], row["state"], row["load"]) for row in report["results"]}
+        self.assertIn(("raise_random", "fired", "single_thread"), rows)
+        self.assertIn(("raise_random", "not_triggered", "multi_thread"), rows)
+        self.assertIn(("raise_random", "disabled", "asyncio"), rows)
+        self.assertIn(("delay_inline_async", "fired", "asyncio"), rows)
+        self.assertNotIn(("delay_inline_async", "fired", "single_thread"), rows)
+        for row in report["results"]:
+            self.assertIn("overhead_ns", row)
+
+
+if __name__ == "__main__":
+    unittest.main()
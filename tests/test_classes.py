@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import raise_at_nth_call_inline
+from fault_injection.classes import FaultPolicy, inject_methods
+
+
+def make_client():
+    class Base:
+        def inherited(self):
+            return "inherited"
+
+    class Client(Base):
+        def get(self):
+            return "get"
+
+        def put(self, value):
+            return value
+
+        async def fetch(self):
+            return "fetch"
+
+        @staticmethod
+        def version():
+            return 1
+
+        @classmethod
+        def build(cls):
+            return cls()
+
+        @property
+        def name(self):
+            return "client"
+
+        def _private(self):
+            return "private"
+
+        def __repr__(self):
+            return "Client()"
+
+    return Client
+
+
+class TestInjectMethods(unittest.TestCase):
+    def setUp(self):
+        raise_at_nth_call_inline.counters.reset()
+
+    def test_all_kinds_share_one_counter(self):
+        Client = inject_methods("raise_at_nth_call", n=5, msg="fifth")(make_client())
+        client = Client()
+        self.assertEqual(client.get(), "get")
+        self.assertEqual(client.put(2), 2)
+        self.assertEqual(Client.version(), 1)
+        self.assertIsInstance(Client.build(), Client)  # fourth call
+        with self.assertRaisesRegex(RuntimeError, "fifth"):
+            client.name
+
+    def test_private_special_and_inherited_methods_are_skipped_by_default(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            Client = inject_methods("delay", time_s=0.1)(make_client())
+            client = Client()
+            self.assertEqual(client._private(), "private")
+            self.assertEqual(repr(client), "Client()")
+            self.assertEqual(client.inherited(), "inherited")
+            sleep.assert_not_called()
+            client.get()
+        sleep.assert_called_once_with(0.1)
+
+    def test_include_exclude_and_inherited(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            Client = inject_methods("delay", include=["get", "inh*"], exclude=(), inherited=True,
+                                    time_s=0.1)(make_client())
+            client = Client()
+            client.get()
+            client.put(1)
+            client.inherited()
+        self.assertEqual(sleep.call_count, 2)
+        self.assertIn("inherited", vars(Client))
+
+    def test_policy_object_is_compiled_per_class(self):
+        policy = FaultPolicy("raise_at_nth_call", n=2)
+        First = inject_methods(policy)(make_client())
+        Second = inject_methods(policy)(make_client())
+        self.assertEqual(First.__qualname__, Second.__qualname__)
+        First().get()
+        Second().get()
+        with self.assertRaises(RuntimeError):
+            First().get()
+        with self.assertRaises(RuntimeError):
+            Second().get()
+        self.assertNotIn(f"class:{First.__module__}.{First.__qualname__}",
+                         raise_at_nth_call_inline.counters)
+        self.assertIn("FaultPolicy('raise_at_nth_call', n=2)", repr(policy))
+
+    def test_disable_returns_class_unchanged(self):
+        Client = make_client()
+        get = Client.get
+        self.assertIs(inject_methods("raise", disable=True)(Client), Client)
+        self.assertIs(Client.get, get)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            FaultPolicy("explode")
+        with self.assertRaises(ValueError):
+            FaultPolicy("raise_random", prob_of_raise=2)
+        with self.assertRaises(ValueError):
+            inject_methods(FaultPolicy("raise"), msg="no")
+
+
+class TestInjectAsyncMethods(unittest.IsolatedAsyncioTestCase):
+    async def test_async_methods_await_the_async_helper(self):
+        Client = inject_methods("delay", time_s=0.2)(make_client())
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await Client().fetch(), "fetch")
+        sleep.assert_awaited_once_with(0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from fault_injection import (
+    delay,
+    delay_at_nth_call,
+    delay_inline_async,
+    delay_random_norm,
+    metrics,
+)
+from fault_injection import clock
+from fault_injection.clock import VirtualClock, virtual_time
+
+
+class TestVirtualClock(unittest.TestCase):
+    def test_sleep_advances_without_blocking(self):
+        virtual = VirtualClock(start_s=10)
+        start = time.monotonic()
+        virtual.sleep(3600)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(virtual.monotonic(), 3610)
+        self.assertEqual(virtual.monotonic_ns(), 3610 * 10**9)
+
+    def test_advance_validation(self):
+        with self.assertRaises(ValueError):
+            VirtualClock().advance(-1)
+
+    def test_virtual_time_restores_previous_clock(self):
+        self.assertIsNone(clock.current())
+        with virtual_time() as outer:
+            with virtual_time(5) as inner:
+                self.assertIs(clock.current(), inner)
+                self.assertEqual(clock.monotonic(), 5)
+            self.assertIs(clock.current(), outer)
+        self.assertIsNone(clock.current())
+
+    def test_module_functions_use_real_time_outside_virtual_time(self):
+        with patch("fault_injection.clock.time.sleep") as sleep:
+            clock.sleep(0.5)
+        sleep.assert_called_once_with(0.5)
+        self.assertAlmostEqual(clock.monotonic(), time.monotonic(), delta=1)
+
+
+class TestSyncDelaysInVirtualTime(unittest.TestCase):
+    def test_delays_advance_clock_instead_of_sleeping(self):
+        @delay(time_s=600)
+        def slow():
+            return clock.monotonic()
+
+        @delay_at_nth_call(time_s=60, n=2, func_id=None)
+        def second_call_slow():
+            return clock.monotonic()
+
+        with virtual_time() as virtual, patch("fault_injection.delays.time.sleep") as sleep:
+            self.assertEqual(slow(), 600)
+            self.assertEqual(second_call_slow(), 600)
+            self.assertEqual(second_call_slow(), 660)
+            self.assertEqual(virtual.monotonic(), 660)
+        sleep.assert_not_called()
+
+    def test_timeout_logic_sees_virtual_time(self):
+        @delay_random_norm(mean_time_s=2, std_time_s=0.5, site="virtual")
+        def call():
+            return "ok"
+
+        metrics.site_metrics("virtual").reset()
+        with virtual_time():
+            deadline = clock.monotonic() + 30
+            calls = 0
+            while clock.monotonic() < deadline:
+                call()
+                calls += 1
+        snapshot = metrics.site_metrics("virtual").snapshot()
+        self.assertEqual(snapshot["sleeps"], calls)
+        self.assertGreaterEqual(snapshot["sleep_total_s"], 30)
+
+
+class TestEventLoopInVirtualTime(unittest.TestCase):
+    def test_loop_started_inside_virtual_time_is_driven(self):
+        async def main():
+            await delay_inline_async(0)
+            await asyncio.sleep(30)
+
+        with virtual_time() as virtual:
+            start = time.monotonic()
+            asyncio.run(main())
+            self.assertAlmostEqual(virtual.monotonic(), 30, delta=1e-6)
+            self.assertLess(time.monotonic() - start, 1)
+
+
+class TestAsyncDelaysInVirtualTime(unittest.IsolatedAsyncioTestCase):
+    async def test_tasks_wake_in_deadline_order(self):
+        woken = []
+
+        async def sleeper(name, seconds):
+            await delay_inline_async(seconds)
+            woken.append((name, clock.monotonic()))
+
+        with virtual_time() as virtual, \
+                patch("fault_injection.delays.asyncio.sleep") as sleep:
+            await asyncio.gather(sleeper("slow", 5), sleeper("fast", 1), sleeper("mid", 3))
+            self.assertEqual(woken, [("fast", 1), ("mid", 3), ("slow", 5)])
+            self.assertEqual(virtual.monotonic(), 5)
+        sleep.assert_not_called()
+
+    async def test_sleep_chains_interleave(self):
+        events = []
+
+        async def ticker(name, period, ticks):
+            for _ in range(ticks):
+                await clock.sleep_async(period)
+                events.append((clock.monotonic(), name))
+
+        with virtual_time():
+            await asyncio.gather(ticker("a", 2, 3), ticker("b", 3, 2))
+        # Equal deadlines wake in the order the sleeps started, as with asyncio timers.
+        self.assertEqual(events, [(2, "a"), (3, "b"), (4, "a"), (6, "b"), (6, "a")])
+
+    async def test_wait_for_timeout_in_virtual_time(self):
+        async def backend():
+            await delay_inline_async(10)
+            return "late"
+
+        async def with_deadline(timeout_s):
+            task = asyncio.ensure_future(backend())
+            await clock.sleep_async(timeout_s)
+            if not task.done():
+                task.cancel()
+                return "timeout"
+            return task.result()
+
+        with virtual_time():
+            self.assertEqual(await with_deadline(2), "timeout")
+            self.assertEqual(clock.monotonic(), 2)
+
+    async def test_asyncio_wait_for_times_out_on_injected_delay(self):
+        @delay(time_s=5.0)
+        async def slow():
+            return "ok"
+
+        with virtual_time() as virtual:
+            start = time.monotonic()
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(slow(), timeout=1.0)
+            self.assertAlmostEqual(virtual.monotonic(), 1.0, delta=1e-6)
+            self.assertEqual(await asyncio.wait_for(slow(), timeout=10.0), "ok")
+            self.assertAlmostEqual(virtual.monotonic(), 6.0, delta=1e-6)
+            await asyncio.sleep(3600)
+            self.assertLess(time.monotonic() - start, 1)
+        loop = asyncio.get_running_loop()
+        self.assertNotIn("time", vars(loop))
+        self.assertAlmostEqual(loop.time(), time.monotonic(), delta=1)
+
+    async def test_idle_loop_polls_once_per_wake_instead_of_spinning(self):
+        with virtual_time() as virtual:
+            selector = asyncio.get_running_loop()._selector
+            with patch.object(selector, "_selector", wraps=selector._selector) as inner:
+                await asyncio.gather(*(virtual.sleep_async(i) for i in range(1, 101)))
+            self.assertEqual(virtual.monotonic(), 100)
+            self.assertLess(inner.select.call_count, 300)
+
+    async def test_unsupported_loop_or_inactive_clock_raises(self):
+        with self.assertRaisesRegex(RuntimeError, "virtual_time"):
+            await VirtualClock().sleep_async(1)
+        with patch("fault_injection.clock.BaseSelectorEventLoop", type("Other", (), {})), \
+                virtual_time() as virtual:
+            with self.assertRaisesRegex(RuntimeError, "selector event loop"):
+                await virtual.sleep_async(1)
+
+    async def test_cancelled_sleeper_is_skipped(self):
+        with virtual_time() as virtual:
+            task = asyncio.ensure_future(virtual.sleep_async(100))
+            await asyncio.sleep(0)
+            task.cancel()
+            await virtual.sleep_async(1)
+            self.assertEqual(virtual.monotonic(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,326 @@
+import gc
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+from fault_injection import delay_at_nth_call, raise_at_nth_call, raise_at_nth_call_inline
+from fault_injection.counters import AtomicCounter, CounterStore, SharedCounterStore, fcntl
+
+N_THREADS = 64
+CALLS_PER_THREAD = 200
+N_PROCESSES = 8
+CALLS_PER_PROCESS = 250
+
+
+def run_in_threads(target):
+    barrier = threading.Barrier(N_THREADS)
+
+    def worker():
+        barrier.wait()
+        for _ in range(CALLS_PER_THREAD):
+            target()
+
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(N_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+
+def _count_raises_in_worker(path):
+    store = SharedCounterStore(path)
+
+    @raise_at_nth_call(n=N_PROCESSES * CALLS_PER_PROCESS // 2, func_id="payment", counters=store)
+    def pay():
+        return None
+
+    raised = 0
+    for _ in range(CALLS_PER_PROCESS):
+        try:
+            pay()
+        except RuntimeError:
+            raised += 1
+    store.close()
+    return raised
+
+
+class TestAtomicCounter(unittest.TestCase):
+    def test_increment_returns_new_value(self):
+        counter = AtomicCounter()
+        self.assertEqual(counter.increment(), 1)
+        self.assertEqual(counter.increment(), 2)
+        self.assertEqual(counter.value, 2)
+
+    def test_reset(self):
+        counter = AtomicCounter()
+        counter.increment()
+        counter.reset()
+        self.assertEqual(counter.value, 0)
+
+    def test_concurrent_increments_return_distinct_values(self):
+        counter = AtomicCounter()
+        seen = []
+        run_in_threads(lambda: seen.append(counter.increment()))
+        total = N_THREADS * CALLS_PER_THREAD
+        self.assertEqual(counter.value, total)
+        self.assertEqual(sorted(seen), list(range(1, total + 1)))
+
+
+class TestCounterStore(unittest.TestCase):
+    def test_get_returns_same_counter_for_same_func_id(self):
+        store = CounterStore()
+        self.assertIs(store.get("a"), store.get("a"))
+        self.assertIsNot(store.get("a"), store.get("b"))
+
+    def test_value_does_not_create_counter(self):
+        store = CounterStore()
+        self.assertEqual(store.value("missing"), 0)
+        self.assertNotIn("missing", store)
+
+    def test_reset_drops_counters(self):
+        store = CounterStore()
+        store.increment("a")
+        store.reset()
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.increment("a"), 1)
+
+    def test_concurrent_first_use_creates_single_counter(self):
+        store = CounterStore()
+        run_in_threads(lambda: store.increment("shared"))
+        self.assertEqual(store.value("shared"), N_THREADS * CALLS_PER_THREAD)
+
+
+class TestBoundedCounterStore(unittest.TestCase):
+    def test_rejects_invalid_max_size(self):
+        for invalid_max_size in (0, -1, 1.5):
+            with self.subTest(invalid_max_size=invalid_max_size):
+                with self.assertRaisesRegex(ValueError, "max_size should be a positive integer"):
+                    CounterStore(max_size=invalid_max_size)
+
+    def test_evicts_least_recently_used_counter(self):
+        store = CounterStore(max_size=2)
+        store.increment("a")
+        store.increment("b")
+        store.increment("a")
+        store.increment("c")
+        self.assertEqual(len(store), 2)
+        self.assertIn("a", store)
+        self.assertNotIn("b", store)
+        self.assertEqual(store.value("a"), 2)
+
+    def test_dynamic_func_ids_stay_bounded(self):
+        store = CounterStore(max_size=100)
+        for func_id in range(10_000):
+            store.increment(("tenant", func_id))
+        self.assertEqual(len(store), 100)
+
+    def test_snapshot_and_reset_single_counter(self):
+        store = CounterStore()
+        store.increment("a")
+        store.increment("a")
+        store.increment("b")
+        self.assertEqual(store.snapshot(), {"a": 2, "b": 1})
+        store.reset("a")
+        self.assertEqual(store.snapshot(), {"b": 1})
+
+    def test_function_counter_is_released_with_function(self):
+        store = CounterStore()
+
+        def make():
+            def work():
+                return None
+            store.function_counter(work).increment()
+            return work
+
+        work = make()
+        self.assertEqual(store.snapshot(), {work: 1})
+        del work
+        gc.collect()
+        self.assertEqual(len(store), 0)
+
+    def test_reset_zeroes_function_counters(self):
+        store = CounterStore()
+
+        def work():
+            return None
+
+        counter = store.function_counter(work)
+        counter.increment()
+        store.reset()
+        self.assertEqual(counter.value, 0)
+        self.assertIs(store.function_counter(work), counter)
+
+
+class TestPerFunctionCounters(unittest.TestCase):
+    def setUp(self):
+        raise_at_nth_call.counters.reset()
+
+    def test_none_func_id_gives_each_function_its_own_counter(self):
+        @raise_at_nth_call(n=2, func_id=None)
+        def add(a, b):
+            return a + b
+
+        @raise_at_nth_call(n=2, func_id=None)
+        def mul(a, b):
+            return a * b
+
+        self.assertEqual(add(1, 2), 3)
+        self.assertEqual(mul(2, 3), 6)
+        with self.assertRaisesRegex(RuntimeError, r"\nFunc id .*add\Z"):
+            add(1, 2)
+        with self.assertRaisesRegex(RuntimeError, r"\nFunc id .*mul\Z"):
+            mul(2, 3)
+
+    def test_none_func_id_counter_is_released_with_function(self):
+        store = CounterStore()
+
+        def make():
+            @delay_at_nth_call(time_s=0, n=5, func_id=None, counters=store)
+            def work():
+                return None
+            work()
+            return work
+
+        work = make()
+        self.assertEqual(list(store.snapshot().values()), [1])
+        del work
+        gc.collect()
+        self.assertEqual(store.snapshot(), {})
+
+
+class TestNthCallUnderThreads(unittest.TestCase):
+    def setUp(self):
+        raise_at_nth_call.counters.reset()
+        raise_at_nth_call_inline.counters.reset()
+
+    def test_decorator_raises_exactly_once(self):
+        raised = []
+
+        @raise_at_nth_call(n=N_THREADS * CALLS_PER_THREAD // 2, func_id="threads")
+        def work():
+            return None
+
+        def call():
+            try:
+                work()
+            except RuntimeError:
+                raised.append(1)
+
+        run_in_threads(call)
+        self.assertEqual(len(raised), 1)
+
+    def test_inline_raises_exactly_once(self):
+        raised = []
+
+        def call():
+            try:
+                raise_at_nth_call_inline(n=N_THREADS * CALLS_PER_THREAD, func_id="threads")
+            except RuntimeError:
+                raised.append(1)
+
+        run_in_threads(call)
+        self.assertEqual(len(raised), 1)
+
+
+@unittest.skipIf(fcntl is None, "SharedCounterStore requires fcntl")
+class TestSharedCounterStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "counters")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_counts_are_shared_between_store_instances(self):
+        with SharedCounterStore(self.path, capacity=8) as first:
+            with SharedCounterStore(self.path) as second:
+                self.assertEqual(first.increment("a"), 1)
+                self.assertEqual(second.increment("a"), 2)
+                self.assertEqual(second.increment("b"), 1)
+                self.assertEqual(first.value("a"), 2)
+                self.assertEqual(second.capacity, 8)
+                self.assertEqual(len(first), 2)
+                self.assertIn("b", first)
+
+    def test_reset_zeroes_counts_for_all_instances(self):
+        with SharedCounterStore(self.path) as first:
+            with SharedCounterStore(self.path) as second:
+                first.increment("a")
+                second.reset()
+                self.assertEqual(first.value("a"), 0)
+                self.assertEqual(first.increment("a"), 1)
+
+    def test_reset_waits_for_slot_locks(self):
+        with SharedCounterStore(self.path) as store:
+            store.increment("a")
+            slot_lock = store._slot_locks[store._indexes["a"]]
+            with slot_lock:
+                resetting = threading.Thread(target=store.reset)
+                resetting.start()
+                resetting.join(0.05)
+                self.assertTrue(resetting.is_alive())
+                self.assertEqual(store.value("a"), 1)
+            resetting.join()
+            self.assertEqual(store.value("a"), 0)
+
+    def test_snapshot_and_function_counter(self):
+        def work():
+            return None
+
+        with SharedCounterStore(self.path) as store:
+            store.increment("a")
+            store.function_counter(work).increment()
+            self.assertEqual(
+                store.snapshot(),
+                {"a": 1, f"{work.__module__}.{work.__qualname__}": 1},
+            )
+            store.reset("a")
+            self.assertEqual(store.value("a"), 0)
+
+    def test_raises_when_full(self):
+        with SharedCounterStore(self.path, capacity=2) as store:
+            store.increment("a")
+            store.increment("b")
+            with self.assertRaisesRegex(RuntimeError, "is full"):
+                store.increment("c")
+
+    def test_rejects_invalid_capacity(self):
+        for invalid_capacity in (0, -1, 1.5):
+            with self.subTest(invalid_capacity=invalid_capacity):
+                with self.assertRaises(ValueError):
+                    SharedCounterStore(self.path, capacity=invalid_capacity)
+
+    def test_rejects_foreign_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a counter file")
+        with self.assertRaisesRegex(ValueError, "is not a shared counter file"):
+            SharedCounterStore(self.path)
+
+    def test_concurrent_threads_in_one_process(self):
+        with SharedCounterStore(self.path) as store:
+            run_in_threads(lambda: store.increment("threads"))
+            self.assertEqual(store.value("threads"), N_THREADS * CALLS_PER_THREAD)
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "requires the fork start method"
+    )
+    def test_nth_call_fires_exactly_once_across_forked_workers(self):
+        SharedCounterStore(self.path).close()
+        context = multiprocessing.get_context("fork")
+        with context.Pool(N_PROCESSES) as pool:
+            raised = pool.map(_count_raises_in_worker, [self.path] * N_PROCESSES)
+        self.assertEqual(sum(raised), 1)
+        with SharedCounterStore(self.path) as store:
+            self.assertEqual(store.value("payment"), N_PROCESSES * CALLS_PER_PROCESS)
+
+
+if __name__ == "__main__":
+    unittest.main()
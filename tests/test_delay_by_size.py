@@ -0,0 +1,98 @@
+import array
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import delay_by_size, delay_by_size_inline, delay_by_size_inline_async
+from fault_injection.delays import payload_size
+
+
+class TestPayloadSize(unittest.TestCase):
+    def test_prefers_nbytes_then_len_then_sizeof(self):
+        self.assertEqual(payload_size(memoryview(array.array("d", [0.0] * 4))), 32)
+        self.assertEqual(payload_size(b"abcd"), 4)
+        self.assertEqual(payload_size([1, 2, 3]), 3)
+        self.assertEqual(payload_size(1.5), (1.5).__sizeof__())
+        self.assertEqual(payload_size(None), 0)
+
+
+class TestDelayBySize(unittest.TestCase):
+    def test_delay_scales_with_first_argument(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            @delay_by_size(base_s=0.01, per_byte_s=0.001)
+            def send(batch):
+                return len(batch)
+
+            self.assertEqual(send(b"x" * 100), 100)
+            send(b"x" * 1000)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.11, 1.01])
+
+    def test_named_argument_passed_either_way(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            @delay_by_size(per_byte_s=1.0, arg="payload")
+            def send(topic, payload=b"ab"):
+                return topic
+
+            send("t", b"abc")
+            send("t", payload=b"abcd")
+            send("t")
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [3.0, 4.0, 2.0])
+
+    def test_return_value_delays_after_call(self):
+        order = []
+        with patch("fault_injection.delays.time.sleep",
+                   side_effect=lambda s: order.append(("sleep", s))):
+            @delay_by_size(per_byte_s=0.5, arg=None, max_time_s=1.0)
+            def fetch(n):
+                order.append(("call", n))
+                return [0] * n
+
+            fetch(1)
+            fetch(10)
+        self.assertEqual(order, [("call", 1), ("sleep", 0.5), ("call", 10), ("sleep", 1.0)])
+
+    def test_custom_size_function(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            @delay_by_size(per_byte_s=0.1, size=lambda rows: sum(map(len, rows)))
+            def insert(rows):
+                return None
+
+            insert([b"ab", b"cde"])
+        sleep.assert_called_once_with(0.5)
+
+    def test_validation(self):
+        for kwargs in ({"base_s": -1}, {"per_byte_s": -1}, {"max_time_s": -1}, {"arg": -1}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                delay_by_size(**kwargs)
+        with self.assertRaisesRegex(ValueError, "no argument 'missing'"):
+            delay_by_size(arg="missing")(lambda batch: None)
+        with self.assertRaisesRegex(ValueError, "no argument at position 3"):
+            delay_by_size(arg=3)(lambda batch: None)
+
+    def test_disable_returns_function(self):
+        def send(batch):
+            return batch
+        self.assertIs(delay_by_size(disable=True)(send), send)
+
+
+class TestDelayBySizeInline(unittest.TestCase):
+    def test_inline_sleeps_for_payload(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            delay_by_size_inline(b"x" * 10, base_s=1.0, per_byte_s=0.1)
+            delay_by_size_inline(b"x" * 10, disable=True)
+        sleep.assert_called_once_with(2.0)
+
+
+class TestAsyncDelayBySize(unittest.IsolatedAsyncioTestCase):
+    async def test_decorator_and_inline_await_sleep(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            @delay_by_size(per_byte_s=0.25)
+            async def send(batch):
+                return len(batch)
+
+            self.assertEqual(await send(b"abcd"), 4)
+            await delay_by_size_inline_async([1, 2], per_byte_s=0.25)
+        self.assertEqual([c.args[0] for c in sleep.await_args_list], [1.0, 0.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
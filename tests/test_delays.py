@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from fault_injection import (
     delay,
@@ -9,7 +9,11 @@ from fault_injection import (
     delay_random_norm,
     delay_random_norm_inline,
     delay_at_nth_call,
-    delay_at_nth_call_inline
+    delay_at_nth_call_inline,
+    delay_inline_async,
+    delay_random_inline_async,
+    delay_random_norm_inline_async,
+    delay_at_nth_call_inline_async,
 )
 
 
@@ -191,8 +195,7 @@ class TestDelayRandomNormInline(unittest.TestCase):
 
 class TestDelayNthDecorator(unittest.TestCase):
     def setUp(self):
-        if hasattr(delay_at_nth_call, "n_called_dict"):
-            delay_at_nth_call.n_called_dict = {}
+        delay_at_nth_call.counters.reset()
 
     def test_delay_at_n1_calls_sleep_and_returns_wrapped_value(self):
         with patch("fault_injection.delays.time.sleep") as sleep_mock:
@@ -277,8 +280,7 @@ class TestDelayNthDecorator(unittest.TestCase):
 
 class TestDelayNthInline(unittest.TestCase):
     def setUp(self):
-        if hasattr(delay_at_nth_call_inline, "n_called_dict"):
-            delay_at_nth_call_inline.n_called_dict = {}
+        delay_at_nth_call_inline.counters.reset()
 
     def test_delay_at_n1_calls_sleep(self):
         with patch("fault_injection.delays.time.sleep") as sleep_mock:
@@ -338,5 +340,119 @@ class TestDelayNthInline(unittest.TestCase):
             delay_at_nth_call_inline(time_s=-0.1)
 
 
+class TestAsyncDelayDecorators(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        delay_at_nth_call.counters.reset()
+
+    async def test_delay_awaits_asyncio_sleep_for_coroutine_function(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+            with patch(
+                "fault_injection.delays.time.sleep",
+                side_effect=AssertionError("time.sleep should not block the event loop"),
+            ):
+                @delay(0.25)
+                async def add(a, b):
+                    return a + b
+
+                self.assertEqual(await add(1, 3), 4)
+                sleep_mock.assert_awaited_once_with(0.25)
+
+    async def test_delay_preserves_coroutine_function(self):
+        import inspect
+
+        @delay(0.25)
+        async def add(a, b):
+            return a + b
+
+        self.assertTrue(inspect.iscoroutinefunction(add))
+        self.assertEqual(add.__name__, "add")
+
+    async def test_delay_random_awaits_randomized_delay(self):
+        with patch("fault_injection.delays.random.random", return_value=0.5):
+            with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+                @delay_random(0.4)
+                async def add(a, b):
+                    return a + b
+
+                self.assertEqual(await add(4, 6), 10)
+                sleep_mock.assert_awaited_once_with(0.2)
+
+    async def test_delay_random_norm_awaits_clamped_gaussian_delay(self):
+        with patch("fault_injection.delays.random.gauss", return_value=-0.7):
+            with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+                @delay_random_norm(mean_time_s=0.3, std_time_s=0.1)
+                async def add(a, b):
+                    return a + b
+
+                self.assertEqual(await add(7, 8), 15)
+                sleep_mock.assert_awaited_once_with(0)
+
+    async def test_delay_at_nth_call_awaits_on_nth_call_only(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+            @delay_at_nth_call(time_s=0.25, n=2, func_id=1)
+            async def add(a, b):
+                return a + b
+
+            self.assertEqual(await add(1, 2), 3)
+            self.assertEqual(await add(1, 2), 3)
+            self.assertEqual(await add(1, 2), 3)
+            sleep_mock.assert_awaited_once_with(0.25)
+
+    async def test_delay_disable_skips_asyncio_sleep(self):
+        with patch(
+            "fault_injection.delays.asyncio.sleep",
+            side_effect=AssertionError("asyncio.sleep should not be called when disabled"),
+        ):
+            @delay(0.25, disable=True)
+            async def add(a, b):
+                return a + b
+
+            self.assertEqual(await add(2, 5), 7)
+
+
+class TestAsyncDelayInline(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        delay_at_nth_call_inline.counters.reset()
+
+    async def test_delay_inline_async_awaits_asyncio_sleep(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+            self.assertIsNone(await delay_inline_async(0.25))
+            sleep_mock.assert_awaited_once_with(0.25)
+
+    async def test_delay_inline_async_rejects_negative_time(self):
+        with self.assertRaisesRegex(ValueError, "delay should have positive time_s"):
+            await delay_inline_async(-0.1)
+
+    async def test_delay_inline_async_disable_skips_sleep(self):
+        with patch(
+            "fault_injection.delays.asyncio.sleep",
+            side_effect=AssertionError("asyncio.sleep should not be called when disabled"),
+        ):
+            self.assertIsNone(await delay_inline_async(0.25, disable=True))
+
+    async def test_delay_random_inline_async_uses_randomized_delay(self):
+        with patch("fault_injection.delays.random.random", return_value=0.5):
+            with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+                self.assertIsNone(await delay_random_inline_async(0.4))
+                sleep_mock.assert_awaited_once_with(0.2)
+
+    async def test_delay_random_norm_inline_async_uses_gaussian_value(self):
+        with patch("fault_injection.delays.random.gauss", return_value=0.35):
+            with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+                self.assertIsNone(
+                    await delay_random_norm_inline_async(mean_time_s=0.3, std_time_s=0.1)
+                )
+                sleep_mock.assert_awaited_once_with(0.35)
+
+    async def test_delay_at_nth_call_inline_async_shares_counter_with_sync_inline(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep_mock:
+            with patch("fault_injection.delays.time.sleep") as time_sleep_mock:
+                delay_at_nth_call_inline(time_s=0.25, n=2, func_id=3)
+                await delay_at_nth_call_inline_async(time_s=0.25, n=2, func_id=3)
+                await delay_at_nth_call_inline_async(time_s=0.25, n=2, func_id=3)
+                sleep_mock.assert_awaited_once_with(0.25)
+                time_sleep_mock.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,171 @@
+import json
+import math
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import (
+    delay_distribution,
+    delay_distribution_inline,
+    delay_distribution_inline_async,
+)
+from fault_injection.distributions import (
+    Distribution,
+    Empirical,
+    Exponential,
+    Lognormal,
+    Mixture,
+    Pareto,
+)
+
+
+class FixedRandom:
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def random(self):
+        return self.values.pop(0)
+
+
+def draw(distribution, count=20_000, seed=1):
+    rng = random.Random(seed)
+    return [distribution.sample(rng) for _ in range(count)]
+
+
+class TestParametricDistributions(unittest.TestCase):
+    def test_exponential_mean(self):
+        self.assertAlmostEqual(statistics.mean(draw(Exponential(0.2))), 0.2, delta=0.01)
+
+    def test_lognormal_median_and_tail(self):
+        samples = sorted(draw(Lognormal(median_s=0.05, sigma=1.0)))
+        self.assertAlmostEqual(samples[len(samples) // 2], 0.05, delta=0.003)
+        p99 = samples[int(len(samples) * 0.99)]
+        self.assertAlmostEqual(p99, 0.05 * math.exp(2.326), delta=0.1)
+
+    def test_pareto_minimum_and_tail(self):
+        samples = draw(Pareto(scale_s=0.01, alpha=1.5))
+        self.assertGreaterEqual(min(samples), 0.01)
+        tail = sum(sample > 0.1 for sample in samples) / len(samples)
+        self.assertAlmostEqual(tail, 10 ** -1.5, delta=0.005)
+
+    def test_mixture_picks_components_by_weight(self):
+        mixture = Mixture([(9, Exponential(0.001)), (1, Pareto(scale_s=1.0, alpha=3))])
+        slow = sum(sample >= 1.0 for sample in draw(mixture)) / 20_000
+        self.assertAlmostEqual(slow, 0.1, delta=0.01)
+
+    def test_validation(self):
+        invalid = [
+            lambda: Exponential(0),
+            lambda: Lognormal(0, 1),
+            lambda: Lognormal(1, -1),
+            lambda: Pareto(0, 1),
+            lambda: Pareto(1, 0),
+            lambda: Mixture([]),
+            lambda: Mixture([(0, Exponential(1))]),
+            lambda: Mixture([(-1, Exponential(1)), (2, Exponential(1))]),
+        ]
+        for make in invalid:
+            with self.assertRaises(ValueError):
+                make()
+
+
+    def test_custom_distribution_must_implement_sample(self):
+        class Incomplete(Distribution):
+            pass
+
+        class Constant(Distribution):
+            def sample(self, rng):
+                return 0.5
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+        self.assertEqual(Constant().sample(random), 0.5)
+
+
+class TestEmpirical(unittest.TestCase):
+    def test_inverse_cdf_interpolates_within_buckets(self):
+        empirical = Empirical(bounds=[0.1, 0.2, 1.0], counts=[2, 0, 2])
+        self.assertAlmostEqual(empirical.sample(FixedRandom(0.25)), 0.05)
+        self.assertAlmostEqual(empirical.sample(FixedRandom(0.5)), 0.2)
+        self.assertAlmostEqual(empirical.sample(FixedRandom(0.75)), 0.6)
+        self.assertAlmostEqual(empirical.sample(FixedRandom(0.0)), 0.0)
+
+    def test_from_histogram_reproduces_bucket_frequencies(self):
+        empirical = Empirical.from_histogram({"0.001": 90, "0.01": 9, "0.1": 1})
+        samples = draw(empirical)
+        self.assertAlmostEqual(sum(s <= 0.001 for s in samples) / len(samples), 0.9, delta=0.01)
+        self.assertAlmostEqual(sum(s > 0.01 for s in samples) / len(samples), 0.01, delta=0.003)
+        self.assertLessEqual(max(samples), 0.1)
+
+    def test_infinite_bucket_is_sampled_at_its_lower_edge(self):
+        empirical = Empirical.from_histogram({0.5: 1, math.inf: 1})
+        self.assertEqual(empirical.sample(FixedRandom(0.9)), 0.5)
+
+    def test_from_samples_stays_within_recorded_range(self):
+        samples = draw(Empirical.from_samples([0.2, 0.1, 0.1, 0.4]), count=1000)
+        self.assertGreaterEqual(min(samples), 0.1)
+        self.assertLessEqual(max(samples), 0.4)
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "histogram.json")
+            with open(path, "w") as file:
+                json.dump({"0.002": 3, "0.004": 1}, file)
+            empirical = Empirical.load(path)
+        self.assertAlmostEqual(empirical.sample(FixedRandom(0.5)), 0.002 * 2 / 3)
+
+    def test_validation(self):
+        for bounds, counts in (([], []), ([1], [1, 2]), ([1], [0]), ([2, 1], [1, 1]),
+                               ([1], [-1])):
+            with self.subTest(bounds=bounds, counts=counts):
+                with self.assertRaises(ValueError):
+                    Empirical(bounds, counts)
+        with self.assertRaises(ValueError):
+            Empirical.from_samples([])
+
+
+class TestDelayDistribution(unittest.TestCase):
+    def test_decorator_sleeps_sampled_time(self):
+        @delay_distribution(Exponential(0.5), rng=FixedRandom(1 - math.exp(-1)))
+        def call():
+            return "ok"
+
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            self.assertEqual(call(), "ok")
+        self.assertAlmostEqual(sleep.call_args.args[0], 0.5)
+
+    def test_max_time_caps_heavy_tail(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            delay_distribution_inline(Pareto(1.0, 0.5), max_time_s=2, rng=FixedRandom(0.999))
+        sleep.assert_called_once_with(2)
+
+    def test_disabled_and_validation(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            delay_distribution_inline(Exponential(1), disable=True)
+        sleep.assert_not_called()
+        with self.assertRaises(ValueError):
+            delay_distribution(Exponential(1), max_time_s=-1)
+
+
+class TestAsyncDelayDistribution(unittest.IsolatedAsyncioTestCase):
+    async def test_inline_async(self):
+        empirical = Empirical([0.3], [1], low_s=0.3)
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            await delay_distribution_inline_async(empirical)
+        sleep.assert_awaited_once_with(0.3)
+
+    async def test_decorator_on_coroutine(self):
+        @delay_distribution(Empirical([0.2], [1], low_s=0.2))
+        async def call():
+            return "ok"
+
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await call(), "ok")
+        sleep.assert_awaited_once_with(0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
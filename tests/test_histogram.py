@@ -0,0 +1,88 @@
+import math
+import random
+import unittest
+
+from fault_injection.histogram import Histogram, merged
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_cover_every_value_once(self):
+        histogram = Histogram(precision_bits=4)
+        previous_high = 0
+        for index in range(len(histogram.counts) - 1):
+            low, width = histogram._bounds(index)
+            self.assertEqual(low, previous_high)
+            self.assertEqual(histogram._index(low), index)
+            self.assertEqual(histogram._index(low + width - 1), index)
+            self.assertLessEqual(width, max(1, low / 2 ** 4))
+            previous_high = low + width
+
+    def test_percentiles_within_relative_error(self):
+        rng = random.Random(3)
+        samples = sorted(rng.lognormvariate(-4, 1.5) for _ in range(20000))
+        histogram = Histogram(precision_bits=7)
+        for sample in samples:
+            histogram.record(sample)
+        for percent in (50, 90, 99, 99.9):
+            exact = samples[math.ceil(percent / 100 * len(samples)) - 1]
+            estimate = histogram.percentile(percent)
+            self.assertGreaterEqual(estimate, exact)
+            self.assertLessEqual(estimate, exact * (1 + 2 ** -7) + 1e-6)
+        self.assertEqual(histogram.percentile(100), samples[-1])
+        self.assertAlmostEqual(histogram.mean_s, math.fsum(samples) / len(samples))
+
+    def test_fixed_memory(self):
+        histogram = Histogram()
+        size = len(histogram.counts)
+        for value in (0.0, 1e-9, 0.5, 10.0, 1e9):
+            histogram.record(value)
+        self.assertEqual(len(histogram.counts), size)
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.max_s, 1e9)
+        self.assertEqual(histogram.min_s, 0.0)
+        self.assertEqual(list(histogram.buckets())[-1][1:], (math.inf, 1))
+
+    def test_merge_and_serialise(self):
+        first, second = Histogram(), Histogram()
+        for value in (0.001, 0.002, 0.002):
+            first.record(value)
+        second.record(0.5, count=3)
+        combined = merged([first, second])
+        self.assertEqual(combined.count, 6)
+        self.assertEqual(first.count, 3)
+        data = combined.to_bytes()
+        self.assertLess(len(data), 200)
+        loaded = Histogram.from_bytes(data)
+        self.assertEqual(loaded.counts, combined.counts)
+        self.assertEqual((loaded.count, loaded.min_s, loaded.max_s, loaded.sum_s),
+                         (combined.count, combined.min_s, combined.max_s, combined.sum_s))
+        self.assertEqual(loaded.percentiles([50, 100]), combined.percentiles([50, 100]))
+        self.assertAlmostEqual(loaded.percentile(50), 0.002, delta=0.002 * 2 ** -7)
+
+    def test_merge_rejects_other_layout(self):
+        with self.assertRaises(ValueError):
+            Histogram().merge(Histogram(precision_bits=3))
+
+    def test_validation(self):
+        for kwargs in ({"lowest_s": 0}, {"highest_s": 1e-7}, {"precision_bits": 0},
+                       {"precision_bits": 17}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                Histogram(**kwargs)
+        with self.assertRaises(ValueError):
+            Histogram().record(-1)
+        with self.assertRaises(ValueError):
+            Histogram().percentile(101)
+        with self.assertRaises(ValueError):
+            Histogram.from_bytes(b"not a histogram")
+
+    def test_empty(self):
+        histogram = merged([])
+        self.assertTrue(math.isnan(histogram.percentile(50)))
+        self.assertTrue(math.isnan(histogram.mean_s))
+        histogram.record(1.0)
+        histogram.reset()
+        self.assertEqual(histogram.count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import math
+import unittest
+
+from fault_injection import delay, raise_at_nth_call, raise_random
+from fault_injection.histogram import Histogram
+from fault_injection.load import LatencySummary, run, run_async
+
+
+def square(x):
+    return x * x
+
+
+class TestLatencySummary(unittest.TestCase):
+    def test_from_histogram(self):
+        histogram = Histogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+        summary = LatencySummary.from_histogram(histogram)
+        self.assertEqual(summary.count, 1000)
+        for value, expected in ((summary.p50_s, 0.5), (summary.p95_s, 0.95),
+                                (summary.p99_s, 0.99), (summary.p999_s, 0.999)):
+            self.assertAlmostEqual(value, expected, delta=expected / 64)
+        self.assertEqual(summary.max_s, 1.0)
+        self.assertAlmostEqual(summary.mean_s, 0.5005, delta=0.5005 / 64)
+
+    def test_empty(self):
+        summary = LatencySummary.from_histogram(Histogram())
+        self.assertEqual(summary.count, 0)
+        self.assertTrue(math.isnan(summary.p99_s))
+
+
+class TestRun(unittest.TestCase):
+    def test_splits_faulted_and_clean_calls(self):
+        @raise_random(prob_of_raise=0.5)
+        def call():
+            return "ok"
+
+        report = run(call, concurrency=4, calls=400)
+        self.assertEqual(report.calls, 400)
+        self.assertEqual(report.overall.count, 400)
+        self.assertEqual(report.clean.count + report.faulted.count, 400)
+        self.assertEqual(report.errors, {"RuntimeError": report.faulted.count})
+        self.assertGreater(report.faulted.count, 100)
+        self.assertGreater(report.clean.count, 100)
+
+    def test_injected_delays_show_in_faulted_latency(self):
+        @delay(0.005)
+        def slow():
+            return None
+
+        report = run(slow, concurrency=2, calls=10)
+        self.assertEqual(report.faulted.count, 10)
+        self.assertEqual(report.clean.count, 0)
+        self.assertGreaterEqual(report.faulted.p50_s, 0.005)
+        self.assertEqual(report.errors, {})
+
+    def test_target_rate(self):
+        report = run(square, args=(3,), concurrency=2, calls=20, rate_per_s=200)
+        self.assertEqual(report.calls, 20)
+        self.assertGreaterEqual(report.duration_s, 19 / 200)
+        self.assertIn("20 calls", report.format())
+
+    def test_duration_limit(self):
+        report = run(square, args=(3,), concurrency=2, duration_s=0.05, rate_per_s=100)
+        self.assertLessEqual(report.calls, 6)
+
+    def test_processes(self):
+        report = run(square, args=(3,), mode="processes", concurrency=2, calls=11)
+        self.assertEqual(report.calls, 11)
+        self.assertEqual(report.clean.count, 11)
+
+    def test_asyncio(self):
+        @raise_at_nth_call(n=3, func_id="load-test")
+        async def call():
+            await asyncio.sleep(0)
+
+        raise_at_nth_call.counters.reset("load-test")
+        report = run(call, mode="asyncio", concurrency=5, calls=10)
+        self.assertEqual(report.calls, 10)
+        self.assertEqual(report.faulted.count, 1)
+        self.assertEqual(report.errors, {"RuntimeError": 1})
+
+    def test_validation(self):
+        for kwargs in ({"mode": "fibers", "calls": 1}, {"concurrency": 0, "calls": 1},
+                       {"calls": -1}, {"duration_s": 0}, {"rate_per_s": 0, "calls": 1}, {}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                run(square, (1,), **kwargs)
+
+
+class TestRunAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_in_the_current_loop(self):
+        @delay(0.001)
+        async def call():
+            return None
+
+        report = await run_async(call, concurrency=10, calls=50)
+        self.assertEqual(report.faulted.count, 50)
+        self.assertEqual(report.mode, "asyncio")
+
+
+if __name__ == "__main__":
+    unittest.main()
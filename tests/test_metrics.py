@@ -0,0 +1,187 @@
+import math
+import threading
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import (
+    delay,
+    delay_at_nth_call,
+    delay_inline_async,
+    delay_random_inline,
+    raise_,
+    raise_at_nth_call_inline,
+    raise_random,
+)
+from fault_injection import metrics
+from fault_injection.metrics import SiteMetrics, _sleep_bucket, site_metrics
+
+
+class TestSleepBuckets(unittest.TestCase):
+    def test_bucket_upper_bounds(self):
+        self.assertEqual(_sleep_bucket(0), 0)
+        self.assertEqual(_sleep_bucket(1e-6), 0)
+        self.assertEqual(_sleep_bucket(1.5e-6), 1)
+        self.assertEqual(_sleep_bucket(4e-6), 2)
+        self.assertEqual(_sleep_bucket(5e-6), 3)
+        self.assertEqual(_sleep_bucket(1e9), len(metrics.SLEEP_BUCKET_BOUNDS_S))
+
+
+class TestSiteMetrics(unittest.TestCase):
+    def test_snapshot_merges_thread_accumulators(self):
+        site = SiteMetrics("threads")
+
+        def worker():
+            for _ in range(100):
+                site.record_call()
+            site.record_sleep(0.003)
+            site.record_raise()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = site.snapshot()
+        self.assertEqual(snapshot["calls"], 800)
+        self.assertEqual(snapshot["faults"], 16)
+        self.assertEqual(snapshot["exceptions"], 8)
+        self.assertEqual(snapshot["sleeps"], 8)
+        self.assertAlmostEqual(snapshot["sleep_total_s"], 0.024)
+        self.assertEqual(sum(snapshot["sleep_histogram"].values()), 8)
+        (bound,) = snapshot["sleep_histogram"]
+        self.assertGreaterEqual(bound, 0.003)
+        self.assertLess(bound / 2, 0.003)
+
+    def test_reset(self):
+        site = SiteMetrics("reset")
+        site.record_call()
+        site.reset()
+        self.assertEqual(site.snapshot()["calls"], 0)
+
+    def test_sleep_latency_histogram_merges_threads(self):
+        site = SiteMetrics("latency")
+        threads = [
+            threading.Thread(target=lambda: [site.record_sleep(0.01) for _ in range(10)])
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        site.record_call()
+        latency = site.sleep_latency()
+        self.assertEqual(latency.count, 30)
+        self.assertAlmostEqual(latency.percentile(99), 0.01, delta=0.01 * 2 ** -7)
+
+    def test_long_sleeps_go_to_overflow_bucket(self):
+        site = SiteMetrics("overflow")
+        site.record_sleep(1e9)
+        self.assertEqual(site.snapshot()["sleep_histogram"], {math.inf: 1})
+
+
+class TestHelpersRecordMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        raise_at_nth_call_inline.counters.reset()
+
+    def test_delay_records_calls_and_sleep(self):
+        with patch("fault_injection.delays.time.sleep"):
+            @delay(0.25, site="db")
+            def query():
+                return "rows"
+
+            query()
+            query()
+        snapshot = site_metrics("db").snapshot()
+        self.assertEqual(snapshot["calls"], 2)
+        self.assertEqual(snapshot["faults"], 2)
+        self.assertEqual(snapshot["sleep_total_s"], 0.5)
+        self.assertEqual(snapshot["exceptions"], 0)
+
+    def test_delay_at_nth_call_records_calls_and_single_fault(self):
+        with patch("fault_injection.delays.time.sleep"):
+            @delay_at_nth_call(0.25, n=2, func_id=None, site="nth")
+            def query():
+                return "rows"
+
+            for _ in range(3):
+                query()
+        snapshot = site_metrics("nth").snapshot()
+        self.assertEqual(snapshot["calls"], 3)
+        self.assertEqual(snapshot["faults"], 1)
+
+    def test_random_inline_records_sampled_sleep(self):
+        with patch("fault_injection.rng.SiteStream.random", return_value=0.5):
+            with patch("fault_injection.delays.time.sleep"):
+                delay_random_inline(0.4, site="inline")
+        self.assertEqual(site_metrics("inline").snapshot()["sleep_total_s"], 0.2)
+
+    def test_raise_records_exceptions(self):
+        @raise_(site="payment")
+        def pay():
+            return None
+
+        with self.assertRaises(RuntimeError):
+            pay()
+        snapshot = site_metrics("payment").snapshot()
+        self.assertEqual(snapshot["calls"], 1)
+        self.assertEqual(snapshot["faults"], 1)
+        self.assertEqual(snapshot["exceptions"], 1)
+
+    def test_raise_random_records_only_fired_faults(self):
+        with patch("fault_injection.rng.SiteStream.random", return_value=0.9):
+            @raise_random(prob_of_raise=0.2, site="random")
+            def pay():
+                return None
+
+            pay()
+        snapshot = site_metrics("random").snapshot()
+        self.assertEqual(snapshot["calls"], 1)
+        self.assertEqual(snapshot["faults"], 0)
+
+    def test_raise_at_nth_call_inline_records(self):
+        raise_at_nth_call_inline(n=2, func_id="metrics", site="inline-nth")
+        with self.assertRaises(RuntimeError):
+            raise_at_nth_call_inline(n=2, func_id="metrics", site="inline-nth")
+        snapshot = site_metrics("inline-nth").snapshot()
+        self.assertEqual((snapshot["calls"], snapshot["exceptions"]), (2, 1))
+
+    def test_module_snapshot_lists_sites(self):
+        with patch("fault_injection.delays.time.sleep"):
+            @delay(0.1, site="listed")
+            def query():
+                return None
+
+            query()
+        self.assertEqual(metrics.snapshot()["listed"]["calls"], 1)
+
+    def test_nothing_recorded_without_site(self):
+        with patch.object(SiteMetrics, "record_call", side_effect=AssertionError):
+            with patch("fault_injection.delays.time.sleep"):
+                @delay(0.1)
+                def query():
+                    return None
+
+                query()
+
+
+class TestAsyncHelpersRecordMetrics(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        metrics.reset()
+
+    async def test_async_delay_records_sleep(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock):
+            @delay(0.25, site="async")
+            async def query():
+                return "rows"
+
+            await query()
+            await delay_inline_async(0.25, site="async")
+        snapshot = site_metrics("async").snapshot()
+        self.assertEqual(snapshot["calls"], 2)
+        self.assertEqual(snapshot["sleep_total_s"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sqlite3  # so that sqlite3.Cursor is patched at start
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import patch as mock_patch
+
+from fault_injection import delay, raise_
+from fault_injection.patching import Patcher, patch
+
+MODULE = textwrap.dedent("""
+    def fetch():
+        return "fetched"
+
+
+    class Base:
+        def inherited(self):
+            return "inherited"
+
+
+    class Client(Base):
+        def send(self, payload):
+            return payload
+
+        @staticmethod
+        def version():
+            return 1
+
+        @classmethod
+        def build(cls):
+            return cls()
+""")
+
+
+class TestPatcher(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        os.mkdir(os.path.join(directory.name, "fi_pkg"))
+        with open(os.path.join(directory.name, "fi_pkg", "__init__.py"), "w") as file:
+            file.write("")
+        with open(os.path.join(directory.name, "fi_pkg", "client.py"), "w") as file:
+            file.write(MODULE)
+        sys.path.insert(0, directory.name)
+        self.addCleanup(sys.path.remove, directory.name)
+        self.addCleanup(self._forget_modules)
+
+    def _forget_modules(self):
+        for name in ("fi_pkg", "fi_pkg.client"):
+            sys.modules.pop(name, None)
+
+    def test_patches_on_first_import_and_restores(self):
+        patcher = Patcher({
+            "fi_pkg.client.fetch": raise_("down"),
+            "fi_pkg.client:Client.send": raise_("send failed"),
+        }).start()
+        self.assertNotIn("fi_pkg.client", sys.modules)
+        self.assertEqual(len(patcher.pending()), 2)
+
+        from fi_pkg import client
+        patched_send = vars(client.Client)["send"]
+        self.assertEqual(patcher.pending(), ())
+        with self.assertRaisesRegex(RuntimeError, "down"):
+            client.fetch()
+        with self.assertRaisesRegex(RuntimeError, "send failed"):
+            client.Client().send(1)
+
+        patcher.stop()
+        self.assertEqual(client.fetch(), "fetched")
+        self.assertIs(vars(client.Client)["send"], patched_send.__wrapped__)
+        self.assertNotIn(patcher._finder, sys.meta_path)
+
+    def test_patches_imported_modules_and_keeps_descriptor_kinds(self):
+        from fi_pkg import client
+        originals = dict(vars(client.Client))
+        with mock_patch("fault_injection.delays.time.sleep") as sleep:
+            with patch({
+                "fi_pkg.client.Client.version": delay(0.1),
+                "fi_pkg.client.Client.build": delay(0.1),
+                "fi_pkg.client.Client.inherited": delay(0.1),
+            }) as patcher:
+                self.assertEqual(len(patcher.applied()), 3)
+                self.assertEqual(client.Client.version(), 1)
+                self.assertIsInstance(client.Client.build(), client.Client)
+                self.assertEqual(client.Client().inherited(), "inherited")
+                self.assertIsInstance(vars(client.Client)["version"], staticmethod)
+                self.assertIsInstance(vars(client.Client)["build"], classmethod)
+        self.assertEqual(sleep.call_count, 3)
+        self.assertEqual(dict(vars(client.Client)), originals)
+        self.assertNotIn("inherited", vars(client.Client))
+
+    def test_bulk_targets_do_not_import(self):
+        targets = {f"fi_absent_{i}.module.func": delay(0.1) for i in range(300)}
+        with Patcher(targets) as patcher:
+            self.assertEqual(len(patcher.pending()), 300)
+            self.assertFalse(any(name.startswith("fi_absent_") for name in sys.modules))
+            from fi_pkg import client  # unrelated imports pass through
+            self.assertEqual(client.fetch(), "fetched")
+        self.assertEqual(patcher.pending(), ())
+
+    def test_unpatchable_target_rolls_back(self):
+        from fi_pkg import client
+        with self.assertRaisesRegex(ValueError, "cannot patch"):
+            patch({"fi_pkg.client.fetch": raise_(), "sqlite3.Cursor.execute": delay(0.1)})
+        self.assertEqual(client.fetch(), "fetched")
+
+    def test_malformed_target(self):
+        for path in ("nodots", "a..b", ":f", "module:"):
+            with self.subTest(path=path), self.assertRaises(ValueError):
+                Patcher({path: delay(0.1)})
+
+
+if __name__ == "__main__":
+    unittest.main()
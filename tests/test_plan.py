@@ -0,0 +1,158 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import raise_at_nth_call_inline
+from fault_injection import plan as plan_module
+from fault_injection.plan import FaultPlan, compile_plan
+
+
+class PlanTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content, mtime_ns=None):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as file:
+            file.write(content if isinstance(content, str) else json.dumps(content))
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+
+class TestCompilePlan(unittest.TestCase):
+    def test_unknown_sites_and_disabled_sites_are_absent(self):
+        table = compile_plan({"sites": {
+            "db": {"fault": "delay", "time_s": 0.1},
+            "off": {"fault": "raise", "enabled": False},
+        }})
+        self.assertEqual(set(table), {"db"})
+        self.assertEqual(compile_plan({"enabled": False, "sites": {"db": {"fault": "raise"}}}), {})
+
+    def test_invalid_plans_raise_value_error(self):
+        invalid = [
+            [],
+            {"sites": []},
+            {"sites": {"db": "delay"}},
+            {"sites": {"db": {"fault": "explode"}}},
+            {"sites": {"db": {"fault": "delay", "time_s": -1}}},
+            {"sites": {"db": {"fault": "delay", "unknown": 1}}},
+            {"sites": {"db": {"fault": "raise_random", "prob_of_raise": 2}}},
+            {"sites": {"db": {"fault": "raise_rate_limited", "rate_per_s": 0}}},
+            {"sites": {"db": {"fault": "raise_on_schedule", "schedule": {"start": 0}}}},
+        ]
+        for plan in invalid:
+            with self.subTest(plan=plan):
+                with self.assertRaises(ValueError):
+                    compile_plan(plan)
+
+
+class TestFaultPlan(PlanTestCase):
+    def test_json_plan_injects_configured_faults(self):
+        path = self.write("plan.json", {"sites": {
+            "db": {"fault": "delay", "time_s": 0.25},
+            "payments": {"fault": "raise", "msg": "gateway down"},
+        }})
+        plan = FaultPlan(path)
+        self.assertEqual(plan.sites(), ("db", "payments"))
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            plan.inline("db")
+            plan.inline("unconfigured")
+        sleep.assert_called_once_with(0.25)
+        with self.assertRaisesRegex(RuntimeError, "gateway down"):
+            plan.inline("payments")
+
+    @unittest.skipIf(plan_module.tomllib is None, "TOML parser not available")
+    def test_toml_plan(self):
+        path = self.write("plan.toml", """
+[sites.checkout]
+fault = "raise_on_schedule"
+msg = "every second call"
+schedule = { start = 2, period = 2 }
+""")
+        plan = FaultPlan(path)
+
+        @plan.site("checkout")
+        def checkout():
+            return "ok"
+
+        outcomes = []
+        for _ in range(4):
+            try:
+                outcomes.append(checkout())
+            except RuntimeError:
+                outcomes.append("fault")
+        self.assertEqual(outcomes, ["ok", "fault", "ok", "fault"])
+
+    def test_reload_on_mtime_change(self):
+        path = self.write("plan.json", {"sites": {"db": {"fault": "raise"}}}, mtime_ns=10**18)
+        plan = FaultPlan(path, poll_interval_s=0)
+        with self.assertRaises(RuntimeError):
+            plan.inline("db")
+        self.write("plan.json", {"sites": {}}, mtime_ns=2 * 10**18)
+        plan.inline("db")
+        self.assertEqual(plan.sites(), ())
+
+    def test_polling_is_rate_limited(self):
+        path = self.write("plan.json", {"sites": {}})
+        plan = FaultPlan(path, poll_interval_s=3600)
+        with patch("fault_injection.plan.os.stat") as stat:
+            for _ in range(100):
+                plan.inline("db")
+        stat.assert_not_called()
+
+    def test_invalid_reload_keeps_previous_table(self):
+        path = self.write("plan.json", {"sites": {"db": {"fault": "raise"}}}, mtime_ns=10**18)
+        plan = FaultPlan(path, poll_interval_s=0)
+        self.write("plan.json", "{not json", mtime_ns=2 * 10**18)
+        with self.assertRaises(RuntimeError):
+            plan.inline("db")
+        self.assertIsInstance(plan.last_error, ValueError)
+        with self.assertRaises(ValueError):
+            plan.reload()
+
+    def test_initial_load_errors_raise(self):
+        with self.assertRaises(OSError):
+            FaultPlan(os.path.join(self.directory.name, "missing.json"))
+        with self.assertRaises(ValueError):
+            FaultPlan(self.write("plan.json", {"sites": {"db": {"fault": "?"}}}))
+        with self.assertRaises(ValueError):
+            FaultPlan(self.write("plan.json", {"sites": {}}), poll_interval_s=-1)
+
+    def test_counters_are_isolated_per_site(self):
+        raise_at_nth_call_inline.counters.reset()
+        path = self.write("plan.json", {"sites": {
+            "first": {"fault": "raise_at_nth_call", "n": 2},
+            "second": {"fault": "raise_at_nth_call", "n": 2},
+        }})
+        plan = FaultPlan(path)
+        plan.inline("first")
+        plan.inline("second")
+        with self.assertRaisesRegex(RuntimeError, "plan:first"):
+            plan.inline("first")
+
+
+class TestAsyncFaultPlan(PlanTestCase, unittest.IsolatedAsyncioTestCase):
+    async def test_async_site_uses_async_sleep(self):
+        path = self.write("plan.json", {"sites": {"db": {"fault": "delay", "time_s": 0.5}}})
+        plan = FaultPlan(path)
+
+        @plan.site("db")
+        async def query():
+            return "rows"
+
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await query(), "rows")
+        sleep.assert_awaited_once_with(0.5)
+
+    async def test_async_raise(self):
+        path = self.write("plan.json", {"sites": {"db": {"fault": "raise"}}})
+        with self.assertRaises(RuntimeError):
+            await FaultPlan(path).inline_async("db")
+
+
+if __name__ == "__main__":
+    unittest.main()
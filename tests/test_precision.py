@@ -0,0 +1,116 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from fault_injection import delay, delay_inline, metrics, precision
+from fault_injection.precision import SleepReport
+
+
+class PrecisionTestCase(unittest.TestCase):
+    def setUp(self):
+        self._overshoot = precision._state.overshoot_s
+        self._enabled = precision._state.enabled
+        precision._state.overshoot_s = 0.0001
+
+    def tearDown(self):
+        precision._state.overshoot_s = self._overshoot
+        precision._state.enabled = self._enabled
+
+
+class TestCalibrate(PrecisionTestCase):
+    def test_stores_high_percentile_overshoot(self):
+        clock = iter(range(0, 10**9, 1000))
+
+        def fake_perf_counter_ns():
+            return next(clock)
+
+        with patch("fault_injection.precision.time.perf_counter_ns", fake_perf_counter_ns), \
+                patch("fault_injection.precision.time.sleep"):
+            overshoot = precision.calibrate(samples=10, probe_s=0.0000005)
+        self.assertAlmostEqual(overshoot, 0.0000005)
+        self.assertEqual(precision.overshoot_s(), overshoot)
+
+    def test_overshoot_is_calibrated_on_first_use(self):
+        precision._state.overshoot_s = None
+        with patch("fault_injection.precision.calibrate", return_value=0.00005) as calibrate:
+            self.assertEqual(precision.overshoot_s(), 0.00005)
+        calibrate.assert_called_once_with()
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            precision.calibrate(samples=0)
+        with self.assertRaises(ValueError):
+            precision.calibrate(probe_s=0)
+
+
+class TestPreciseSleep(PrecisionTestCase):
+    def test_sleeps_at_least_requested_time(self):
+        actual = precision.precise_sleep(0.0005)
+        self.assertGreaterEqual(actual, 0.0005)
+        self.assertEqual(precision.last_sleep_report(), SleepReport(0.0005, actual))
+        self.assertAlmostEqual(precision.last_sleep_report().error_s, actual - 0.0005)
+
+    def test_coarse_sleep_is_shortened_by_overshoot(self):
+        with patch("fault_injection.precision.time.sleep") as sleep:
+            precision.precise_sleep(0.0003)
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args.args[0], 0.0002)
+
+    def test_short_sleep_only_spins(self):
+        with patch("fault_injection.precision.time.sleep") as sleep:
+            precision.precise_sleep(0.00005)
+        sleep.assert_not_called()
+
+    def test_report_is_per_thread(self):
+        precision.precise_sleep(0)
+        reports = []
+        thread = threading.Thread(target=lambda: reports.append(precision.last_sleep_report()))
+        thread.start()
+        thread.join()
+        self.assertEqual(reports, [None])
+
+    def test_negative_time_raises(self):
+        with self.assertRaises(ValueError):
+            precision.precise_sleep(-1)
+
+
+class TestPrecisionMode(PrecisionTestCase):
+    def test_disabled_by_default_uses_time_sleep(self):
+        precision.disable()
+        with patch("fault_injection.delays.time.sleep") as sleep, \
+                patch("fault_injection.delays.precise_sleep") as precise_sleep:
+            delay_inline(0.001)
+        sleep.assert_called_once_with(0.001)
+        precise_sleep.assert_not_called()
+
+    def test_enabled_routes_delays_through_precise_sleep(self):
+        with precision.enabled():
+            self.assertTrue(precision.is_enabled())
+            with patch("fault_injection.delays.time.sleep") as sleep, \
+                    patch("fault_injection.delays.precise_sleep", return_value=0.0011) as precise:
+                delay(0.001)(lambda: None)()
+            sleep.assert_not_called()
+            precise.assert_called_once_with(0.001)
+        self.assertFalse(precision.is_enabled())
+
+    def test_enable_calibrates_once(self):
+        precision._state.overshoot_s = None
+        with patch("fault_injection.precision.calibrate") as calibrate:
+            precision.enable()
+            calibrate.assert_called_once_with()
+            precision._state.overshoot_s = 0.0001
+            precision.enable()
+            calibrate.assert_called_once_with()
+
+    def test_metrics_record_actual_and_requested_sleep(self):
+        metrics.site_metrics("precision").reset()
+        with precision.enabled(), \
+                patch("fault_injection.delays.precise_sleep", return_value=0.0012):
+            delay_inline(0.001, site="precision")
+        snapshot = metrics.site_metrics("precision").snapshot()
+        self.assertAlmostEqual(snapshot["sleep_total_s"], 0.0012)
+        self.assertAlmostEqual(snapshot["requested_sleep_total_s"], 0.001)
+
+
+if __name__ == "__main__":
+    unittest.main()
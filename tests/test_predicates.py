@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import delay, raise_, raise_at_nth_call
+from fault_injection.predicates import Condition, arg, when
+
+
+def upload(tenant, payload, /, retry=False, *, region="eu"):
+    return tenant
+
+
+class TestConditions(unittest.TestCase):
+    def check(self, condition, *args, **kwargs):
+        return condition.bind(upload)(args, kwargs)
+
+    def test_arguments_by_name_position_and_default(self):
+        self.assertTrue(self.check(arg(0).equals("acme"), "acme", b""))
+        self.assertTrue(self.check(arg("retry").equals(True), "acme", b"", True))
+        self.assertTrue(self.check(arg("retry").equals(True), "acme", b"", retry=True))
+        self.assertTrue(self.check(arg("retry").equals(False), "acme", b""))
+        self.assertTrue(self.check(arg("region").equals("us"), "acme", b"", region="us"))
+        self.assertTrue(self.check(arg("region").equals("eu"), "acme", b""))
+
+    def test_is_in_between_and_matches(self):
+        self.assertTrue(self.check(arg("tenant").is_in(["acme", "globex"]), "globex", b""))
+        self.assertFalse(self.check(arg("tenant").is_in(["acme"]), ["unhashable"], b""))
+        self.assertTrue(self.check(arg("tenant").is_in([["unhashable"]]), ["unhashable"], b""))
+        size = arg("payload", key=len)
+        self.assertTrue(self.check(size.between(3), "a", b"abc"))
+        self.assertFalse(self.check(size.between(1, 3), "a", b"abc"))
+        self.assertTrue(self.check(size.between(high=4), "a", b"abc"))
+        self.assertFalse(self.check(arg("tenant").between(1), "a", b""))
+        self.assertTrue(self.check(arg("tenant").matches(str.isupper), "ACME", b""))
+
+    def test_combinators(self):
+        condition = arg("tenant").equals("acme") & ~arg("retry").equals(True) | arg(1).equals(b"")
+        self.assertTrue(self.check(condition, "acme", b"x"))
+        self.assertFalse(self.check(condition, "acme", b"x", True))
+        self.assertTrue(self.check(condition, "other", b""))
+        self.assertEqual(repr(~arg("tenant").equals("a")), "~arg('tenant').equals('a')")
+
+    def test_items_of_var_positional_are_read_by_position(self):
+        def log(level, *items, **extra):
+            return items
+
+        self.assertTrue(arg(0).equals("info").bind(log)(("info", 1), {}))
+        self.assertTrue(arg(1).equals(1).bind(log)(("info", 1, 2), {}))
+        self.assertTrue(arg(2).equals(2).bind(log)(("info", 1, 2), {}))
+        self.assertTrue(arg(3).equals(None).bind(log)(("info", 1, 2), {}))
+        guarded = when(arg(0).equals(1), raise_())(lambda *items: items)
+        with self.assertRaises(RuntimeError):
+            guarded(1, 2)
+        self.assertEqual(guarded(2, 1), (2, 1))
+        for name in ("items", "extra"):
+            with self.subTest(name=name), self.assertRaisesRegex(ValueError, "variadic"):
+                arg(name).equals(1).bind(log)
+
+    def test_positions_count_positional_parameters_only(self):
+        def send(batch, *, retries=7):
+            return batch
+
+        with self.assertRaisesRegex(ValueError, "no argument at position 1"):
+            arg(1).equals(7).bind(send)
+        with self.assertRaisesRegex(ValueError, "no argument at position 9"):
+            when(arg(9).equals(None), raise_())(upload)
+        self.assertTrue(arg("retries").equals(7).bind(send)(([],), {}))
+
+    def test_condition_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Condition()
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            arg(-1)
+        with self.assertRaises(ValueError):
+            arg("tenant").between()
+        with self.assertRaisesRegex(ValueError, "no argument 'missing'"):
+            when(arg("missing").equals(1), raise_())(upload)
+
+
+class TestWhen(unittest.TestCase):
+    def test_only_matching_calls_are_injected(self):
+        guarded = when(arg("tenant").equals("acme"), raise_("acme down"))(upload)
+        self.assertEqual(guarded("globex", b""), "globex")
+        with self.assertRaisesRegex(RuntimeError, "acme down"):
+            guarded("acme", b"")
+        self.assertIs(guarded.__wrapped__, upload)
+
+    def test_skipped_calls_do_not_advance_counters(self):
+        def get(key):
+            return key
+
+        guarded = when(arg("key").equals("hot"), raise_at_nth_call(n=2))(get)
+        guarded("cold")
+        guarded("hot")
+        guarded("cold")
+        with self.assertRaises(RuntimeError):
+            guarded("hot")
+
+    def test_methods_count_self(self):
+        class Client:
+            @when(arg(1).equals("bad"), raise_())
+            def send(self, payload):
+                return payload
+
+        self.assertEqual(Client().send("good"), "good")
+        with self.assertRaises(RuntimeError):
+            Client().send(payload="bad")
+
+    def test_disabled_decorator_returns_function(self):
+        self.assertIs(when(arg("missing").equals(1), raise_(disable=True))(upload), upload)
+
+
+class TestWhenAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_async_function(self):
+        async def fetch(key):
+            return key
+
+        guarded = when(arg("key").equals("slow"), delay(0.2))(fetch)
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await guarded("fast"), "fast")
+            self.assertEqual(await guarded("slow"), "slow")
+        sleep.assert_awaited_once_with(0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import enabled
+from fault_injection.distributions import Replay
+from fault_injection.profiles import (
+    MAGIC,
+    LatencyProfile,
+    ProfileRecorder,
+    delay_replay,
+    record_latency,
+    recorder,
+)
+
+
+class ProfileTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "latency.prof")
+
+
+class TestProfileRecorder(ProfileTestCase):
+    def test_samples_are_buffered_and_appended(self):
+        with ProfileRecorder(self.path, flush_every=2) as rec:
+            rec.record_ns(10)
+            self.assertEqual(os.path.getsize(self.path), len(MAGIC))
+            rec.record_ns(20)
+            self.assertEqual(os.path.getsize(self.path), len(MAGIC) + 16)
+            rec.record_ns(30)
+        self.assertEqual(list(LatencyProfile.load(self.path).samples_ns), [10, 20, 30])
+
+        with ProfileRecorder(self.path) as rec:
+            rec.record_ns(40)
+        self.assertEqual(list(LatencyProfile.load(self.path).samples_ns), [10, 20, 30, 40])
+
+    def test_truncated_trailing_sample_is_ignored(self):
+        with ProfileRecorder(self.path) as rec:
+            rec.record_ns(5)
+        with open(self.path, "ab") as file:
+            file.write(b"\x01\x02\x03")
+        self.assertEqual(list(LatencyProfile.load(self.path).samples_ns), [5])
+
+    def test_recording_after_a_truncated_sample_stays_aligned(self):
+        with ProfileRecorder(self.path) as rec:
+            rec.record_ns(5)
+        with open(self.path, "ab") as file:
+            file.write(b"\x01\x02\x03")
+        with ProfileRecorder(self.path) as rec:
+            rec.record_ns(6)
+            rec.record_ns(7)
+        self.assertEqual(list(LatencyProfile.load(self.path).samples_ns), [5, 6, 7])
+        self.assertEqual(os.path.getsize(self.path), len(MAGIC) + 24)
+
+    def test_rejects_foreign_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a profile")
+        with self.assertRaises(ValueError):
+            ProfileRecorder(self.path)
+        with self.assertRaises(ValueError):
+            LatencyProfile.load(self.path)
+        with self.assertRaises(ValueError):
+            ProfileRecorder(self.path + ".new", flush_every=0)
+
+    def test_recorder_is_shared_per_path(self):
+        shared = recorder(self.path)
+        self.addCleanup(shared.close)
+        self.assertIs(recorder(self.path), shared)
+
+
+class TestRecordLatency(ProfileTestCase):
+    def test_records_every_call_including_failures(self):
+        clock = iter([1_000, 1_250, 2_000, 2_900])
+
+        def call(fail=False):
+            if fail:
+                raise KeyError("boom")
+            return "ok"
+
+        with ProfileRecorder(self.path) as rec, \
+                patch("fault_injection.profiles.time.perf_counter_ns", lambda: next(clock)):
+            recorded = record_latency(rec)(call)
+            self.assertEqual(recorded(), "ok")
+            with self.assertRaises(KeyError):
+                recorded(fail=True)
+        self.assertEqual(list(LatencyProfile.load(self.path).samples_ns), [250, 900])
+
+    def test_disable_returns_function(self):
+        def call():
+            return "ok"
+
+        self.assertIs(record_latency(self.path, disable=True)(call), call)
+        with enabled(False):
+            self.assertIs(record_latency(self.path)(call), call)
+
+    def test_calls_are_not_recorded_while_switch_is_off(self):
+        with ProfileRecorder(self.path) as rec:
+            recorded = record_latency(rec)(lambda: "ok")
+            with enabled(False):
+                self.assertEqual(recorded(), "ok")
+            recorded()
+        self.assertEqual(len(LatencyProfile.load(self.path)), 1)
+
+
+class TestReplay(ProfileTestCase):
+    def write_profile(self, samples_ns):
+        with ProfileRecorder(self.path) as rec:
+            for sample in samples_ns:
+                rec.record_ns(sample)
+
+    def test_replays_in_recorded_order_and_wraps_around(self):
+        self.write_profile([1_000_000, 5_000_000, 2_000_000])
+
+        @delay_replay(self.path)
+        def call():
+            return "ok"
+
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            for _ in range(4):
+                call()
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.001, 0.005, 0.002, 0.001])
+
+    def test_sampled_replay_stays_within_recorded_range(self):
+        self.write_profile([1_000_000, 3_000_000])
+
+        @delay_replay(LatencyProfile.load(self.path), sampled=True)
+        def call():
+            return "ok"
+
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            for _ in range(50):
+                call()
+        delays = [c.args[0] for c in sleep.call_args_list]
+        self.assertTrue(all(0.001 <= delay <= 0.003 for delay in delays))
+
+    def test_empty_profile_raises(self):
+        self.write_profile([])
+        with self.assertRaises(ValueError):
+            delay_replay(self.path)
+        with self.assertRaises(ValueError):
+            Replay([])
+
+
+class TestAsyncRecordAndReplay(ProfileTestCase, unittest.IsolatedAsyncioTestCase):
+    async def test_round_trip(self):
+        with ProfileRecorder(self.path) as rec:
+            @record_latency(rec)
+            async def call():
+                return "ok"
+
+            self.assertEqual(await call(), "ok")
+        profile = LatencyProfile.load(self.path)
+        self.assertEqual(len(profile), 1)
+
+        replayed = delay_replay(profile, max_time_s=0.5)(call.__wrapped__)
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await replayed(), "ok")
+        self.assertAlmostEqual(sleep.await_args.args[0], profile.samples_ns[0] / 1e9)
+
+
+if __name__ == "__main__":
+    unittest.main()
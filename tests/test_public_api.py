@@ -2,17 +2,45 @@ import unittest
 
 from fault_injection import (
     delay,
+    delay_bytes,
+    delay_bytes_async,
+    delay_by_size,
+    delay_by_size_inline,
+    delay_by_size_inline_async,
+    delay_distribution,
+    delay_distribution_inline,
+    delay_distribution_inline_async,
+    delay_items,
+    delay_items_async,
     delay_at_nth_call,
     delay_at_nth_call_inline,
+    delay_at_nth_call_inline_async,
     delay_inline,
+    delay_inline_async,
+    delay_on_schedule,
+    delay_on_schedule_inline,
+    delay_on_schedule_inline_async,
+    delay_rate_limited,
+    delay_rate_limited_inline,
+    delay_rate_limited_inline_async,
     delay_random,
     delay_random_inline,
+    delay_random_inline_async,
     delay_random_norm,
     delay_random_norm_inline,
+    delay_random_norm_inline_async,
     raise_,
+    raise_after_bytes,
+    raise_after_bytes_async,
+    raise_at_nth_item,
+    raise_at_nth_item_async,
     raise_at_nth_call,
     raise_at_nth_call_inline,
     raise_inline,
+    raise_on_schedule,
+    raise_on_schedule_inline,
+    raise_rate_limited,
+    raise_rate_limited_inline,
     raise_random,
     raise_random_inline,
 )
@@ -28,12 +56,40 @@ class TestPublicApi(unittest.TestCase):
         self.assertTrue(callable(delay_random_inline))
         self.assertTrue(callable(delay_random_norm))
         self.assertTrue(callable(delay_random_norm_inline))
+        self.assertTrue(callable(delay_inline_async))
+        self.assertTrue(callable(delay_at_nth_call_inline_async))
+        self.assertTrue(callable(delay_random_inline_async))
+        self.assertTrue(callable(delay_random_norm_inline_async))
+        self.assertTrue(callable(delay_on_schedule))
+        self.assertTrue(callable(delay_on_schedule_inline))
+        self.assertTrue(callable(delay_on_schedule_inline_async))
+        self.assertTrue(callable(delay_rate_limited))
+        self.assertTrue(callable(delay_rate_limited_inline))
+        self.assertTrue(callable(delay_rate_limited_inline_async))
         self.assertTrue(callable(raise_))
         self.assertTrue(callable(raise_at_nth_call))
         self.assertTrue(callable(raise_at_nth_call_inline))
         self.assertTrue(callable(raise_inline))
+        self.assertTrue(callable(raise_on_schedule))
+        self.assertTrue(callable(raise_on_schedule_inline))
+        self.assertTrue(callable(raise_rate_limited))
+        self.assertTrue(callable(raise_rate_limited_inline))
         self.assertTrue(callable(raise_random))
         self.assertTrue(callable(raise_random_inline))
+        self.assertTrue(callable(delay_distribution))
+        self.assertTrue(callable(delay_by_size))
+        self.assertTrue(callable(delay_by_size_inline))
+        self.assertTrue(callable(delay_by_size_inline_async))
+        self.assertTrue(callable(delay_distribution_inline))
+        self.assertTrue(callable(delay_distribution_inline_async))
+        self.assertTrue(callable(delay_items))
+        self.assertTrue(callable(delay_items_async))
+        self.assertTrue(callable(delay_bytes))
+        self.assertTrue(callable(delay_bytes_async))
+        self.assertTrue(callable(raise_at_nth_item))
+        self.assertTrue(callable(raise_at_nth_item_async))
+        self.assertTrue(callable(raise_after_bytes))
+        self.assertTrue(callable(raise_after_bytes_async))
 
 
 if __name__ == "__main__":
@@ -134,8 +134,7 @@ class TestRaiseRandomInline(unittest.TestCase):
 
 class TestRaiseNthDecorator(unittest.TestCase):
     def setUp(self):
-        if hasattr(raise_at_nth_call, "n_called_dict"):
-            raise_at_nth_call.n_called_dict = {}
+        raise_at_nth_call.counters.reset()
 
     def test_raises_at_n1(self):
         @raise_at_nth_call(n=1, func_id=1)
@@ -216,8 +215,7 @@ class TestRaiseNthDecorator(unittest.TestCase):
 
 class TestRaiseNthInline(unittest.TestCase):
     def setUp(self):
-        if hasattr(raise_at_nth_call_inline, "n_called_dict"):
-            raise_at_nth_call_inline.n_called_dict = {}
+        raise_at_nth_call_inline.counters.reset()
 
     def test_raises_at_n1(self):
         with self.assertRaisesRegex(RuntimeError, "raise_at_nth_call_inline exception is raised\nFunc id 1"):
@@ -276,5 +274,54 @@ class TestRaiseNthInline(unittest.TestCase):
                 with self.assertRaises(ValueError):
                     raise_at_nth_call_inline(n=invalid_n)
 
+
+class TestAsyncRaiseDecorators(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        raise_at_nth_call.counters.reset()
+
+    async def test_raise_raises_when_coroutine_is_awaited(self):
+        @raise_()
+        async def add(a, b):
+            return a + b
+
+        coroutine = add(1, 2)
+        with self.assertRaisesRegex(RuntimeError, "raise_ exception is raised"):
+            await coroutine
+
+    async def test_raise_disable_awaits_wrapped_coroutine(self):
+        @raise_(disable=True)
+        async def add(a, b):
+            return a + b
+
+        self.assertEqual(await add(2, 3), 5)
+
+    async def test_raise_at_nth_call_raises_on_nth_await(self):
+        @raise_at_nth_call(n=2, func_id=1)
+        async def add(a, b):
+            return a + b
+
+        self.assertEqual(await add(1, 2), 3)
+        with self.assertRaisesRegex(RuntimeError, r"\nFunc id 1\Z"):
+            await add(1, 2)
+        self.assertEqual(await add(1, 2), 3)
+
+    async def test_raise_random_raises_when_random_value_is_below_threshold(self):
+        with patch("fault_injection.raise_exception.random.random", return_value=0.19):
+            @raise_random(prob_of_raise=0.2)
+            async def add(a, b):
+                return a + b
+
+            with self.assertRaisesRegex(RuntimeError, "raise_random exception is raised"):
+                await add(1, 2)
+
+    async def test_raise_random_awaits_wrapped_coroutine_above_threshold(self):
+        with patch("fault_injection.raise_exception.random.random", return_value=0.9):
+            @raise_random(prob_of_raise=0.2)
+            async def add(a, b):
+                return a + b
+
+            self.assertEqual(await add(3, 4), 7)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,189 @@
+import threading
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import (
+    delay_rate_limited,
+    delay_rate_limited_inline,
+    delay_rate_limited_inline_async,
+    raise_rate_limited,
+    raise_rate_limited_inline,
+)
+from fault_injection.clock import virtual_time
+from fault_injection.rate_limit import BucketStore, TokenBucket
+
+
+def count_raises(call, calls):
+    raised = 0
+    for _ in range(calls):
+        try:
+            call()
+        except RuntimeError:
+            raised += 1
+    return raised
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_sustained_rate(self):
+        with virtual_time(start_s=100) as clock:
+            bucket = TokenBucket(rate_per_s=10, burst=3)
+            self.assertEqual([bucket.try_acquire() for _ in range(5)],
+                             [True, True, True, False, False])
+            clock.advance(0.1)
+            self.assertTrue(bucket.try_acquire())
+            self.assertFalse(bucket.try_acquire())
+
+            allowed = 0
+            for _ in range(10_000):
+                clock.advance(0.001)
+                allowed += bucket.try_acquire()
+            self.assertEqual(allowed, 100)
+
+    def test_idle_bucket_refills_only_up_to_burst(self):
+        with virtual_time() as clock:
+            bucket = TokenBucket(rate_per_s=1, burst=2)
+            clock.advance(3600)
+            self.assertEqual(sum(bucket.try_acquire() for _ in range(10)), 2)
+
+    def test_reset_refills(self):
+        with virtual_time():
+            bucket = TokenBucket(rate_per_s=1)
+            self.assertTrue(bucket.try_acquire())
+            self.assertFalse(bucket.try_acquire())
+            bucket.reset()
+            self.assertTrue(bucket.try_acquire())
+
+    def test_concurrent_acquire_never_exceeds_burst(self):
+        bucket = TokenBucket(rate_per_s=1e-6, burst=50)
+        allowed = []
+
+        def worker():
+            allowed.append(sum(bucket.try_acquire() for _ in range(1000)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(allowed), 50)
+
+    def test_validation(self):
+        for kwargs in ({"rate_per_s": 0}, {"rate_per_s": -1}, {"burst": 0}, {"burst": 1.5}):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    TokenBucket(**kwargs)
+
+    def test_store_keeps_first_rate(self):
+        store = BucketStore()
+        bucket = store.get("id", rate_per_s=5)
+        self.assertIs(store.get("id", rate_per_s=50), bucket)
+        self.assertEqual(bucket.rate_per_s, 5)
+        store.reset("id")
+        self.assertNotIn("id", store)
+
+
+class TestRaiseRateLimited(unittest.TestCase):
+    def setUp(self):
+        raise_rate_limited_inline.buckets.reset()
+
+    def test_fault_volume_does_not_scale_with_throughput(self):
+        for calls_per_s in (1_000, 100_000):
+            with self.subTest(calls_per_s=calls_per_s), virtual_time() as clock:
+                @raise_rate_limited(rate_per_s=10)
+                def call():
+                    return "ok"
+
+                raised = 0
+                for _ in range(calls_per_s):
+                    clock.advance(1 / calls_per_s)
+                    raised += count_raises(call, 1)
+                self.assertIn(raised, (10, 11))
+
+    def test_inline_buckets_are_keyed_by_func_id(self):
+        with virtual_time():
+            first = count_raises(
+                lambda: raise_rate_limited_inline(rate_per_s=1, burst=2, func_id="a"), 5
+            )
+            second = count_raises(
+                lambda: raise_rate_limited_inline(rate_per_s=1, burst=3, func_id="b"), 5
+            )
+        self.assertEqual((first, second), (2, 3))
+
+    def test_shared_bucket(self):
+        with virtual_time():
+            bucket = TokenBucket(rate_per_s=1, burst=2)
+
+            @raise_rate_limited(bucket=bucket)
+            def first():
+                return "ok"
+
+            @raise_rate_limited(bucket=bucket)
+            def second():
+                return "ok"
+
+            self.assertEqual(count_raises(first, 5) + count_raises(second, 5), 2)
+
+    def test_disabled(self):
+        self.assertEqual(count_raises(lambda: raise_rate_limited_inline(disable=True), 3), 0)
+        self.assertEqual(len(raise_rate_limited_inline.buckets), 0)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            raise_rate_limited(rate_per_s=0)
+        with self.assertRaises(ValueError):
+            raise_rate_limited_inline(burst=0)
+
+
+class TestDelayRateLimited(unittest.TestCase):
+    def setUp(self):
+        delay_rate_limited_inline.buckets.reset()
+
+    def test_decorator_delays_at_most_burst_calls(self):
+        @delay_rate_limited(time_s=0.2, rate_per_s=1e-6, burst=2)
+        def call():
+            return "ok"
+
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            for _ in range(5):
+                self.assertEqual(call(), "ok")
+        self.assertEqual(sleep.call_count, 2)
+        sleep.assert_called_with(0.2)
+
+    def test_inline(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            for _ in range(5):
+                delay_rate_limited_inline(0.1, rate_per_s=1e-6, func_id="inline")
+        sleep.assert_called_once_with(0.1)
+
+    def test_negative_time_raises(self):
+        with self.assertRaises(ValueError):
+            delay_rate_limited(time_s=-1)
+        with self.assertRaises(ValueError):
+            delay_rate_limited_inline(time_s=-1)
+
+
+class TestAsyncDelayRateLimited(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        delay_rate_limited_inline.buckets.reset()
+
+    async def test_inline_async_shares_inline_buckets(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep, \
+                patch("fault_injection.delays.time.sleep") as sync_sleep:
+            delay_rate_limited_inline(0.3, rate_per_s=1e-6, func_id="shared")
+            await delay_rate_limited_inline_async(0.3, rate_per_s=1e-6, func_id="shared")
+        sync_sleep.assert_called_once_with(0.3)
+        sleep.assert_not_awaited()
+
+    async def test_decorator_on_coroutine(self):
+        @delay_rate_limited(time_s=0.1, rate_per_s=1e-6)
+        async def call():
+            return "ok"
+
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await call(), "ok")
+            self.assertEqual(await call(), "ok")
+        sleep.assert_awaited_once_with(0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
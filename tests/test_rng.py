@@ -0,0 +1,143 @@
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from fault_injection import delay_random_inline, raise_random
+from fault_injection import rng
+from fault_injection.rng import SiteStream, site_stream
+
+
+class RngTestCase(unittest.TestCase):
+    def setUp(self):
+        self._seed = rng._state.seed
+
+    def tearDown(self):
+        rng.set_seed(self._seed)
+
+
+class TestMasterSeed(RngTestCase):
+    def test_seed_is_read_from_environment(self):
+        rng._state.seed = None
+        with patch.dict(os.environ, {rng.ENV_VAR: "1234"}):
+            self.assertEqual(rng.get_seed(), 1234)
+
+    def test_seed_is_drawn_when_environment_is_unset(self):
+        rng._state.seed = None
+        with patch.dict(os.environ, {}, clear=True):
+            seed = rng.get_seed()
+        self.assertIsInstance(seed, int)
+        self.assertEqual(rng.get_seed(), seed)
+
+    def test_invalid_environment_seed_raises(self):
+        rng._state.seed = None
+        with patch.dict(os.environ, {rng.ENV_VAR: "not-a-seed"}):
+            with self.assertRaises(ValueError):
+                rng.get_seed()
+
+
+class TestSiteStream(RngTestCase):
+    def test_same_seed_replays_the_same_sequence(self):
+        rng.set_seed(42)
+        first = [site_stream("db").random() for _ in range(5)]
+        rng.set_seed(42)
+        self.assertEqual([site_stream("db").random() for _ in range(5)], first)
+
+    def test_sites_and_seeds_are_independent(self):
+        rng.set_seed(42)
+        db = [site_stream("db").random() for _ in range(5)]
+        rng.set_seed(42)
+        cache = [site_stream("cache").random() for _ in range(5)]
+        rng.set_seed(43)
+        other_seed = [site_stream("db").random() for _ in range(5)]
+        self.assertNotEqual(db, cache)
+        self.assertNotEqual(db, other_seed)
+
+    def test_threads_draw_from_their_own_substream(self):
+        rng.set_seed(7)
+        stream = SiteStream("threads")
+        results = {}
+
+        def worker(name):
+            results[name] = [stream.random() for _ in range(5)]
+
+        def run():
+            threads = [
+                threading.Thread(target=worker, args=(name,), name=name)
+                for name in ("worker-1", "worker-2")
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return dict(results)
+
+        first = run()
+        stream.reset()
+        self.assertEqual(run(), first)
+        self.assertNotEqual(first["worker-1"], first["worker-2"])
+
+    def test_threads_with_the_same_name_get_distinct_substreams(self):
+        rng.set_seed(7)
+        stream = SiteStream("same-name")
+        results = []
+
+        def worker():
+            results.append([stream.random() for _ in range(5)])
+
+        for _ in range(3):
+            thread = threading.Thread(target=worker, name="worker")
+            thread.start()
+            thread.join()
+        self.assertEqual(len({tuple(result) for result in results}), 3)
+
+    def test_site_stream_is_cached(self):
+        self.assertIs(site_stream("cached"), site_stream("cached"))
+
+
+class TestHelpersUseSiteStreams(RngTestCase):
+    def test_site_replays_fault_sequence(self):
+        def run():
+            rng.set_seed(2024)
+
+            @raise_random(prob_of_raise=0.5, site="replay")
+            def call():
+                return "ok"
+
+            outcomes = []
+            for _ in range(50):
+                try:
+                    outcomes.append(call())
+                except RuntimeError:
+                    outcomes.append("fault")
+            return outcomes
+
+        first = run()
+        self.assertEqual(run(), first)
+        self.assertIn("fault", first)
+        self.assertIn("ok", first)
+
+    def test_site_does_not_touch_global_random(self):
+        with patch("fault_injection.delays.random.random") as global_random, \
+                patch("fault_injection.delays.time.sleep"):
+            delay_random_inline(0.1, site="isolated")
+        global_random.assert_not_called()
+
+    def test_explicit_rng_wins_over_site_stream(self):
+        with patch.object(SiteStream, "random") as stream_random, \
+                patch("fault_injection.delays.time.sleep") as sleep:
+            delay_random_inline(0.4, rng=FixedRandom(0.5), site="explicit")
+        stream_random.assert_not_called()
+        sleep.assert_called_once_with(0.2)
+
+
+class FixedRandom:
+    def __init__(self, value):
+        self.value = value
+
+    def random(self):
+        return self.value
+
+
+if __name__ == "__main__":
+    unittest.main()
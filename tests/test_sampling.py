@@ -0,0 +1,123 @@
+import statistics
+import threading
+import unittest
+from unittest.mock import patch
+
+from fault_injection import delay_random, delay_random_norm_inline, raise_random
+from fault_injection.sampling import BatchSampler, numpy
+
+
+class TestBatchSampler(unittest.TestCase):
+    def test_rejects_invalid_batch_size(self):
+        for invalid_batch_size in (0, -1, 1.5):
+            with self.subTest(invalid_batch_size=invalid_batch_size):
+                with self.assertRaisesRegex(ValueError, "batch_size should be a positive integer."):
+                    BatchSampler(batch_size=invalid_batch_size)
+
+    def test_random_samples_are_uniform_in_unit_interval(self):
+        sampler = BatchSampler(batch_size=100, seed=1, use_numpy=False)
+        samples = [sampler.random() for _ in range(10_000)]
+        self.assertTrue(all(0 <= sample < 1 for sample in samples))
+        self.assertAlmostEqual(statistics.fmean(samples), 0.5, delta=0.02)
+
+    def test_gauss_samples_match_requested_distribution(self):
+        sampler = BatchSampler(batch_size=100, seed=1, use_numpy=False)
+        samples = [sampler.gauss(0.3, 0.1) for _ in range(10_000)]
+        self.assertAlmostEqual(statistics.fmean(samples), 0.3, delta=0.01)
+        self.assertAlmostEqual(statistics.pstdev(samples), 0.1, delta=0.01)
+
+    def test_same_seed_gives_same_samples(self):
+        first = BatchSampler(batch_size=16, seed=42, use_numpy=False)
+        second = BatchSampler(batch_size=16, seed=42, use_numpy=False)
+        self.assertEqual(
+            [first.random() for _ in range(40)],
+            [second.random() for _ in range(40)],
+        )
+
+    def test_does_not_use_global_random_state(self):
+        sampler = BatchSampler(batch_size=16, use_numpy=False)
+        with patch(
+            "fault_injection.sampling.random.random",
+            side_effect=AssertionError("global random should not be used"),
+        ):
+            sampler.random()
+            sampler.gauss(0.3, 0.1)
+
+    def test_threads_use_independent_buffers(self):
+        sampler = BatchSampler(batch_size=8, seed=3, use_numpy=False)
+        results = {}
+
+        def worker(name):
+            results[name] = [sampler.random() for _ in range(20)]
+
+        threads = [threading.Thread(target=worker, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results["a"]), 20)
+        self.assertNotEqual(results["a"], results["b"])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_refill(self):
+        sampler = BatchSampler(batch_size=1000, seed=1)
+        self.assertTrue(sampler.use_numpy)
+        samples = [sampler.random() for _ in range(5000)]
+        self.assertIsInstance(samples[0], float)
+        self.assertAlmostEqual(statistics.fmean(samples), 0.5, delta=0.03)
+
+
+class _FixedSampler:
+    def __init__(self, value):
+        self.value = value
+
+    def random(self):
+        return self.value
+
+    def gauss(self, mu, sigma):
+        return mu + sigma * self.value
+
+
+class TestRandomHelpersWithSampler(unittest.TestCase):
+    def test_delay_random_uses_sampler(self):
+        with patch(
+            "fault_injection.delays.random.random",
+            side_effect=AssertionError("global random should not be used"),
+        ):
+            with patch("fault_injection.delays.time.sleep") as sleep_mock:
+                @delay_random(0.4, rng=_FixedSampler(0.5))
+                def add(a, b):
+                    return a + b
+
+                self.assertEqual(add(1, 2), 3)
+                sleep_mock.assert_called_once_with(0.2)
+
+    def test_delay_random_norm_inline_uses_sampler(self):
+        with patch("fault_injection.delays.time.sleep") as sleep_mock:
+            delay_random_norm_inline(mean_time_s=0.3, std_time_s=0.1, rng=_FixedSampler(-10))
+            sleep_mock.assert_called_once_with(0)
+
+    def test_raise_random_uses_sampler(self):
+        @raise_random(prob_of_raise=0.2, rng=_FixedSampler(0.1))
+        def add(a, b):
+            return a + b
+
+        with self.assertRaises(RuntimeError):
+            add(1, 2)
+
+    def test_raise_random_with_batch_sampler_keeps_probability(self):
+        @raise_random(prob_of_raise=0.25, rng=BatchSampler(batch_size=256, seed=7))
+        def add(a, b):
+            return a + b
+
+        raised = 0
+        for _ in range(10_000):
+            try:
+                add(1, 2)
+            except RuntimeError:
+                raised += 1
+        self.assertAlmostEqual(raised / 10_000, 0.25, delta=0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
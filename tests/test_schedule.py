@@ -0,0 +1,156 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import (
+    delay_on_schedule,
+    delay_on_schedule_inline,
+    delay_on_schedule_inline_async,
+    raise_on_schedule,
+    raise_on_schedule_inline,
+)
+from fault_injection import schedule
+from fault_injection.counters import CounterStore
+from fault_injection.schedule import Schedule
+
+
+def firing_calls(plan, calls=30):
+    return [count for count in range(1, calls + 1) if plan.fires(count)]
+
+
+class TestSchedule(unittest.TestCase):
+    def test_constructors(self):
+        self.assertEqual(firing_calls(schedule.at(7)), [7])
+        self.assertEqual(firing_calls(schedule.every(10)), [10, 20, 30])
+        self.assertEqual(firing_calls(schedule.every(10, start=3, stop=23)), [3, 13, 23])
+        self.assertEqual(firing_calls(schedule.window(5, 8)), [5, 6, 7, 8])
+        self.assertEqual(firing_calls(schedule.first(3)), [1, 2, 3])
+        self.assertEqual(firing_calls(schedule.after(27)), [28, 29, 30])
+        self.assertEqual(firing_calls(schedule.after(0), 3), [1, 2, 3])
+
+    def test_fires_is_constant_time_for_large_counts(self):
+        plan = schedule.every(500)
+        self.assertTrue(plan.fires(10 ** 18))
+        self.assertFalse(plan.fires(10 ** 18 + 1))
+
+    def test_equality_and_repr(self):
+        self.assertEqual(schedule.first(5), Schedule(1, 5))
+        self.assertEqual(hash(schedule.at(3)), hash(Schedule(3, 3)))
+        self.assertEqual(repr(schedule.every(2)), "Schedule(start=2, stop=None, period=2)")
+
+    def test_validation(self):
+        for kwargs in ({"start": 0}, {"start": 1.5}, {"period": 0}, {"start": 5, "stop": 4}):
+            with self.subTest(kwargs=kwargs):
+                with self.assertRaises(ValueError):
+                    Schedule(**kwargs)
+        with self.assertRaises(ValueError):
+            schedule.after(-1)
+
+
+class TestRaiseOnSchedule(unittest.TestCase):
+    def setUp(self):
+        raise_on_schedule.counters.reset()
+        raise_on_schedule_inline.counters.reset()
+
+    def test_decorator_raises_on_every_scheduled_call(self):
+        @raise_on_schedule(schedule.every(3), msg="boom", func_id="every")
+        def call():
+            return "ok"
+
+        outcomes = []
+        for _ in range(9):
+            try:
+                outcomes.append(call())
+            except RuntimeError as error:
+                outcomes.append(str(error))
+        self.assertEqual(outcomes[:3], ["ok", "ok", "boom\nFunc id every, call 3"])
+        self.assertEqual(outcomes.count("ok"), 6)
+
+    def test_inline_window(self):
+        raised = []
+        for count in range(1, 8):
+            try:
+                raise_on_schedule_inline(schedule.window(3, 5), func_id="window")
+            except RuntimeError:
+                raised.append(count)
+        self.assertEqual(raised, [3, 4, 5])
+
+    def test_per_function_counter(self):
+        @raise_on_schedule(schedule.first(1), func_id=None)
+        def first():
+            return "first"
+
+        @raise_on_schedule(schedule.first(1), func_id=None)
+        def second():
+            return "second"
+
+        with self.assertRaisesRegex(RuntimeError, "first"):
+            first()
+        with self.assertRaises(RuntimeError):
+            second()
+        self.assertEqual(first(), "first")
+
+    def test_custom_counter_store(self):
+        store = CounterStore()
+        raise_on_schedule_inline(schedule.after(1), func_id="custom", counters=store)
+        self.assertEqual(store.snapshot(), {"custom": 1})
+        self.assertEqual(raise_on_schedule_inline.counters.snapshot(), {})
+
+    def test_disabled_does_not_count(self):
+        raise_on_schedule_inline(schedule.first(1), func_id="off", disable=True)
+        self.assertEqual(raise_on_schedule_inline.counters.snapshot(), {})
+
+
+class TestDelayOnSchedule(unittest.TestCase):
+    def setUp(self):
+        delay_on_schedule.counters.reset()
+        delay_on_schedule_inline.counters.reset()
+
+    def test_decorator_delays_after_n(self):
+        @delay_on_schedule(schedule.after(2), time_s=0.5, func_id="after")
+        def call():
+            return "ok"
+
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            for _ in range(4):
+                self.assertEqual(call(), "ok")
+        self.assertEqual(sleep.call_count, 2)
+        sleep.assert_called_with(0.5)
+
+    def test_inline_every(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            for _ in range(10):
+                delay_on_schedule_inline(schedule.every(5), time_s=0.2, func_id="every")
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_negative_time_raises(self):
+        with self.assertRaises(ValueError):
+            delay_on_schedule(schedule.first(1), time_s=-1)
+        with self.assertRaises(ValueError):
+            delay_on_schedule_inline(schedule.first(1), time_s=-1)
+
+
+class TestAsyncDelayOnSchedule(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        delay_on_schedule.counters.reset()
+        delay_on_schedule_inline.counters.reset()
+
+    async def test_inline_async_shares_inline_counters(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep, \
+                patch("fault_injection.delays.time.sleep"):
+            delay_on_schedule_inline(schedule.at(2), time_s=0.3, func_id="shared")
+            await delay_on_schedule_inline_async(schedule.at(2), time_s=0.3, func_id="shared")
+        sleep.assert_awaited_once_with(0.3)
+
+    async def test_decorator_on_coroutine(self):
+        @delay_on_schedule(schedule.first(1), time_s=0.1, func_id=None)
+        async def call():
+            return "ok"
+
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            self.assertEqual(await call(), "ok")
+            self.assertEqual(await call(), "ok")
+        sleep.assert_awaited_once_with(0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import itertools
+import unittest
+from unittest.mock import AsyncMock, call, patch
+
+from fault_injection import (
+    delay_bytes,
+    delay_bytes_async,
+    delay_items,
+    delay_items_async,
+    disable,
+    enable,
+    raise_after_bytes,
+    raise_after_bytes_async,
+    raise_at_nth_item,
+    raise_at_nth_item_async,
+)
+from fault_injection import metrics, schedule
+
+
+async def agen(items):
+    for item in items:
+        yield item
+
+
+async def collect(aiterable):
+    return [item async for item in aiterable]
+
+
+class TestSyncStreams(unittest.TestCase):
+    def test_delay_items_delays_every_item_lazily(self):
+        pulled = []
+
+        def source():
+            for item in range(3):
+                pulled.append(item)
+                yield item
+
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            stream = delay_items(source(), time_s=0.01)
+            self.assertEqual(pulled, [])
+            self.assertEqual(next(stream), 0)
+            self.assertEqual(pulled, [0])
+            self.assertEqual(list(stream), [1, 2])
+        self.assertEqual(sleep.call_count, 3)
+
+    def test_delay_items_on_schedule(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            self.assertEqual(list(delay_items(range(10), 0.5, schedule.every(4))), list(range(10)))
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_works_on_infinite_iterators(self):
+        with patch("fault_injection.delays.time.sleep"):
+            stream = delay_items(itertools.count(), 0.0)
+            self.assertEqual(list(itertools.islice(stream, 5)), [0, 1, 2, 3, 4])
+
+    def test_raise_at_nth_item_fails_mid_stream(self):
+        received = []
+        with self.assertRaisesRegex(RuntimeError, "broken\nItem 3"):
+            for item in raise_at_nth_item("abcdef", msg="broken", n=3):
+                received.append(item)
+        self.assertEqual(received, ["a", "b"])
+
+    def test_delay_bytes_sleeps_proportionally_to_chunk_size(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            chunks = list(delay_bytes([b"x" * 100, b"y" * 300], bytes_per_s=1000))
+        self.assertEqual(chunks, [b"x" * 100, b"y" * 300])
+        self.assertEqual(sleep.call_args_list, [call(0.1), call(0.3)])
+
+    def test_raise_after_bytes_cuts_the_crossing_chunk(self):
+        received = []
+        with self.assertRaisesRegex(RuntimeError, "After 5 bytes"):
+            for chunk in raise_after_bytes([b"abc", b"defg", b"hij"], max_bytes=5):
+                received.append(chunk)
+        self.assertEqual(received, [b"abc", b"de"])
+
+    def test_raise_after_bytes_exact_boundary(self):
+        received = []
+        with self.assertRaises(RuntimeError):
+            for chunk in raise_after_bytes([b"abc", b"def"], max_bytes=3):
+                received.append(chunk)
+        self.assertEqual(received, [b"abc"])
+        self.assertEqual(list(raise_after_bytes([b"abc"], max_bytes=3)), [b"abc"])
+
+    def test_disabled_returns_plain_iterator(self):
+        with patch("fault_injection.delays.time.sleep") as sleep:
+            self.assertEqual(list(delay_items([1, 2], disable=True)), [1, 2])
+            self.assertEqual(list(raise_at_nth_item([1, 2], n=1, disable=True)), [1, 2])
+            disable()
+            try:
+                self.assertEqual(list(raise_after_bytes([b"ab"], max_bytes=0)), [b"ab"])
+            finally:
+                enable()
+        sleep.assert_not_called()
+
+    def test_global_switch_is_checked_per_item(self):
+        stream = raise_at_nth_item([1, 2, 3], n=2)
+        self.assertEqual(next(stream), 1)
+        disable()
+        try:
+            self.assertEqual(list(stream), [2, 3])
+        finally:
+            enable()
+
+    def test_metrics_count_items(self):
+        metrics.site_metrics("stream").reset()
+        with patch("fault_injection.delays.time.sleep"):
+            list(delay_items(range(4), 0.1, schedule.first(1), site="stream"))
+        snapshot = metrics.site_metrics("stream").snapshot()
+        self.assertEqual((snapshot["calls"], snapshot["sleeps"]), (4, 1))
+
+    def test_validation_is_eager(self):
+        with self.assertRaises(ValueError):
+            delay_items([], time_s=-1)
+        with self.assertRaises(ValueError):
+            raise_at_nth_item([], n=0)
+        with self.assertRaises(ValueError):
+            delay_bytes([], bytes_per_s=0)
+        with self.assertRaises(ValueError):
+            raise_after_bytes([], max_bytes=-1)
+
+
+class TestAsyncStreams(unittest.IsolatedAsyncioTestCase):
+    async def test_delay_items_async(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            items = await collect(delay_items_async(agen(range(3)), time_s=0.2))
+        self.assertEqual(items, [0, 1, 2])
+        self.assertEqual(sleep.await_count, 3)
+
+    async def test_raise_at_nth_item_async(self):
+        received = []
+        with self.assertRaises(RuntimeError):
+            async for item in raise_at_nth_item_async(agen("abc"), n=2):
+                received.append(item)
+        self.assertEqual(received, ["a"])
+
+    async def test_delay_bytes_async(self):
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            chunks = await collect(delay_bytes_async(agen([b"x" * 50]), bytes_per_s=100))
+        self.assertEqual(chunks, [b"x" * 50])
+        sleep.assert_awaited_once_with(0.5)
+
+    async def test_raise_after_bytes_async(self):
+        received = []
+        with self.assertRaises(RuntimeError):
+            async for chunk in raise_after_bytes_async(agen([b"ab", b"cd"]), max_bytes=3):
+                received.append(chunk)
+        self.assertEqual(received, [b"ab", b"c"])
+
+    async def test_disabled_async_returns_plain_iterator(self):
+        items = await collect(raise_at_nth_item_async(agen([1, 2]), n=1, disable=True))
+        self.assertEqual(items, [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
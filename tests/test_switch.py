@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from fault_injection import (
+    delay,
+    delay_at_nth_call,
+    delay_at_nth_call_inline,
+    delay_inline,
+    delay_random,
+    delay_random_norm,
+    disable,
+    enable,
+    enabled,
+    is_enabled,
+    raise_,
+    raise_at_nth_call,
+    raise_at_nth_call_inline,
+    raise_inline,
+    raise_random,
+)
+
+
+def add(a, b):
+    return a + b
+
+
+async def add_async(a, b):
+    return a + b
+
+
+class TestDisabledDecoratorsReturnOriginalFunction(unittest.TestCase):
+    def test_disable_flag_returns_function_untouched(self):
+        decorators = (
+            delay(0.25, disable=True),
+            delay_at_nth_call(n=1, disable=True),
+            delay_random(0.25, disable=True),
+            delay_random_norm(disable=True),
+            raise_(disable=True),
+            raise_at_nth_call(n=1, disable=True),
+            raise_random(prob_of_raise=1.0, disable=True),
+        )
+        for decorator in decorators:
+            with self.subTest(decorator=decorator):
+                self.assertIs(decorator(add), add)
+                self.assertIs(decorator(add_async), add_async)
+
+    def test_global_switch_off_returns_function_untouched(self):
+        with enabled(False):
+            self.assertIs(delay(0.25)(add), add)
+            self.assertIs(raise_()(add), add)
+            self.assertIs(raise_at_nth_call(n=1)(add_async), add_async)
+
+    def test_disabled_nth_decorator_does_not_count_calls(self):
+        raise_at_nth_call.counters.reset()
+        raise_at_nth_call(n=1, func_id="switch-test", disable=True)(add)(1, 2)
+        self.assertNotIn("switch-test", raise_at_nth_call.counters)
+
+
+class TestGlobalSwitch(unittest.TestCase):
+    def tearDown(self):
+        enable()
+
+    def test_enabled_by_default(self):
+        self.assertTrue(is_enabled())
+
+    def test_disable_and_enable(self):
+        disable()
+        self.assertFalse(is_enabled())
+        enable()
+        self.assertTrue(is_enabled())
+
+    def test_enabled_context_manager_restores_previous_value(self):
+        with enabled(False):
+            self.assertFalse(is_enabled())
+            with enabled(True):
+                self.assertTrue(is_enabled())
+            self.assertFalse(is_enabled())
+        self.assertTrue(is_enabled())
+
+    def test_existing_wrappers_become_pass_through_when_switched_off(self):
+        wrapped = raise_()(add)
+        with enabled(False):
+            self.assertEqual(wrapped(1, 2), 3)
+        with self.assertRaises(RuntimeError):
+            wrapped(1, 2)
+
+    def test_inline_helpers_skip_injection_when_switched_off(self):
+        raise_at_nth_call_inline.counters.reset()
+        with patch(
+            "fault_injection.delays.time.sleep",
+            side_effect=AssertionError("time.sleep should not be called when switched off"),
+        ):
+            with enabled(False):
+                self.assertIsNone(raise_inline())
+                self.assertIsNone(delay_inline(0.25))
+                self.assertIsNone(delay_at_nth_call_inline(n=1, func_id="switch-test"))
+                self.assertIsNone(raise_at_nth_call_inline(n=1, func_id="switch-test"))
+        self.assertNotIn("switch-test", raise_at_nth_call_inline.counters)
+
+    def test_inline_helpers_still_validate_when_switched_off(self):
+        with enabled(False):
+            with self.assertRaises(ValueError):
+                delay_inline(-0.1)
+
+    def test_environment_variable_disables_injection(self):
+        code = "import fault_injection; print(fault_injection.is_enabled())"
+        for value, expected in (("0", "False"), ("off", "False"), ("1", "True")):
+            with self.subTest(value=value):
+                env = dict(os.environ, FAULT_INJECTION_ENABLED=value)
+                output = subprocess.run(
+                    [sys.executable, "-c", code],
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.strip()
+                self.assertEqual(output, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
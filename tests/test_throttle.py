@@ -0,0 +1,145 @@
+import io
+import socket
+import unittest
+
+from fault_injection import disable, enable, metrics
+from fault_injection.clock import virtual_time
+from fault_injection.throttle import ThrottledReader, ThrottledSocket, ThrottledWriter
+
+
+class TestThrottledReader(unittest.TestCase):
+    def test_paces_to_bytes_per_s(self):
+        with virtual_time() as virtual:
+            reader = ThrottledReader(io.BytesIO(b"x" * 1000), bytes_per_s=100)
+            self.assertEqual(reader.read(), b"x" * 1000)
+            self.assertAlmostEqual(virtual.monotonic(), 10.0)
+
+    def test_idle_time_does_not_build_up_credit(self):
+        with virtual_time() as virtual:
+            reader = ThrottledReader(io.BytesIO(b"x" * 100_000), bytes_per_s=1000, max_chunk=1000)
+            reader.read(1000)
+            virtual.advance(60)
+            start = virtual.monotonic()
+            for _ in range(10):
+                self.assertEqual(len(reader.read(1000)), 1000)
+            self.assertAlmostEqual(virtual.monotonic() - start, 9.0, delta=1e-6)
+
+    def test_readinto_fills_caller_buffer_without_copies(self):
+        seen = []
+
+        class Raw(io.BytesIO):
+            def readinto(self, buffer):
+                seen.append(buffer)
+                return super().readinto(buffer)
+
+        buffer = bytearray(8)
+        reader = ThrottledReader(Raw(b"abcdefgh"), max_chunk=3)
+        self.assertEqual(reader.readinto(buffer), 3)
+        self.assertEqual(buffer[:3], b"abc")
+        self.assertIsInstance(seen[0], memoryview)
+        self.assertIs(seen[0].obj, buffer)
+
+    def test_short_reads(self):
+        reader = ThrottledReader(io.BytesIO(b"abcdefgh"), max_chunk=3)
+        self.assertEqual(reader.read(100), b"abc")
+        self.assertEqual(io.BufferedReader(reader).read(), b"defgh")
+
+    def test_fails_after_n_bytes(self):
+        reader = ThrottledReader(io.BytesIO(b"abcdefgh"), fail_after_bytes=5, msg="dropped")
+        self.assertEqual(reader.read(4), b"abcd")
+        self.assertEqual(reader.read(4), b"e")
+        with self.assertRaisesRegex(RuntimeError, "dropped\nAfter 5 bytes"):
+            reader.read(4)
+
+    def test_falls_back_to_read(self):
+        class Raw:
+            def __init__(self):
+                self.data = io.BytesIO(b"abcdef")
+
+            def read(self, size):
+                return self.data.read(size)
+
+        reader = ThrottledReader(Raw(), max_chunk=4)
+        self.assertEqual(reader.read(10), b"abcd")
+
+    def test_validation(self):
+        for kwargs in ({"bytes_per_s": 0}, {"max_chunk": 0}, {"max_chunk": 1.5},
+                       {"fail_after_bytes": -1}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                ThrottledReader(io.BytesIO(), **kwargs)
+
+    def test_globally_disabled_passes_through(self):
+        reader = ThrottledReader(io.BytesIO(b"abcdef"), max_chunk=1, fail_after_bytes=0)
+        disable()
+        try:
+            self.assertEqual(reader.read(), b"abcdef")
+        finally:
+            enable()
+
+    def test_records_metrics(self):
+        metrics.reset()
+        with virtual_time():
+            ThrottledReader(io.BytesIO(b"x" * 10), bytes_per_s=10, site="disk").read()
+        snapshot = metrics.site_metrics("disk").snapshot()
+        self.assertGreaterEqual(snapshot["calls"], 2)
+        self.assertEqual(snapshot["sleeps"], 1)
+        self.assertAlmostEqual(snapshot["sleep_total_s"], 1.0)
+
+
+class TestThrottledWriter(unittest.TestCase):
+    def test_short_writes_and_buffered_writer(self):
+        raw = io.BytesIO()
+        writer = ThrottledWriter(raw, max_chunk=2)
+        self.assertEqual(writer.write(b"abcdef"), 2)
+        buffered = io.BufferedWriter(ThrottledWriter(raw, max_chunk=2))
+        buffered.write(b"ghij")
+        buffered.flush()
+        self.assertEqual(raw.getvalue(), b"abghij")
+
+    def test_fails_after_n_bytes_and_paces(self):
+        with virtual_time() as virtual:
+            writer = ThrottledWriter(io.BytesIO(), bytes_per_s=4, fail_after_bytes=6)
+            self.assertEqual(writer.write(b"abcd"), 4)
+            self.assertEqual(writer.write(b"efgh"), 2)
+            self.assertAlmostEqual(virtual.monotonic(), 1.5)
+            with self.assertRaises(RuntimeError):
+                writer.write(b"i")
+
+
+class TestThrottledSocket(unittest.TestCase):
+    def setUp(self):
+        self.left, self.right = socket.socketpair()
+        self.addCleanup(self.left.close)
+        self.addCleanup(self.right.close)
+
+    def test_sendall_in_short_sends(self):
+        with virtual_time() as virtual:
+            conn = ThrottledSocket(self.left, bytes_per_s=1000, max_chunk=100)
+            conn.sendall(b"x" * 1000)
+            self.assertAlmostEqual(virtual.monotonic(), 1.0)
+        received = b""
+        while len(received) < 1000:
+            received += self.right.recv(4096)
+        self.assertEqual(received, b"x" * 1000)
+
+    def test_recv_and_recv_into_are_short(self):
+        self.right.sendall(b"abcdefgh")
+        conn = ThrottledSocket(self.left, max_chunk=3)
+        self.assertEqual(conn.recv(100), b"abc")
+        buffer = bytearray(100)
+        self.assertEqual(conn.recv_into(buffer), 3)
+        self.assertEqual(buffer[:3], b"def")
+
+    def test_fails_after_n_bytes(self):
+        conn = ThrottledSocket(self.left, fail_after_bytes=2)
+        self.assertEqual(conn.send(b"abc"), 2)
+        with self.assertRaises(RuntimeError):
+            conn.send(b"c")
+
+    def test_forwards_other_attributes(self):
+        conn = ThrottledSocket(self.left)
+        self.assertEqual(conn.fileno(), self.left.fileno())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fault_injection import delay, delay_inline_async
+from fault_injection import timer_wheel
+from fault_injection.clock import virtual_time
+from fault_injection.timer_wheel import TimerWheel
+
+
+class TestTimerWheel(unittest.IsolatedAsyncioTestCase):
+    async def test_many_sleepers_share_one_loop_timer(self):
+        loop = asyncio.get_running_loop()
+        wheel = TimerWheel(loop, tick_s=0.005, slots=64)
+        start = loop.time()
+        with patch.object(loop, "call_at", wraps=loop.call_at) as call_at:
+            futures = [wheel.sleep(0.02) for _ in range(1000)]
+            self.assertEqual(wheel.pending, 1000)
+            self.assertEqual(call_at.call_count, 1)
+            await asyncio.gather(*futures)
+        self.assertGreaterEqual(loop.time() - start, 0.02 - 1e-6)
+        self.assertLess(call_at.call_count, 50)
+        self.assertEqual(wheel.pending, 0)
+
+    async def test_wakes_in_deadline_order_across_rounds(self):
+        loop = asyncio.get_running_loop()
+        wheel = TimerWheel(loop, tick_s=0.002, slots=4)
+        woken = []
+
+        async def sleeper(name, seconds):
+            start = loop.time()
+            await wheel.sleep(seconds)
+            self.assertGreaterEqual(loop.time() - start, seconds - 1e-6)
+            woken.append(name)
+
+        await asyncio.gather(sleeper("long", 0.03), sleeper("short", 0.004), sleeper("mid", 0.015))
+        self.assertEqual(woken, ["short", "mid", "long"])
+
+    async def test_cancelled_sleeper_is_dropped(self):
+        wheel = TimerWheel(asyncio.get_running_loop(), tick_s=0.002)
+        task = asyncio.ensure_future(wheel.sleep(0.01))
+        task.cancel()
+        await wheel.sleep(0.01)
+        await asyncio.sleep(0.005)
+        self.assertTrue(task.cancelled())
+        self.assertEqual(wheel.pending, 0)
+
+    def test_validation(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        for kwargs in ({"tick_s": 0}, {"slots": 0}, {"slots": 2.5}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                TimerWheel(loop, **kwargs)
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                timer_wheel.enable(**kwargs)
+
+
+class TestTimerWheelMode(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        timer_wheel.disable()
+
+    async def test_async_helpers_sleep_on_the_wheel(self):
+        timer_wheel.enable(tick_s=0.002, slots=16)
+
+        @delay(0.01)
+        async def handler(i):
+            return i
+
+        with patch("fault_injection.delays.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            results = await asyncio.gather(*(handler(i) for i in range(200)))
+            await delay_inline_async(0.004)
+        self.assertEqual(results, list(range(200)))
+        sleep.assert_not_called()
+        self.assertIs(timer_wheel.wheel(), timer_wheel.wheel())
+
+    async def test_settings_change_replaces_wheel(self):
+        timer_wheel.enable(tick_s=0.002)
+        first = timer_wheel.wheel()
+        timer_wheel.enable(tick_s=0.004)
+        self.assertEqual(timer_wheel.wheel().tick_s, 0.004)
+        self.assertIsNot(timer_wheel.wheel(), first)
+
+    async def test_virtual_time_takes_precedence(self):
+        with timer_wheel.enabled(), virtual_time() as virtual:
+            await delay_inline_async(3600)
+        self.assertEqual(virtual.monotonic(), 3600)
+        self.assertFalse(timer_wheel.is_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()